@@ -6,7 +6,9 @@ LAW: Use ONLY user ingredients + cuisine-appropriate spices
 """
 
 import json
+import asyncio
 import openai
+from cascade_deadline import request_timeout, time_left
 from typing import List, Dict
 import os
 from dotenv import load_dotenv
@@ -57,6 +59,11 @@ class AIChefGenerator:
             
         openai.api_key = self.api_key
         
+        # Per-call timeout, and the least time worth starting another attempt with
+        # (both capped/checked against the cascade deadline)
+        self.timeout = 30.0
+        self.min_attempt_seconds = 1.0
+        
         # Load culinary configuration from external file
         config_path = script_dir / 'data' / 'culinary_config.json'
         
@@ -85,7 +92,36 @@ class AIChefGenerator:
     
     def generate_recipe(self, cuisine: str, dish_type: str, ingredients: List[str]) -> Dict:
         """Generate a culturally accurate recipe with ZERO hallucinations"""
+        prompt, allowed_spices = self._prepare_prompt(cuisine, dish_type, ingredients)
+        
+        # Generate via AI
+        recipe = self._call_ai_with_validation(prompt, cuisine, dish_type, ingredients, allowed_spices)
+        
+        return recipe
+    
+    async def generate_recipe_async(self, cuisine: str, dish_type: str, ingredients: List[str]) -> Dict:
+        """generate_recipe without blocking the event loop (ChatCompletion.acreate)"""
+        prompt, allowed_spices = self._prepare_prompt(cuisine, dish_type, ingredients)
+        max_retries = 3
+        
+        for attempt in range(max_retries):
+            if not self._time_for_attempt():
+                break
+            try:
+                response = await openai.ChatCompletion.acreate(**self._chat_request(prompt))
+                return self._parse_ai_response(response, ingredients, allowed_spices,
+                                               final_attempt=attempt == max_retries - 1)
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    print(f"Error generating recipe (attempt {attempt + 1}/{max_retries}): {e}")
+                    await asyncio.sleep(time_left(1.0))
+                    continue
+                print(f"Final error after {max_retries} attempts: {e}")
         
+        return self._create_safe_fallback(cuisine, dish_type, ingredients)
+    
+    def _prepare_prompt(self, cuisine: str, dish_type: str, ingredients: List[str]):
+        """(prompt, allowed spices) for a request"""
         # Get cultural context
         allowed_spices = self.cultural_spices.get(cuisine.lower(), self.cultural_spices.get('default', []))
         cooking_method = self.cooking_methods.get(dish_type, {
@@ -98,11 +134,7 @@ class AIChefGenerator:
         # Build the prompt with STRICT LAWS
         prompt = self._build_strict_prompt(cuisine, dish_type, ingredients, 
                                           allowed_spices, cooking_method)
-        
-        # Generate via AI
-        recipe = self._call_ai_with_validation(prompt, cuisine, dish_type, ingredients, allowed_spices)
-        
-        return recipe
+        return prompt, allowed_spices
     
     def _build_strict_prompt(self, cuisine, dish_type, ingredients, spices, method):
         """Build prompt with LAWS that prevent hallucinations"""
@@ -142,63 +174,18 @@ Keep VERY concise. Max 8 ingredients, max 5 steps."""
         max_retries = 3
         
         for attempt in range(max_retries):
+            if not self._time_for_attempt():
+                break
             try:
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are A.I. Chef. Return ONLY valid JSON. Be extremely concise."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=800  # Further reduced for safety
-                )
-                
-                recipe_text = response.choices[0].message.content.strip()
-                
-                # Clean up common formatting issues
-                if recipe_text.startswith('```json'):
-                    recipe_text = recipe_text[7:]
-                elif recipe_text.startswith('```'):
-                    recipe_text = recipe_text[3:]
-                
-                if recipe_text.endswith('```'):
-                    recipe_text = recipe_text[:-3]
-                
-                recipe_text = recipe_text.strip()
-                
-                # Try to parse JSON
-                try:
-                    recipe = json.loads(recipe_text)
-                    # Success! Validate and return
-                    validated = self._validate_no_hallucinations(recipe, ingredients, allowed_spices)
-                    return validated
-                    
-                except json.JSONDecodeError as e:
-                    if attempt < max_retries - 1:
-                        print(f"JSON Parse Error (attempt {attempt + 1}/{max_retries}): {e}")
-                        print("Retrying...")
-                        import time
-                        time.sleep(1)  # Brief pause before retry
-                        continue
-                    else:
-                        print(f"Final JSON Parse Error after {max_retries} attempts: {e}")
-                        # Try to extract JSON
-                        import re
-                        json_match = re.search(r'\{.*\}', recipe_text, re.DOTALL)
-                        if json_match:
-                            try:
-                                recipe = json.loads(json_match.group())
-                                validated = self._validate_no_hallucinations(recipe, ingredients, allowed_spices)
-                                return validated
-                            except:
-                                pass
-                        raise ValueError("AI didn't return valid JSON after retries")
+                response = openai.ChatCompletion.create(**self._chat_request(prompt))
+                return self._parse_ai_response(response, ingredients, allowed_spices,
+                                               final_attempt=attempt == max_retries - 1)
                         
             except Exception as e:
                 if attempt < max_retries - 1:
                     print(f"Error generating recipe (attempt {attempt + 1}/{max_retries}): {e}")
                     import time
-                    time.sleep(1)
+                    time.sleep(time_left(1.0))
                     continue
                 else:
                     print(f"Final error after {max_retries} attempts: {e}")
@@ -207,6 +194,69 @@ Keep VERY concise. Max 8 ingredients, max 5 steps."""
         # Should never reach here, but just in case
         return self._create_safe_fallback(cuisine, dish_type, ingredients)
     
+    def _time_for_attempt(self) -> bool:
+        """Is there enough of the cascade deadline left for another AI call"""
+        remaining = time_left()
+        if remaining is not None and remaining < self.min_attempt_seconds:
+            print(f"⏱️ Only {remaining:.1f}s left - no further AI attempts")
+            return False
+        return True
+    
+    def _chat_request(self, prompt: str) -> Dict:
+        """ChatCompletion arguments (same for the sync and async call)"""
+        return dict(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are A.I. Chef. Return ONLY valid JSON. Be extremely concise."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=800,  # Further reduced for safety
+            request_timeout=request_timeout(self.timeout)
+        )
+    
+    def _parse_ai_response(self, response, ingredients, allowed_spices, final_attempt: bool) -> Dict:
+        """
+        Validated recipe out of a ChatCompletion response
+        Raises on bad JSON so the caller retries; the final attempt also tries
+        to dig a JSON object out of the surrounding text
+        """
+        recipe_text = response.choices[0].message.content.strip()
+        
+        # Clean up common formatting issues
+        if recipe_text.startswith('```json'):
+            recipe_text = recipe_text[7:]
+        elif recipe_text.startswith('```'):
+            recipe_text = recipe_text[3:]
+        
+        if recipe_text.endswith('```'):
+            recipe_text = recipe_text[:-3]
+        
+        recipe_text = recipe_text.strip()
+        
+        # Try to parse JSON
+        try:
+            recipe = json.loads(recipe_text)
+            # Success! Validate and return
+            return self._validate_no_hallucinations(recipe, ingredients, allowed_spices)
+            
+        except json.JSONDecodeError as e:
+            if not final_attempt:
+                print(f"JSON Parse Error: {e}")
+                print("Retrying...")
+                raise
+            print(f"Final JSON Parse Error: {e}")
+            # Try to extract JSON
+            import re
+            json_match = re.search(r'\{.*\}', recipe_text, re.DOTALL)
+            if json_match:
+                try:
+                    recipe = json.loads(json_match.group())
+                    return self._validate_no_hallucinations(recipe, ingredients, allowed_spices)
+                except:
+                    pass
+            raise ValueError("AI didn't return valid JSON after retries")
+    
     def _normalize_ingredient(self, ingredient: str) -> List[str]:
         """Generate normalized variations of an ingredient for matching"""
         normalized = [ingredient.lower()]
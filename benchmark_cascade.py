@@ -0,0 +1,319 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: benchmark_cascade.py
+# * Purpose: Replay a recorded workload against RecipeMatcher4D with stubbed providers
+# */
+
+"""
+4D cascade benchmark (no network, same numbers every run)
+python benchmark_cascade.py --workload data/benchmark_workload.json --output bench.json
+python benchmark_cascade.py --compare bench_main.json bench.json
+- The local SQLite DB is built from the workload's 'recipes' fixtures in a temp dir
+- Spoonacular/TheMealDB/OpenAI are in-process stubs: fixed latency, deterministic hit
+  rate (a request either always or never hits a provider, so runs are comparable)
+- Reports throughput, per-request and per-level/provider p50/p95/p99 (cascade tracer)
+  and allocations (tracemalloc) as JSON
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_WORKLOAD = Path(__file__).parent / "data" / "benchmark_workload.json"
+
+# Dish type of the request being replayed - the stubs echo it so dish type validation passes
+_replayed_dish_type = ContextVar('replayed_dish_type', default='any')
+
+
+def _stable_fraction(*parts) -> float:
+    """Deterministic 0..1 from the request (same answer every run and every build)"""
+    return (zlib.crc32('|'.join(str(p).lower() for p in parts).encode()) % 10000) / 10000
+
+
+class StubProvider:
+    """Spoonacular/TheMealDB stand-in with fixed latency and a per-request hit rate"""
+
+    def __init__(self, name: str, latency_ms: float = 150.0, hit_rate: float = 0.5, results: int = 3):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.hit_rate = hit_rate
+        self.results = results
+        self.calls = 0
+
+    def _wait(self):
+        self.calls += 1
+        time.sleep(self.latency_ms / 1000)
+
+    def search_recipes(self, cuisine: str, ingredients: List[str], number: int = 10) -> Dict:
+        self._wait()
+        if _stable_fraction(self.name, cuisine, *sorted(ingredients)) >= self.hit_rate:
+            return {'results': []}
+        dish_type = _replayed_dish_type.get()
+        main = ingredients[0] if ingredients else 'vegetable'
+        return {'results': [{'id': f"{cuisine}:{main}:{dish_type}:{i}",
+                             'title': f"{cuisine.title()} {main.title()} {dish_type.title()} {i}"}
+                            for i in range(min(number, self.results))]}
+
+    def get_recipe_details(self, recipe_id: str) -> Dict:
+        self._wait()
+        cuisine, main, dish_type, index = recipe_id.split(':')
+        return {'id': recipe_id, 'title': f"{cuisine.title()} {main.title()} {dish_type.title()} {index}",
+                'cuisine': cuisine, 'dish_type': dish_type, 'main': main}
+
+    def is_quality_recipe(self, recipe: Dict) -> bool:
+        return True
+
+    def convert_to_recipegen_format(self, recipe: Dict) -> Dict:
+        ingredients = [{'name': recipe['main'], 'slug': recipe['main'], 'amount': '500 g'},
+                       {'name': 'onion', 'slug': 'onion', 'amount': '1'}]
+        return {'id': recipe['id'], 'title': recipe['title'], 'cuisine': recipe['cuisine'],
+                'dish_type': recipe['dish_type'], 'cuisines': [recipe['cuisine']],
+                'ingredients': ingredients, 'all_ingredients': ingredients,
+                'instructions': [f"Step {i}" for i in range(1, 6)]}
+
+
+class StubAIChef:
+    """AIChefGenerator stand-in: fixed latency, fails for (1 - success_rate) of requests"""
+
+    def __init__(self, latency_ms: float = 1500.0, success_rate: float = 1.0):
+        self.latency_ms = latency_ms
+        self.success_rate = success_rate
+        self.min_attempt_seconds = 0.1
+        self.calls = 0
+
+    def _recipe(self, cuisine: str, dish_type: str, ingredients: List[str]) -> Optional[Dict]:
+        if _stable_fraction('ai', cuisine, dish_type, *ingredients) >= self.success_rate:
+            return None
+        main = ingredients[0] if ingredients else 'vegetable'
+        return {'title': f"{cuisine.title()} {main.title()} {dish_type.title()}",
+                'ingredients': [{'item': main, 'amount': '500 g'}],
+                'instructions': [f"Step {i}" for i in range(1, 7)]}
+
+    def generate_recipe(self, cuisine: str, dish_type: str, ingredients: List[str]) -> Optional[Dict]:
+        self.calls += 1
+        time.sleep(self.latency_ms / 1000)
+        return self._recipe(cuisine, dish_type, ingredients)
+
+    async def generate_recipe_async(self, cuisine: str, dish_type: str, ingredients: List[str]) -> Optional[Dict]:
+        self.calls += 1
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self._recipe(cuisine, dish_type, ingredients)
+
+
+def seed_database(db_path: str, recipes: List[Dict]):
+    """Master DB with the create_recipe_database.py tables the matcher reads, filled from fixtures"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE recipes (
+            id TEXT PRIMARY KEY, title TEXT NOT NULL, cuisine TEXT, dish_type TEXT,
+            ingredients JSON NOT NULL, instructions JSON NOT NULL,
+            prep_time INTEGER, cook_time INTEGER, total_time INTEGER, servings INTEGER,
+            difficulty TEXT, source TEXT NOT NULL, source_id TEXT, source_url TEXT,
+            image_url TEXT, video_url TEXT, nutrition JSON, tags JSON,
+            quality_score INTEGER DEFAULT 50,
+            download_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            times_served INTEGER DEFAULT 0, user_rating REAL DEFAULT 0,
+            is_verified BOOLEAN DEFAULT FALSE
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE recipe_ingredients (
+            recipe_id TEXT, ingredient_slug TEXT, ingredient_name TEXT, amount TEXT
+        )
+    ''')
+    for recipe in recipes:
+        ingredients = [{'name': slug.replace('_', ' '), 'slug': slug, 'amount': '1 cup'}
+                       for slug in recipe['ingredients']]
+        total_time = recipe.get('total_time', 45)
+        conn.execute('''
+            INSERT INTO recipes (id, title, cuisine, dish_type, ingredients, instructions,
+                                 prep_time, cook_time, total_time, servings, source, quality_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (recipe['id'], recipe['title'], recipe['cuisine'], recipe['dish_type'], json.dumps(ingredients),
+              json.dumps([{'step': 1, 'instruction': f"Cook the {recipe['title']}"}]),
+              10, max(0, total_time - 10), total_time, 4, 'fixture', recipe.get('quality_score', 60)))
+        conn.executemany(
+            "INSERT INTO recipe_ingredients (recipe_id, ingredient_slug, ingredient_name, amount) VALUES (?, ?, ?, ?)",
+            [(recipe['id'], ing['slug'], ing['name'], ing['amount']) for ing in ingredients])
+    conn.commit()
+    conn.close()
+
+
+def load_workload(path: str) -> Dict:
+    """{'recipes': [...fixtures], 'requests': [...]} from .json, or one request per line from .jsonl"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if str(path).endswith('.jsonl'):
+            return {'recipes': [], 'requests': [json.loads(line) for line in f if line.strip()]}
+        return json.load(f)
+
+
+def _percentiles(samples_ms: List[float]) -> Dict:
+    if not samples_ms:
+        return {'count': 0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    ordered = sorted(samples_ms)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+    return {'count': len(ordered), 'p50_ms': at(0.50), 'p95_ms': at(0.95), 'p99_ms': at(0.99),
+            'max_ms': round(ordered[-1], 2)}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmark(workload: Dict, repeat: int = 1, concurrency: int = 4, provider_latency_ms: float = 150.0,
+                  provider_hit_rates=(0.5, 0.3), ai_latency_ms: float = 1500.0, ai_success_rate: float = 1.0,
+                  use_cache: bool = True, deadline: float = None, verbose: bool = False) -> Dict:
+    """Replay workload['requests'] `repeat` times against a freshly seeded matcher"""
+    from recipe_matcher_4d import RecipeMatcher4D
+
+    providers = [StubProvider(name, provider_latency_ms, hit_rate)
+                 for name, hit_rate in zip(('Spoonacular', 'TheMealDB'), provider_hit_rates)]
+    ai_chef = StubAIChef(ai_latency_ms, ai_success_rate)
+    requests = [request for _ in range(repeat) for request in workload['requests']]
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    with tempfile.TemporaryDirectory() as tmp, output:
+        db_path = os.path.join(tmp, 'benchmark_master.db')
+        seed_database(db_path, workload.get('recipes', []))
+        matcher = RecipeMatcher4D(db_path=db_path)
+        matcher.sorted_providers = [(p.name.lower(), {'fetcher': p, 'name': p.name, 'enabled': True,
+                                                      'priority': i}) for i, p in enumerate(providers, 1)]
+        matcher.ai_chef = ai_chef
+        matcher.warm_up()
+
+        def replay(request: Dict) -> Dict:
+            dish_type = request.get('dish_type') or 'any'
+            _replayed_dish_type.set(dish_type)
+            if not use_cache:
+                matcher.result_cache.clear()
+            started = time.perf_counter()
+            error = None
+            try:
+                recipe = matcher.find_recipe(request['cuisine'], list(request.get('ingredients') or []),
+                                             dish_type, deadline=deadline)
+            except Exception as e:
+                recipe, error = None, str(e)
+            return {'ms': (time.perf_counter() - started) * 1000, 'error': error,
+                    'source': (recipe or {}).get('source_api') or (recipe or {}).get('source')}
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+                outcomes = list(pool.map(lambda request, ctx: ctx.run(replay, request),
+                                         requests, [copy_context() for _ in requests]))
+            wall = time.perf_counter() - started
+            allocated, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        matcher.flush_saves()
+        metrics = matcher.get_metrics()
+        cache_stats = matcher.result_cache.get_stats()
+        matcher.close()
+        matcher.db.close_all()
+
+    sources = {}
+    for outcome in outcomes:
+        sources[outcome['source'] or 'none'] = sources.get(outcome['source'] or 'none', 0) + 1
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'requests': len(requests),
+            'config': {'repeat': repeat, 'concurrency': concurrency, 'provider_latency_ms': provider_latency_ms,
+                       'provider_hit_rates': list(provider_hit_rates), 'ai_latency_ms': ai_latency_ms,
+                       'ai_success_rate': ai_success_rate, 'use_cache': use_cache, 'deadline': deadline},
+        },
+        'throughput_rps': round(len(requests) / wall, 2) if wall else 0.0,
+        'wall_s': round(wall, 3),
+        'requests': _percentiles([o['ms'] for o in outcomes]),
+        'errors': sum(1 for o in outcomes if o['error']),
+        'sources': sources,
+        'levels': {name: summary for name, summary in metrics.items() if name.startswith('level')},
+        'spans': {name: summary for name, summary in metrics.items() if not name.startswith('level')},
+        'calls': {**{p.name: p.calls for p in providers}, 'ai_chef': ai_chef.calls},
+        'cache': {'hits': cache_stats['hits'], 'misses': cache_stats['misses']},
+        'allocations': {'peak_kb': round(peak / 1024, 1), 'retained_kb': round(allocated / 1024, 1)},
+    }
+
+
+def compare(baseline: Dict, current: Dict) -> Dict:
+    """p50/p95 and throughput change (current vs baseline) - negative ms is faster"""
+    report = {'throughput_rps': round(current['throughput_rps'] - baseline['throughput_rps'], 2),
+              'requests': {key: round(current['requests'][key] - baseline['requests'][key], 2)
+                           for key in ('p50_ms', 'p95_ms', 'p99_ms')}}
+    for name, summary in current['levels'].items():
+        if name in baseline['levels']:
+            report[name] = {key: round(summary[key] - baseline['levels'][name][key], 2)
+                            for key in ('p50_ms', 'p95_ms')}
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a workload against the 4D cascade with stub providers")
+    parser.add_argument('--workload', default=str(DEFAULT_WORKLOAD))
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--provider-latency-ms', type=float, default=150.0)
+    parser.add_argument('--provider-hit-rates', type=float, nargs=2, default=(0.5, 0.3),
+                        metavar=('SPOONACULAR', 'THEMEALDB'))
+    parser.add_argument('--ai-latency-ms', type=float, default=1500.0)
+    parser.add_argument('--ai-success-rate', type=float, default=1.0)
+    parser.add_argument('--deadline', type=float, default=None, help="find_recipe(deadline=...) seconds")
+    parser.add_argument('--no-cache', action='store_true', help="clear the result cache before every request")
+    parser.add_argument('--output', help="write the JSON report here (default: stdout)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="print the difference of two saved reports and exit")
+    parser.add_argument('--verbose', action='store_true', help="keep the matcher's own output")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f1, open(args.compare[1]) as f2:
+            print(json.dumps(compare(json.load(f1), json.load(f2)), indent=2))
+        return 0
+
+    report = run_benchmark(load_workload(args.workload), repeat=args.repeat, concurrency=args.concurrency,
+                           provider_latency_ms=args.provider_latency_ms,
+                           provider_hit_rates=tuple(args.provider_hit_rates),
+                           ai_latency_ms=args.ai_latency_ms, ai_success_rate=args.ai_success_rate,
+                           use_cache=not args.no_cache, deadline=args.deadline, verbose=args.verbose)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"📊 {report['meta']['requests']} requests, {report['throughput_rps']} req/s, "
+              f"p95 {report['requests']['p95_ms']} ms → {args.output}")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
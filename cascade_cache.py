@@ -0,0 +1,146 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: cascade_cache.py
+# * Purpose: LRU+TTL memo of 4D cascade outcomes, with negative caching per level
+# */
+
+"""
+Cascade Cache
+- Positive entries: normalized find_recipe request → returned recipe
+- Negative entries: "this level found nothing for this query" (shorter TTL)
+- Everything is tagged with a cuisine so new local recipes can invalidate it
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+
+def normalize_request(cuisine: str, ingredients: Iterable[str], dish_type: Optional[str],
+                      spice_level: Optional[str] = None, max_cooking_time=None,
+                      chef_preference: Optional[str] = None) -> tuple:
+    """Stable cache key for a find_recipe call (ingredient order/case doesn't matter)"""
+    return (
+        (cuisine or '').lower().strip(),
+        tuple(sorted({(i or '').lower().strip() for i in ingredients})),
+        (dish_type or '').lower().strip(),
+        spice_level or None,
+        str(max_cooking_time) if max_cooking_time not in (None, '') else None,
+        chef_preference or None,
+    )
+
+
+class _LRUTTL:
+    """OrderedDict-backed LRU where each entry also expires after `ttl` seconds"""
+
+    def __init__(self, max_entries: int, ttl: float, clock):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()  # key → (expires_at, cuisine, value)
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        item = self.entries.get(key)
+        if item is None:
+            return None
+        if item[0] <= self.clock():
+            del self.entries[key]
+            self.expirations += 1
+            return None
+        self.entries.move_to_end(key)
+        return item
+
+    def put(self, key, cuisine: str, value):
+        self.entries[key] = (self.clock() + self.ttl, cuisine, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def drop_cuisine(self, cuisine: str, keep: Callable = None) -> int:
+        stale = [k for k, item in self.entries.items()
+                 if item[1] == cuisine and not (keep and keep(item[2]))]
+        for key in stale:
+            del self.entries[key]
+        return len(stale)
+
+
+class CascadeCache:
+    """Bounded LRU+TTL cache of cascade results and known-empty levels"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 30 * 60,
+                 max_negative: int = 4096, negative_ttl: float = 10 * 60,
+                 clock=time.monotonic):
+        self._results = _LRUTTL(max_entries, ttl, clock)
+        self._negative = _LRUTTL(max_negative, negative_ttl, clock)
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.stats = {'hits': 0, 'misses': 0, 'negative_hits': 0, 'negative_misses': 0,
+                      'invalidations': 0}
+
+    def get(self, key: tuple) -> Optional[Dict]:
+        """Cached result (a private copy - callers may mutate it) or None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            item = self._results.get(key)
+            self.stats['hits' if item else 'misses'] += 1
+        return copy.deepcopy(item[2]) if item else None
+
+    def put(self, key: tuple, result: Dict):
+        if not self.enabled or not result:
+            return
+        with self._lock:
+            self._results.put(key, key[0], copy.deepcopy(result))
+
+    def is_known_empty(self, key: tuple) -> bool:
+        """True if a level already came back empty for this exact query"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            hit = self._negative.get(key) is not None
+            self.stats['negative_hits' if hit else 'negative_misses'] += 1
+        return hit
+
+    def record_empty(self, key: tuple, cuisine: str):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._negative.put(key, (cuisine or '').lower().strip(), True)
+
+    def invalidate_cuisine(self, cuisine: str, keep: Callable[[Dict], bool] = None) -> int:
+        """
+        Drop the entries for a cuisine (new local recipes): every negative one, and every
+        cached result except those keep(result) says are still right (e.g. the recipe just saved)
+        """
+        cuisine = (cuisine or '').lower().strip()
+        with self._lock:
+            dropped = self._results.drop_cuisine(cuisine, keep) + self._negative.drop_cuisine(cuisine)
+            if dropped:
+                self.stats['invalidations'] += dropped
+        return dropped
+
+    def clear(self):
+        with self._lock:
+            self._results.entries.clear()
+            self._negative.entries.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update({
+                'entries': len(self._results.entries),
+                'negative_entries': len(self._negative.entries),
+                'evictions': self._results.evictions + self._negative.evictions,
+                'expirations': self._results.expirations + self._negative.expirations,
+            })
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
@@ -0,0 +1,117 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: cascade_deadline.py
+# * Purpose: Time budget of one 4D cascade, visible to every level, fetcher and AI retry
+# */
+
+"""
+Cascade deadline
+deadline = Deadline(6.0)
+with use_deadline(deadline):
+    with deadline.level('level2', share=0.45, reserve=3.0):
+        requests.get(url, timeout=request_timeout(15.0))   # ≤ what level 2 has left
+- The active deadline lives in a ContextVar, so fetchers and the AI Chef read it
+  without new parameters (thread pools must submit via copy_context().run)
+- Each level gets a slice of the budget, minus what's reserved for later levels
+- report() says where the time went
+"""
+
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+# Never hand out a socket timeout below this - a 0s timeout means "no timeout" to some clients
+MIN_REQUEST_TIMEOUT = 0.05
+
+_current_deadline = ContextVar('cascade_deadline', default=None)
+
+
+class Deadline:
+    """Overall budget + the cut-off of the level currently running"""
+
+    def __init__(self, budget: float, clock=time.monotonic):
+        self.budget = float(budget)
+        self.clock = clock
+        self.started = clock()
+        self.ends_at = self.started + self.budget
+        self.cutoff = self.ends_at
+        self.spent = OrderedDict()  # level → seconds
+        self.skipped = []
+
+    def total_remaining(self) -> float:
+        return max(0.0, self.ends_at - self.clock())
+
+    def remaining(self) -> float:
+        """Seconds left for the current level (the whole budget outside any level)"""
+        return max(0.0, self.cutoff - self.clock())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    @contextmanager
+    def level(self, name: str, share: Optional[float] = None, reserve: float = 0.0):
+        """
+        Run a level inside its slice: at most share × budget, and never into the
+        `reserve` seconds kept for the levels after it. Time spent is added to spent[name]
+        """
+        started = self.clock()
+        outer_cutoff = self.cutoff
+        cutoff = min(outer_cutoff, self.ends_at - reserve)
+        if share is not None:
+            cutoff = min(cutoff, started + self.budget * share)
+        self.cutoff = max(started, cutoff)
+        try:
+            yield self
+        finally:
+            self.cutoff = outer_cutoff
+            self.spent[name] = round(self.spent.get(name, 0.0) + self.clock() - started, 3)
+
+    def skip(self, name: str):
+        """Record a level that didn't run for lack of time"""
+        self.skipped.append(name)
+
+    def report(self) -> Dict:
+        elapsed = self.clock() - self.started
+        return {
+            'budget_s': self.budget,
+            'elapsed_s': round(elapsed, 3),
+            'remaining_s': round(self.total_remaining(), 3),
+            'levels': dict(self.spent),
+            'skipped': list(self.skipped),
+        }
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextmanager
+def use_deadline(deadline: Optional[Deadline]):
+    """Make `deadline` the active one for this thread/task"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def request_timeout(default: Optional[float]) -> Optional[float]:
+    """Timeout for one outbound call: `default`, capped by the active level's remaining time"""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return default
+    remaining = max(MIN_REQUEST_TIMEOUT, deadline.remaining())
+    return remaining if default is None else min(default, remaining)
+
+
+def time_left(default: Optional[float] = None) -> Optional[float]:
+    """Seconds the current level may still wait (for future.result), `default` without a deadline"""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return default
+    return deadline.remaining() if default is None else min(default, deadline.remaining())
@@ -0,0 +1,253 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: cascade_tracing.py
+# * Purpose: Spans, latency histograms and optional JSONL traces for the 4D cascade
+# */
+
+"""
+Cascade tracing
+with tracer.trace('find_recipe', cuisine='thai'):        # one trace per request
+    with span('level2'):
+        with span('provider.search', provider='Spoonacular') as s:
+            ...
+            s.tag(outcome='hit')
+@traced('provider.details', tags=lambda self, fetcher, provider, *a: {'provider': provider})
+- The current span lives in a ContextVar (threads submitted via copy_context().run and
+  asyncio tasks attach their spans to the right parent); without a trace, span() is a no-op
+- Every closed span feeds a latency histogram under its name, and under name[provider]
+  / name[country] when it has that tag → get_metrics() shows p50/p95/p99 per level and provider
+- trace_path: each finished trace is appended as one JSON line (by a write-behind thread)
+"""
+
+import functools
+import inspect
+import itertools
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+
+from write_behind import WriteBehindQueue
+
+# Upper bounds (ms) of the histogram buckets - the last one catches everything slower
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 60000)
+
+# Tags that get their own histogram next to the span name
+KEY_TAGS = ('provider', 'country')
+
+_current_span = ContextVar('cascade_span', default=None)
+
+
+class Span:
+    """One timed step of a cascade, with tags and child spans"""
+
+    def __init__(self, name: str, tracer: 'Tracer', tags: Dict = None):
+        self.name = name
+        self.tracer = tracer
+        self.tags = dict(tags or {})
+        self.started = time.perf_counter()
+        self.duration_ms = None
+        self.children = []
+        self._lock = threading.Lock()
+
+    def tag(self, **tags):
+        self.tags.update(tags)
+
+    def _add_child(self, child: 'Span'):
+        with self._lock:
+            self.children.append(child)
+
+    def finish(self):
+        self.duration_ms = round((time.perf_counter() - self.started) * 1000, 2)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            children = list(self.children)
+        return {'name': self.name, 'ms': self.duration_ms, 'tags': self.tags,
+                'spans': [child.to_dict() for child in children]}
+
+
+class _NoSpan:
+    """Stand-in yielded when no trace is active"""
+
+    def tag(self, **tags):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class LatencyHistogram:
+    """Fixed log-ish buckets; percentiles are the upper bound of the bucket they fall in"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.outcomes = {}
+
+    def observe(self, ms: float, outcome: Optional[str] = None):
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        if outcome:
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bucket, cumulative in enumerate(itertools.accumulate(self.counts)):
+            if cumulative >= rank:
+                return float(BUCKET_BOUNDS_MS[bucket]) if bucket < len(BUCKET_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total_ms / self.count, 2) if self.count else 0.0,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 2),
+            'outcomes': dict(self.outcomes),
+        }
+
+
+class Tracer:
+    """Histograms of every span of every trace, plus the optional JSONL trace file"""
+
+    def __init__(self, trace_path: Optional[str] = None):
+        self.trace_path = trace_path
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._trace_ids = itertools.count(1)
+        self._sink = WriteBehindQueue(self._append_traces, flush_interval=1.0,
+                                      name='trace-writer') if trace_path else None
+
+    @contextmanager
+    def trace(self, name: str, **tags):
+        """Root span of one request; nested trace() calls just open a child span"""
+        if _current_span.get() is not None:
+            with span(name, **tags) as child:
+                yield child
+            return
+        root = Span(name, self, tags)
+        token = _current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.tag(outcome='error', error=type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            root.finish()
+            self.observe(root)
+            if self._sink is not None:
+                trace_id = next(self._trace_ids)
+                self._sink.put(trace_id, dict(root.to_dict(), trace_id=trace_id, at=time.time()))
+
+    def observe(self, closed: Span):
+        outcome = closed.tags.get('outcome')
+        keys = [closed.name] + [f"{closed.name}[{closed.tags[tag]}]" for tag in KEY_TAGS if tag in closed.tags]
+        with self._lock:
+            for key in keys:
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram()
+                histogram.observe(closed.duration_ms, outcome)
+
+    def get_metrics(self) -> Dict:
+        """Latency summary per span name (and per provider/country), slowest p95 first"""
+        with self._lock:
+            summaries = {key: histogram.summary() for key, histogram in self._histograms.items()}
+        return dict(sorted(summaries.items(), key=lambda item: -item[1]['p95_ms']))
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def flush(self, timeout: float = None) -> bool:
+        return self._sink.flush(timeout) if self._sink is not None else True
+
+    def close(self):
+        if self._sink is not None:
+            self._sink.close()
+
+    def _append_traces(self, batch):
+        with open(self.trace_path, 'a', encoding='utf-8') as f:
+            for _, record in batch:
+                f.write(json.dumps(record, default=str) + '\n')
+
+
+@contextmanager
+def span(name: str, **tags):
+    """Child span of the current one (no-op outside a trace). Exceptions tag outcome='error'"""
+    parent = _current_span.get()
+    if parent is None:
+        yield _NO_SPAN
+        return
+    child = Span(name, parent.tracer, tags)
+    parent._add_child(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.tag(outcome='error', error=type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.finish()
+        parent.tracer.observe(child)
+
+
+def tag_trace(**tags):
+    """Tag the current span (the level, the request's root...) if there is one"""
+    current = _current_span.get()
+    if current is not None:
+        current.tag(**tags)
+
+
+def _outcome(result) -> str:
+    return 'hit' if result else 'miss'
+
+
+def traced(name: str, tags: Callable = None):
+    """
+    Run the decorated function (sync or async) in a span; outcome is hit/miss by
+    the truthiness of its result. tags(*args, **kwargs) → extra tags from the call
+    """
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, **(tags(*args, **kwargs) if tags else {})) as current:
+                    result = await func(*args, **kwargs)
+                    current.tag(outcome=_outcome(result))
+                    return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **(tags(*args, **kwargs) if tags else {})) as current:
+                result = func(*args, **kwargs)
+                current.tag(outcome=_outcome(result))
+                return result
+        return wrapper
+    return decorate
+
+
+def call_in_span(name: str, tags: Dict, func: Callable, *args):
+    """func(*args) inside a span - for work handed to an executor"""
+    with span(name, **tags) as current:
+        result = func(*args)
+        current.tag(outcome=_outcome(result))
+        return result
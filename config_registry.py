@@ -0,0 +1,134 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: config_registry.py
+# * Purpose: Process-wide, hot-reloadable registry for data/*.json configs
+# */
+
+"""
+Config Registry
+- Each data/*.json file is parsed ONCE and shared by everyone
+- Derived structures (expansion maps, indicator sets, regexes) are compiled once per file version
+- Files are re-checked at most every `check_interval` seconds; a file is only
+  re-parsed when its mtime/size changed AND its content hash differs
+- `version` increases on every reload so caches can key on it
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+
+class _ConfigEntry:
+    __slots__ = ('data', 'mtime', 'size', 'digest', 'version', 'checked_at', 'derived')
+
+    def __init__(self):
+        self.data = None
+        self.mtime = None
+        self.size = None
+        self.digest = None
+        self.version = 0
+        self.checked_at = 0.0
+        self.derived = {}
+
+
+class ConfigRegistry:
+    """Shared, lazily loaded and hot-reloaded JSON configuration files"""
+
+    def __init__(self, data_dir, check_interval: float = 2.0):
+        self.data_dir = Path(data_dir)
+        self.check_interval = check_interval
+        self._entries: Dict[str, _ConfigEntry] = {}
+        self._lock = threading.RLock()
+        self._version = 0
+        self.stats = {'loads': 0, 'reloads_skipped': 0, 'derived_builds': 0}
+
+    @property
+    def version(self) -> int:
+        """Global version - bumps whenever ANY registered file changes"""
+        return self._version
+
+    def file_version(self, filename: str) -> int:
+        with self._lock:
+            return self._refresh(filename).version
+
+    def _refresh(self, filename: str) -> _ConfigEntry:
+        """Return the entry, re-reading the file only if it really changed"""
+        entry = self._entries.get(filename)
+        if entry is None:
+            entry = self._entries[filename] = _ConfigEntry()
+        now = time.monotonic()
+        if entry.version and now - entry.checked_at < self.check_interval:
+            return entry
+        entry.checked_at = now
+
+        path = self.data_dir / filename
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            if entry.digest is not None or not entry.version:
+                # First lookup of a missing file, or the file was removed
+                entry.data, entry.mtime, entry.size, entry.digest = None, None, None, None
+                self._bump(entry)
+            return entry
+
+        if entry.version and (st.st_mtime_ns, st.st_size) == (entry.mtime, entry.size):
+            return entry
+
+        raw = path.read_bytes()
+        digest = hashlib.sha1(raw).hexdigest()
+        entry.mtime, entry.size = st.st_mtime_ns, st.st_size
+        if digest == entry.digest:
+            # Touched but identical - keep parsed data and derived structures
+            self.stats['reloads_skipped'] += 1
+            return entry
+
+        try:
+            data = json.loads(raw.decode('utf-8'))
+        except (ValueError, UnicodeDecodeError) as e:
+            print(f"⚠️ Could not parse {filename}: {e} - keeping previous version")
+            if not entry.version:
+                self._bump(entry)
+            return entry
+
+        entry.data = data
+        entry.digest = digest
+        self.stats['loads'] += 1
+        self._bump(entry)
+        return entry
+
+    def _bump(self, entry: _ConfigEntry):
+        self._version += 1
+        entry.version = self._version
+        entry.derived = {}
+
+    def get(self, filename: str, default: Any = None) -> Any:
+        """
+        Parsed content of data/<filename> (shared - treat as read-only)
+        Returns `default` if the file does not exist
+        """
+        with self._lock:
+            data = self._refresh(filename).data
+        return default if data is None else data
+
+    def derive(self, filename: str, name: str, builder: Callable[[Any], Any]) -> Any:
+        """
+        Compiled structure built from a file's content
+        builder(data) runs once per file version (data is None if the file is missing)
+        """
+        with self._lock:
+            entry = self._refresh(filename)
+            if name not in entry.derived:
+                entry.derived[name] = builder(entry.data)
+                self.stats['derived_builds'] += 1
+            return entry.derived[name]
+
+
+# Shared instance for the app's data/ folder
+config_registry = ConfigRegistry(Path(__file__).parent / "data")
@@ -6,6 +6,8 @@ Creates the unified recipe database with proper schema
 import sqlite3
 import json
 from datetime import datetime
+from recipe_fts import ensure_recipe_fts
+from recipe_minhash import ensure_minhash_table
 
 print("=== Creating RecipeGen Master Database ===\n")
 
@@ -43,7 +45,9 @@ CREATE TABLE IF NOT EXISTS recipes (
     last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     times_served INTEGER DEFAULT 0,
     user_rating REAL DEFAULT 0,
-    is_verified BOOLEAN DEFAULT FALSE
+    is_verified BOOLEAN DEFAULT FALSE,
+    ingredient_slugs TEXT,
+    spice_level_score INTEGER
 )
 ''')
 
@@ -54,7 +58,8 @@ indices = [
     "CREATE INDEX IF NOT EXISTS idx_source ON recipes(source)",
     "CREATE INDEX IF NOT EXISTS idx_quality ON recipes(quality_score DESC)",
     "CREATE INDEX IF NOT EXISTS idx_title ON recipes(title)",
-    "CREATE INDEX IF NOT EXISTS idx_verified ON recipes(is_verified)"
+    "CREATE INDEX IF NOT EXISTS idx_verified ON recipes(is_verified)",
+    "CREATE INDEX IF NOT EXISTS idx_level1 ON recipes(cuisine, dish_type, quality_score DESC)"
 ]
 
 for index in indices:
@@ -75,6 +80,14 @@ CREATE TABLE IF NOT EXISTS recipe_ingredients (
 cursor.execute("CREATE INDEX IF NOT EXISTS idx_ingredient_slug ON recipe_ingredients(ingredient_slug)")
 cursor.execute("CREATE INDEX IF NOT EXISTS idx_recipe_ingredient ON recipe_ingredients(recipe_id)")
 
+# Full-text index over titles, instructions and ingredient names (kept in sync by triggers)
+if ensure_recipe_fts(conn):
+    print("✓ recipes_fts full-text index created")
+
+# MinHash signatures for near-match search and import-time duplicate detection
+ensure_minhash_table(conn)
+print("✓ recipe_minhash table created")
+
 # Create download tracking table
 cursor.execute('''
 CREATE TABLE IF NOT EXISTS download_log (
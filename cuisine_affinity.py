@@ -0,0 +1,201 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: cuisine_affinity.py
+# * Purpose: Precomputed ingredient × cuisine affinity matrices for cuisine suggestions
+# */
+
+"""
+Cuisine affinity matrix
+affinity.sync(indicators=[(cuisine, (indicator, ...)), ...],      # culinary_config.json
+              ingredient_cuisines={slug: [cuisine, ...]},          # ingredients.json tags
+              affinity_rows=read_rows)                             # cuisine_ingredient_affinity
+affinity.cuisine_fit(['coconut_milk', 'lime'])   → [(cuisine, score, matched), ...] best first
+affinity.typical_ingredients(['thai'], k=8)      → slugs ranked by tag + recipe frequency
+- Two blocks: indicator × cuisine (fit scoring) and ingredient × cuisine (typical ingredients);
+  a block is rebuilt only when one of ITS sources changed (object identity for the in-memory
+  sources, row count/total frequency for the DB table, re-checked every check_interval seconds)
+- Scores are one matrix product + top-k with NumPy, plain dict/set arithmetic without it
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Query term → matching indicator columns, per indicator block (bounded)
+MAX_CACHED_TERMS = 4096
+
+
+def normalize_term(term: str) -> str:
+    return term.lower().replace('_', ' ').replace('-', ' ').strip()
+
+
+class _Block:
+    """Term × cuisine weights of one block (dense NumPy array, or per-term/per-cuisine dicts)"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str, float]]):
+        self.terms, self.term_index = [], {}
+        self.cuisines, self.cuisine_index = [], {}
+        cells = {}
+        for term, cuisine, weight in entries:
+            t = self.term_index.get(term)
+            if t is None:
+                t = self.term_index[term] = len(self.terms)
+                self.terms.append(term)
+            c = self.cuisine_index.get(cuisine)
+            if c is None:
+                c = self.cuisine_index[cuisine] = len(self.cuisines)
+                self.cuisines.append(cuisine)
+            cells[(t, c)] = cells.get((t, c), 0.0) + weight
+        if NUMPY_AVAILABLE:
+            self.matrix = np.zeros((len(self.terms), len(self.cuisines)), dtype=np.float32)
+            for (t, c), weight in cells.items():
+                self.matrix[t, c] = weight
+        else:
+            self.by_term = [dict() for _ in self.terms]
+            self.by_cuisine = [dict() for _ in self.cuisines]
+            for (t, c), weight in cells.items():
+                self.by_term[t][c] = weight
+                self.by_cuisine[c][t] = weight
+        self.term_matches = {}  # query term → matching term columns (indicator block)
+
+
+class CuisineAffinityMatrix:
+    """Indicator and ingredient affinities per cuisine, kept in step with their sources"""
+
+    def __init__(self, check_interval: float = 30.0, min_frequency: float = 0.0):
+        self.check_interval = check_interval
+        self.min_frequency = min_frequency
+        self._indicators = _Block(())
+        self._indicator_source = None
+        self._typical = _Block(())
+        self._tag_source = None
+        self._tag_entries = []
+        self._affinity_signature = None
+        self._affinity_entries = []
+        self._affinity_checked_at = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'indicator_builds': 0, 'typical_builds': 0, 'fit_queries': 0, 'typical_queries': 0}
+
+    # ------------------------------------------------------------------ sources
+
+    def sync(self, indicators: Sequence[Tuple[str, Sequence[str]]] = None,
+             ingredient_cuisines: Dict[str, List[str]] = None,
+             affinity_rows: Callable[[Optional[tuple]], Tuple[tuple, Optional[List[tuple]]]] = None):
+        """
+        Rebuild the blocks whose sources changed. affinity_rows(known_signature) is called at most
+        every check_interval seconds → (signature, [(cuisine, slug, freq)] or None when unchanged)
+        """
+        with self._lock:
+            if indicators is not None and indicators is not self._indicator_source:
+                self._indicators = _Block((normalize_term(indicator), cuisine, 1.0)
+                                          for cuisine, cuisine_indicators in indicators
+                                          for indicator in cuisine_indicators)
+                self._indicator_source = indicators
+                self.stats['indicator_builds'] += 1
+
+            typical_changed = False
+            if ingredient_cuisines is not None and ingredient_cuisines is not self._tag_source:
+                self._tag_entries = [(slug, cuisine.lower(), 1.0)
+                                     for slug, cuisines in ingredient_cuisines.items() for cuisine in cuisines or ()]
+                self._tag_source = ingredient_cuisines
+                typical_changed = True
+
+            now = time.monotonic()
+            if affinity_rows is not None and now - self._affinity_checked_at >= self.check_interval:
+                self._affinity_checked_at = now
+                try:
+                    signature, rows = affinity_rows(self._affinity_signature)
+                except Exception as e:
+                    print(f"   ⚠️ Could not read cuisine_ingredient_affinity: {e}")
+                    signature, rows = self._affinity_signature, None
+                if signature != self._affinity_signature and rows is not None:
+                    self._affinity_entries = [(slug, cuisine.lower(), float(frequency))
+                                              for cuisine, slug, frequency in rows
+                                              if cuisine and slug and frequency > self.min_frequency]
+                    self._affinity_signature = signature
+                    typical_changed = True
+
+            if typical_changed:
+                # Tagged ingredients first, in ingredients.json order (ties keep that order)
+                self._typical = _Block(self._tag_entries + self._affinity_entries)
+                self.stats['typical_builds'] += 1
+
+    # ------------------------------------------------------------------ queries
+
+    def _matching_indicators(self, block: _Block, term: str) -> Tuple[int, ...]:
+        """Indicator columns whose text contains `term` or is contained in it"""
+        matches = block.term_matches.get(term)
+        if matches is None:
+            matches = tuple(i for i, indicator in enumerate(block.terms)
+                            if indicator in term or term in indicator)
+            if len(block.term_matches) >= MAX_CACHED_TERMS:
+                block.term_matches.clear()
+            block.term_matches[term] = matches
+        return matches
+
+    def cuisine_fit(self, ingredients: List[str]) -> List[Tuple[str, int, List[str]]]:
+        """(cuisine, matching ingredient count, matching ingredients) for every cuisine with a match"""
+        block = self._indicators
+        self.stats['fit_queries'] += 1
+        if not ingredients or not block.terms:
+            return []
+        rows = [self._matching_indicators(block, normalize_term(ingredient)) for ingredient in ingredients]
+
+        if NUMPY_AVAILABLE:
+            query = np.zeros((len(ingredients), len(block.terms)), dtype=np.float32)
+            for i, columns in enumerate(rows):
+                query[i, list(columns)] = 1.0
+            hits = (query @ block.matrix) > 0          # ingredient × cuisine
+            scores = hits.sum(axis=0)
+            order = np.argsort(-scores, kind='stable')
+            return [(block.cuisines[c], int(scores[c]), [ingredients[i] for i in np.flatnonzero(hits[:, c])])
+                    for c in order if scores[c] > 0]
+
+        matched = {}
+        for ingredient, columns in zip(ingredients, rows):
+            cuisines = set()
+            for column in columns:
+                cuisines.update(block.by_term[column])
+            for c in cuisines:
+                matched.setdefault(c, []).append(ingredient)
+        ranked = sorted(matched.items(), key=lambda item: (-len(item[1]), item[0]))
+        return [(block.cuisines[c], len(found), found) for c, found in ranked]
+
+    def typical_ingredients(self, cuisines: List[str], k: int = 8) -> List[str]:
+        """Top-k ingredient slugs over the given cuisines (tagged + frequent in their recipes)"""
+        block = self._typical
+        self.stats['typical_queries'] += 1
+        columns = [block.cuisine_index[c.lower()] for c in cuisines if c.lower() in block.cuisine_index]
+        if not columns:
+            return []
+
+        if NUMPY_AVAILABLE:
+            weights = block.matrix[:, columns].sum(axis=1)
+            order = np.argsort(-weights, kind='stable')[:k]
+            return [block.terms[t] for t in order if weights[t] > 0]
+
+        weights = {}
+        for c in columns:
+            for t, weight in block.by_cuisine[c].items():
+                weights[t] = weights.get(t, 0.0) + weight
+        ranked = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [block.terms[t] for t, weight in ranked if weight > 0]
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'backend': 'numpy' if NUMPY_AVAILABLE else 'python',
+            'indicators': {'terms': len(self._indicators.terms), 'cuisines': len(self._indicators.cuisines)},
+            'typical': {'ingredients': len(self._typical.terms), 'cuisines': len(self._typical.cuisines),
+                        'db_rows': len(self._affinity_entries)},
+        }
@@ -0,0 +1,111 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: culinary_graph.py
+# * Purpose: Compiled country → region / sisters / Spoonacular cuisine graph with ingredient bitsets
+# */
+
+"""
+Culinary graph
+graph = CulinaryGraph(culinary_regions, ingredient_cuisines)   # once per data version
+graph.region(country)                   → {'key', 'name', 'countries', 'region', 'region_name'} or None
+graph.compatible_sisters(country, ingredients)   → sisters the ingredients fit, in region order
+graph.compatible(ingredients, country)  / graph.compatible_with_spoonacular(ingredients, 'latin american')
+- Every ingredient of ingredients.json gets one bit; each country keeps the bitset of tagged
+  ingredients it does NOT allow, so a request's incompatible count is popcount(request & blocked)
+  → the Level 3 candidate list is one AND + popcount per sister (Python ints, any size)
+- Untagged or unknown ingredients fit everywhere; a country fits when fewer than half of the
+  request's ingredients are blocked (the lenient rule of the old per-ingredient loop)
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from protein_matcher import popcount
+
+
+class CulinaryGraph:
+    """Lookup tables compiled from culinary_regions.json and ingredients.json cuisine tags"""
+
+    def __init__(self, culinary_regions: Dict, ingredient_cuisines: Dict[str, List[str]],
+                 country_to_spoonacular: Dict[str, str] = None):
+        self.sources = (culinary_regions, ingredient_cuisines, country_to_spoonacular)
+        if country_to_spoonacular is None:
+            country_to_spoonacular = culinary_regions.get('country_to_spoonacular', {})
+        self.country_to_spoonacular = country_to_spoonacular
+
+        # country → its (first) subregion, the order the old region walk found it in
+        self._regions = {}
+        for region_key, region_data in culinary_regions.get('regions', {}).items():
+            for subregion_key, subregion_data in region_data.get('subregions', {}).items():
+                countries = subregion_data.get('countries', [])
+                info = {
+                    'key': subregion_key,
+                    'name': subregion_data.get('name', subregion_key),
+                    'countries': countries,
+                    'region': region_key,
+                    'region_name': region_data.get('name', region_key),
+                }
+                for country in countries:
+                    self._regions.setdefault(country, info)
+
+        self._spoonacular_countries = {}
+        for country, cuisine in country_to_spoonacular.items():
+            self._spoonacular_countries.setdefault(cuisine, []).append(country)
+
+        # Ingredient bits; a tagged ingredient is blocked in every country outside its tag list
+        self.ingredient_bits = {slug: 1 << bit for bit, slug in enumerate(ingredient_cuisines)}
+        self._restricted = 0
+        allowed = {}
+        for slug, countries in ingredient_cuisines.items():
+            if countries:
+                bit = self.ingredient_bits[slug]
+                self._restricted |= bit
+                for country in countries:
+                    allowed[country] = allowed.get(country, 0) | bit
+        self._blocked = {country: self._restricted & ~bits for country, bits in allowed.items()}
+        self.has_tags = bool(ingredient_cuisines)
+
+    def region(self, country: str) -> Optional[Dict]:
+        return self._regions.get(country)
+
+    def sisters(self, country: str) -> List[str]:
+        region = self._regions.get(country)
+        return [c for c in region['countries'] if c != country] if region else []
+
+    def ingredient_mask(self, ingredients: Iterable[str]) -> int:
+        """Bitset of a request's tagged ingredients"""
+        mask = 0
+        for slug in ingredients:
+            mask |= self.ingredient_bits.get(slug, 0)
+        return mask & self._restricted
+
+    def _fits(self, mask: int, count: int, country: str) -> bool:
+        blocked = self._blocked.get(country, self._restricted)
+        return popcount(mask & blocked) < count / 2
+
+    def compatible(self, ingredients: List[str], country: str) -> bool:
+        """Can MOST of these ingredients be used in this country's cuisine"""
+        if not self.has_tags:
+            return True
+        ingredients = list(dict.fromkeys(ingredients))
+        return self._fits(self.ingredient_mask(ingredients), len(ingredients), country)
+
+    def compatible_sisters(self, country: str, ingredients: List[str]) -> List[str]:
+        """Sister countries (same subregion, region order) the ingredients fit"""
+        sisters = self.sisters(country)
+        if not self.has_tags:
+            return sisters
+        ingredients = list(dict.fromkeys(ingredients))
+        mask, count = self.ingredient_mask(ingredients), len(ingredients)
+        return [sister for sister in sisters if self._fits(mask, count, sister)]
+
+    def compatible_with_spoonacular(self, ingredients: List[str], spoon_cuisine: str) -> bool:
+        """Does ANY country of this Spoonacular cuisine fit the ingredients"""
+        countries = self._spoonacular_countries.get(spoon_cuisine, [])
+        if not self.has_tags:
+            return bool(countries)
+        ingredients = list(dict.fromkeys(ingredients))
+        mask, count = self.ingredient_mask(ingredients), len(ingredients)
+        return any(self._fits(mask, count, country) for country in countries)
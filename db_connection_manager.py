@@ -0,0 +1,176 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: db_connection_manager.py
+# * Purpose: Pooled, thread-local SQLite connections for the local recipe database
+# */
+
+"""
+Connection manager for the LOCAL RecipeGen database
+- Read connections are thread-local, query_only and reused across searches
+- Connections of finished threads go back to a small idle pool
+- ONE writer connection (serialized by a lock) handles every save
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+
+class _ThreadSlot:
+    """Holds a thread's read connection and hands it back to the pool when the thread dies"""
+
+    def __init__(self, conn: sqlite3.Connection, idle_pool: deque, max_idle: int,
+                 on_close: Callable[[sqlite3.Connection], None]):
+        self.conn = conn
+        self._idle_pool = idle_pool
+        self._max_idle = max_idle
+        self._on_close = on_close
+
+    def __del__(self):
+        # Runs when the owning thread exits and its thread-local data is cleared
+        try:
+            if len(self._idle_pool) < self._max_idle:
+                self._idle_pool.append(self.conn)
+            else:
+                self._on_close(self.conn)
+        except Exception:
+            pass
+
+
+class ConnectionManager:
+    """Thread-local read connections + a single serialized writer for one SQLite file"""
+
+    def __init__(self, db_path: str, mmap_size: int = 256 * 1024 * 1024,
+                 cache_size_kb: int = 64 * 1024, busy_timeout: float = 10,
+                 max_idle: int = 8, cached_statements: int = 256):
+        self.db_path = db_path
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.busy_timeout = busy_timeout
+        self.max_idle = max_idle
+        self.cached_statements = cached_statements
+
+        self._local = threading.local()
+        self._idle_pool = deque()
+        self._all_connections = set()
+        self._registry_lock = threading.Lock()
+
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+        # Counters for reuse and wait time
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'read_opened': 0,        # Brand new read connections
+            'read_recycled': 0,      # Taken over from a finished thread
+            'read_reused': 0,        # Served from the calling thread's own connection
+            'writes': 0,
+            'write_wait_ms_total': 0.0,
+            'write_wait_ms_max': 0.0,
+        }
+
+    def _count(self, key: str, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout,
+                               check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size={-int(self.cache_size_kb)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        with self._registry_lock:
+            self._all_connections.add(conn)
+        return conn
+
+    def _close(self, conn: sqlite3.Connection):
+        """Close one connection and stop tracking it"""
+        with self._registry_lock:
+            self._all_connections.discard(conn)
+        conn.close()
+
+    def read_connection(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection (opened once, then reused)"""
+        slot = getattr(self._local, 'slot', None)
+        if slot is not None:
+            self._count('read_reused')
+            return slot.conn
+
+        try:
+            conn = self._idle_pool.popleft()
+            self._count('read_recycled')
+        except IndexError:
+            conn = self._open()
+            conn.execute("PRAGMA query_only=ON")
+            self._count('read_opened')
+
+        self._local.slot = _ThreadSlot(conn, self._idle_pool, self.max_idle, self._close)
+        return conn
+
+    def _writer_connection(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self._writer = self._open()
+            self._writer.execute("PRAGMA journal_mode=WAL")
+            self._writer.execute("PRAGMA synchronous=NORMAL")
+        return self._writer
+
+    @contextmanager
+    def writer(self):
+        """
+        Exclusive access to the single writer connection
+        Commits on success, rolls back on error
+        """
+        wait_start = time.perf_counter()
+        with self._writer_lock:
+            waited_ms = (time.perf_counter() - wait_start) * 1000
+            with self._stats_lock:
+                self.stats['writes'] += 1
+                self.stats['write_wait_ms_total'] += waited_ms
+                self.stats['write_wait_ms_max'] = max(self.stats['write_wait_ms_max'], waited_ms)
+
+            conn = self._writer_connection()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def enable_wal(self):
+        """Switch the database to WAL once, from the writer connection"""
+        with self.writer():
+            pass
+
+    def get_stats(self) -> Dict:
+        """Snapshot of the reuse/wait counters"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['idle_connections'] = len(self._idle_pool)
+        with self._registry_lock:
+            stats['open_connections'] = len(self._all_connections)
+        return stats
+
+    def close_all(self):
+        """Close every connection this manager opened (shutdown/tests)"""
+        # A writer() running in another thread (background back-fill) finishes first -
+        # closing a connection under a running statement crashes the interpreter
+        with self._writer_lock:
+            with self._registry_lock:
+                connections = self._all_connections
+                self._all_connections = set()
+            for conn in connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            # Fresh pool/local so slots of old threads can't hand back closed connections
+            self._idle_pool = deque()
+            self._local = threading.local()
+            self._writer = None
@@ -4,6 +4,9 @@ import time
 import os
 import requests
 from typing import Dict, Optional
+from recipe_schema import ensure_denormalized_columns, ingredient_slug_text, spice_level_score
+from recipe_fts import ensure_recipe_fts, FTS_TABLE
+from recipe_minhash import ImportDuplicateGuard
 
 class DatabaseController:
     def __init__(self, db_path: str = "D:/RecipeGen_Database/processed/recipegen_master.db"):
@@ -64,8 +67,17 @@ class DatabaseController:
             self.cursor.execute("INSERT INTO recipes_temp SELECT * FROM recipes")
             self.cursor.execute("DROP TABLE recipes")
             self.cursor.execute("ALTER TABLE recipes_temp RENAME TO recipes")
+            # Rowids changed - full-text index is rebuilt below
+            self.cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
             self.conn.commit()
             print("✅ Database schema updated")
+        
+        # Pre-normalized slug/spice columns used by the 4D matcher's Level 1 query
+        ensure_denormalized_columns(self.conn)
+        ensure_recipe_fts(self.conn)
+        # MinHash signatures - near-duplicates of stored recipes are not imported again
+        self.duplicate_guard = ImportDuplicateGuard(self.conn)
+        self.conn.commit()
             
         print(f"✅ Connected to database: {self.db_path}")
         
@@ -548,6 +560,17 @@ class DatabaseController:
         except Exception as e:
             return None
             
+    @staticmethod
+    def _ingredient_slugs(recipe: Dict) -> list:
+        """recipe_ingredients slugs of a recipe (the same fallback save_recipe uses)"""
+        slugs = []
+        for ing in recipe.get('ingredients', []):
+            ingredient_name = ing.get('item') or ing.get('name', '')
+            slug = ing.get('slug', '') or ingredient_name.lower().replace(' ', '_')
+            if slug:
+                slugs.append(slug)
+        return slugs
+    
     def save_recipe(self, recipe: Dict, source: str) -> bool:
         """Save recipe exactly as provided"""
         try:
@@ -565,6 +588,14 @@ class DatabaseController:
             if not recipe.get('title'):
                 self.stats['skipped'] += 1
                 return False
+            
+            # Same ingredients and (nearly) the same title as a stored recipe
+            ingredient_slugs = self._ingredient_slugs(recipe)
+            duplicate = self.duplicate_guard.duplicate_of(recipe_id, ingredient_slugs, recipe['title'],
+                                                          recipe.get('cuisine'))
+            if duplicate:
+                self.stats['duplicates'] += 1
+                return False
                 
             # Get all column names from the table
             self.cursor.execute("PRAGMA table_info(recipes)")
@@ -584,6 +615,11 @@ class DatabaseController:
                     values.append(recipe.get('dish_type'))
                 elif col == 'ingredients':
                     values.append(json.dumps(recipe.get('ingredients', [])))
+                elif col == 'ingredient_slugs':
+                    values.append(ingredient_slug_text(recipe.get('ingredients', [])))
+                elif col == 'spice_level_score':
+                    values.append(spice_level_score(recipe.get('title'),
+                                                    ingredient_slug_text(recipe.get('ingredients', []))))
                 elif col == 'instructions':
                     values.append(json.dumps(recipe.get('instructions', [])))
                 elif col == 'prep_time':
@@ -642,6 +678,7 @@ class DatabaseController:
                     except:
                         pass  # recipe_ingredients table might not exist
             
+            self.duplicate_guard.record(recipe_id, ingredient_slugs, recipe['title'], recipe.get('cuisine'))
             self.conn.commit()
             self.stats['imported'] += 1
             
@@ -10,6 +10,7 @@ import requests
 import os
 from datetime import datetime, timedelta
 import schedule
+from recipe_minhash import ImportDuplicateGuard
 
 print("=== RecipeGen Download Controller ===\n")
 
@@ -49,6 +50,9 @@ class DownloadController:
     def __init__(self):
         self.conn = sqlite3.connect(DB_PATH)
         self.cursor = self.conn.cursor()
+        # MinHash signatures - near-duplicates of stored recipes are not saved again
+        self.duplicate_guard = ImportDuplicateGuard(self.conn)
+        self.conn.commit()
         self.load_progress()
     
     def load_progress(self):
@@ -180,6 +184,9 @@ class DownloadController:
             'quality_score': min(90, 50 + recipe_data.get('spoonacularScore', 0) // 2)
         }
         
+        if self._is_duplicate(recipe):
+            return
+        
         # Save to database
         try:
             self.cursor.execute('''
@@ -205,10 +212,23 @@ class DownloadController:
                     INSERT INTO recipe_ingredients (recipe_id, ingredient_slug, ingredient_name, amount)
                     VALUES (?, ?, ?, ?)
                 ''', (recipe['id'], ing['slug'], ing['name'], ing['amount']))
+            self._record_signature(recipe)
                 
         except Exception as e:
             print(f"    Error saving {recipe['title']}: {e}")
     
+    def _is_duplicate(self, recipe):
+        """Same ingredients and (nearly) the same title as a stored recipe of the cuisine"""
+        duplicate = self.duplicate_guard.duplicate_of(recipe['id'], [ing['slug'] for ing in recipe['ingredients']],
+                                                      recipe['title'], recipe['cuisine'])
+        if duplicate:
+            print(f"    ♻️ Skipping {recipe['title']} - near-duplicate of {duplicate}")
+        return bool(duplicate)
+    
+    def _record_signature(self, recipe):
+        self.duplicate_guard.record(recipe['id'], [ing['slug'] for ing in recipe['ingredients']],
+                                    recipe['title'], recipe['cuisine'])
+    
     def download_edamam_batch(self, limit=1000):
         """Download batch from Edamam"""
         if not self.can_download_today('edamam'):
@@ -325,6 +345,9 @@ class DownloadController:
             'quality_score': 70 if recipe_data.get('url') else 60
         }
         
+        if self._is_duplicate(recipe):
+            return
+        
         # Save to database (similar to spoonacular)
         try:
             self.cursor.execute('''
@@ -349,6 +372,7 @@ class DownloadController:
                     INSERT INTO recipe_ingredients (recipe_id, ingredient_slug, ingredient_name, amount)
                     VALUES (?, ?, ?, ?)
                 ''', (recipe['id'], ing['slug'], ing['name'], ing['amount']))
+            self._record_signature(recipe)
                 
         except Exception as e:
             print(f"    Error saving {recipe['title']}: {e}")
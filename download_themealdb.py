@@ -9,6 +9,7 @@ import sqlite3
 import time
 from datetime import datetime
 import os
+from recipe_minhash import ImportDuplicateGuard
 
 print("=== TheMealDB Complete Download ===\n")
 
@@ -21,6 +22,10 @@ os.makedirs(RAW_PATH, exist_ok=True)
 conn = sqlite3.connect(DB_PATH)
 cursor = conn.cursor()
 
+# MinHash signatures - near-duplicates of stored recipes are not saved again
+duplicate_guard = ImportDuplicateGuard(conn)
+conn.commit()
+
 def normalize_to_recipegen(meal_data):
     """Convert TheMealDB format to RecipeGen format"""
     
@@ -144,6 +149,11 @@ def download_all_meals():
             # Normalize and save to database
             try:
                 recipe = normalize_to_recipegen(meal_data)
+                slugs = [ing['slug'] for ing in recipe['ingredients']]
+                duplicate = duplicate_guard.duplicate_of(recipe['id'], slugs, recipe['title'], recipe['cuisine'])
+                if duplicate:
+                    print(f"  ♻️ {recipe['title']} - near-duplicate of {duplicate}, skipped")
+                    continue
                 
                 # Insert into main recipes table
                 cursor.execute('''
@@ -174,6 +184,7 @@ def download_all_meals():
                         INSERT INTO recipe_ingredients (recipe_id, ingredient_slug, ingredient_name, amount)
                         VALUES (?, ?, ?, ?)
                     ''', (recipe['id'], ing['slug'], ing['name'], ing['amount']))
+                duplicate_guard.record(recipe['id'], slugs, recipe['title'], recipe['cuisine'])
                 
                 total_downloaded += 1
                 print(f"  ✓ {recipe['title']}")
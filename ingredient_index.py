@@ -0,0 +1,202 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: ingredient_index.py
+# * Purpose: In-memory inverted index over the LOCAL recipe database
+# */
+
+"""
+Inverted index for Level 1 lookups
+ingredient slug / cuisine / dish_type → sorted array of recipe rowids
+Built once from recipe_ingredients, then updated as recipes are saved through RecipeMatcher4D
+Recipes written by other processes (DatabaseController, create_recipe_database.py, the import
+scripts) are NOT seen until the index is rebuilt - is_current() tells when that is needed
+"""
+
+import heapq
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def _insert_sorted(postings: array, rowid: int):
+    """Insert rowid into a sorted posting list (no duplicates)"""
+    pos = bisect_left(postings, rowid)
+    if pos == len(postings) or postings[pos] != rowid:
+        postings.insert(pos, rowid)
+
+
+def _intersect_sorted(a: Sequence[int], b: Sequence[int]) -> List[int]:
+    """
+    Intersection of two sorted posting lists
+    Walks the shorter one and gallops (bisect from the last hit) through the longer one
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    result = []
+    lo, end = 0, len(b)
+    for rowid in a:
+        lo = bisect_left(b, rowid, lo)
+        if lo == end:
+            break
+        if b[lo] == rowid:
+            result.append(rowid)
+            lo += 1
+    return result
+
+
+def _union_sorted(lists: List[Sequence[int]]) -> List[int]:
+    """Union of sorted posting lists, merged in order without duplicates"""
+    if len(lists) == 1:
+        return list(lists[0])
+    result = []
+    for rowid in heapq.merge(*lists):
+        if not result or result[-1] != rowid:
+            result.append(rowid)
+    return result
+
+
+class IngredientIndex:
+    """Posting lists of recipe rowids keyed by ingredient slug, cuisine and dish type"""
+
+    TYPECODE = 'q'  # 64-bit signed, same range as SQLite rowids
+
+    def __init__(self):
+        self.by_ingredient: Dict[str, array] = {}
+        self.by_cuisine: Dict[str, array] = {}
+        self.by_dish_type: Dict[str, array] = {}
+        self.recipe_count = 0
+        self.max_rowid = 0  # Highest recipes.rowid indexed - an insert elsewhere moves the table past it
+        self.built = False
+        self._lock = threading.RLock()
+
+    def _postings(self, table: Dict[str, array], key: str) -> array:
+        postings = table.get(key)
+        if postings is None:
+            postings = table[key] = array(self.TYPECODE)
+        return postings
+
+    def build(self, conn) -> 'IngredientIndex':
+        """Build all posting lists from the database (one pass per table)"""
+        by_ingredient, by_cuisine, by_dish_type = {}, {}, {}
+        count = max_rowid = 0
+
+        cursor = conn.execute("SELECT rowid, cuisine, dish_type FROM recipes ORDER BY rowid")
+        for rowid, cuisine, dish_type in cursor:
+            count += 1
+            max_rowid = rowid
+            if cuisine:
+                by_cuisine.setdefault(cuisine, array(self.TYPECODE)).append(rowid)
+            if dish_type:
+                by_dish_type.setdefault(dish_type, array(self.TYPECODE)).append(rowid)
+
+        # Ordered by rowid so every posting list comes out sorted without a sort pass
+        cursor = conn.execute('''
+            SELECT DISTINCT r.rowid, ri.ingredient_slug
+            FROM recipe_ingredients ri
+            JOIN recipes r ON r.id = ri.recipe_id
+            WHERE ri.ingredient_slug IS NOT NULL AND ri.ingredient_slug != ''
+            ORDER BY r.rowid
+        ''')
+        for rowid, slug in cursor:
+            by_ingredient.setdefault(slug, array(self.TYPECODE)).append(rowid)
+
+        with self._lock:
+            self.by_ingredient = by_ingredient
+            self.by_cuisine = by_cuisine
+            self.by_dish_type = by_dish_type
+            self.recipe_count = count
+            self.max_rowid = max_rowid
+            self.built = True
+        return self
+
+    def is_current(self, conn) -> bool:
+        """
+        False once recipes were inserted behind the index's back (other processes, import scripts)
+        One MAX(rowid) lookup - the rowid B-tree answers it without a scan
+        """
+        latest = conn.execute("SELECT MAX(rowid) FROM recipes").fetchone()[0] or 0
+        with self._lock:
+            return latest <= self.max_rowid
+
+    def add_recipe(self, rowid: int, cuisine: Optional[str], dish_type: Optional[str],
+                   ingredient_slugs: Iterable[str]):
+        """Incrementally index a freshly inserted recipe"""
+        with self._lock:
+            if cuisine:
+                _insert_sorted(self._postings(self.by_cuisine, cuisine), rowid)
+            if dish_type:
+                _insert_sorted(self._postings(self.by_dish_type, dish_type), rowid)
+            for slug in set(ingredient_slugs):
+                if slug:
+                    _insert_sorted(self._postings(self.by_ingredient, slug), rowid)
+            self.recipe_count += 1
+            self.max_rowid = max(self.max_rowid, rowid)
+
+    def candidates(self, cuisine: str, dish_type: Optional[str] = None,
+                   ingredients: Optional[List[str]] = None) -> List[int]:
+        """
+        Level 1 candidate rowids:
+        cuisine ∩ dish_type ∩ (any of the ingredients), sorted ascending
+        """
+        with self._lock:
+            cuisine_postings = self.by_cuisine.get(cuisine)
+            if not cuisine_postings:
+                return []
+            result = cuisine_postings
+
+            if dish_type:
+                result = _intersect_sorted(result, self.by_dish_type.get(dish_type, ()))
+                if not result:
+                    return []
+
+            if ingredients:
+                # (cuisine ∩ ingredient) per ingredient - each bounded by the smaller list - then merged
+                matching = []
+                for slug in dict.fromkeys(ingredients):
+                    postings = self.by_ingredient.get(slug)
+                    if postings:
+                        hits = _intersect_sorted(result, postings)
+                        if hits:
+                            matching.append(hits)
+                if not matching:
+                    return []
+                return _union_sorted(matching)
+
+            return list(result)
+
+    def containing(self, cuisine: str, ingredients: List[str], min_shared: int = 1) -> List[Tuple[int, int]]:
+        """
+        Rowids of the cuisine that have at least min_shared of the ingredients:
+        [(rowid, shared), ...] most shared first - exact containment, whatever else the recipe has
+        """
+        with self._lock:
+            cuisine_postings = self.by_cuisine.get(cuisine)
+            if not cuisine_postings:
+                return []
+            shared = {}
+            for slug in dict.fromkeys(ingredients):
+                postings = self.by_ingredient.get(slug)
+                if postings:
+                    for rowid in _intersect_sorted(cuisine_postings, postings):
+                        shared[rowid] = shared.get(rowid, 0) + 1
+        return sorted(((rowid, count) for rowid, count in shared.items() if count >= min_shared),
+                      key=lambda hit: (-hit[1], hit[0]))
+
+    def memory_footprint(self) -> Dict:
+        """Approximate bytes held by the index (posting arrays + dict/key overhead)"""
+        with self._lock:
+            report = {'recipes': self.recipe_count, 'bytes': 0}
+            for name, table in (('ingredients', self.by_ingredient),
+                                ('cuisines', self.by_cuisine),
+                                ('dish_types', self.by_dish_type)):
+                postings = sum(len(p) for p in table.values())
+                size = sys.getsizeof(table)
+                size += sum(sys.getsizeof(k) + sys.getsizeof(p) for k, p in table.items())
+                report[name] = {'keys': len(table), 'postings': postings, 'bytes': size}
+                report['bytes'] += size
+        return report
@@ -0,0 +1,133 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: keyword_matcher.py
+# * Purpose: One-pass multi-keyword detection (meat, proteins, spice words, dish type hints)
+# */
+
+"""
+Keyword Matcher
+All keywords of all categories are compiled ONCE into a single regex
+(a prefix trie written as nested alternations). One scan of a text returns
+every category that matched; after each hit the scan resumes one character
+later, so overlapping keywords are not lost.
+
+Semantics are plain substring semantics - exactly what `word in text` loops did:
+a keyword counts if it appears anywhere, even inside a longer keyword
+("ham" in "graham", "hot" in "shot"). Keywords hidden inside a longer match
+at the same position are recovered through a precomputed substring closure.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, Set
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex for a set of literal words, factored by common prefix"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End of word
+
+    def render(node) -> str:
+        ends_here = '' in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if ends_here:
+            # Longest first: try to continue, otherwise stop here
+            return '(?:' + body + ')?'
+        return body
+
+    return render(trie)
+
+
+class KeywordMatcher:
+    """Category → keyword lists, matched together in one pass over a text"""
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self.categories: Dict[str, FrozenSet[str]] = {}
+        self._word_categories: Dict[str, Set[str]] = {}
+        for category, words in categories.items():
+            cleaned = frozenset(w.lower() for w in words if w)
+            self.categories[category] = cleaned
+            for word in cleaned:
+                self._word_categories.setdefault(word, set()).add(category)
+
+        keywords = sorted(self._word_categories)
+        # Every keyword → all keywords it contains (itself included)
+        self._contains = {
+            word: frozenset(other for other in keywords if other in word)
+            for word in keywords
+        }
+        self._regex = re.compile(_trie_pattern(keywords)) if keywords else None
+
+    def words(self, text: str) -> Set[str]:
+        """Every keyword that occurs in text (case-insensitive substring match)"""
+        if self._regex is None or not text:
+            return set()
+        text = text.lower()
+        search = self._regex.search
+        found = set()
+        match = search(text)
+        while match:
+            found.update(self._contains[match.group()])
+            # Resume one char later so overlapping keywords are found too
+            match = search(text, match.start() + 1)
+        return found
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        """category → matched keywords (only categories that matched)"""
+        result: Dict[str, Set[str]] = {}
+        for word in self.words(text):
+            for category in self._word_categories[word]:
+                result.setdefault(category, set()).add(word)
+        return result
+
+    def matched_categories(self, text: str) -> Set[str]:
+        return set(self.scan(text))
+
+    def contains(self, text: str, category: str) -> bool:
+        """Does text contain ANY keyword of the category"""
+        return category in self.scan(text)
+
+
+if __name__ == "__main__":
+    import json
+    import time
+
+    # Same word lists RecipeMatcher4D compiles (meat + spice tables)
+    categories = {
+        'meat': ['chicken', 'beef', 'pork', 'lamb', 'fish', 'prawns', 'shrimp', 'seafood', 'turkey',
+                 'duck', 'salmon', 'tuna', 'anchovy', 'sardine', 'mackerel', 'trout', 'halibut', 'cod',
+                 'tilapia', 'catfish', 'bass', 'snapper', 'veal', 'venison', 'rabbit', 'goat', 'mutton',
+                 'bacon', 'ham', 'sausage', 'chorizo', 'prosciutto', 'pancetta', 'crab', 'lobster',
+                 'octopus', 'squid', 'calamari', 'scallops', 'mussels', 'clams', 'oysters'],
+        'spice_mild': ['mild', 'gentle', 'sweet'],
+        'spice_medium': ['spicy', 'zesty', 'tangy', 'seasoned'],
+        'spice_hot': ['hot', 'spicy', 'chili', 'pepper', 'fiery'],
+        'spice_extra': ['very hot', 'extra spicy', 'fiery', 'jalapeño'],
+        'spice_insane': ['ghost', 'habanero', 'scorpion', 'carolina', 'volcanic'],
+    }
+    matcher = KeywordMatcher(categories)
+
+    texts = [json.dumps([{'name': n, 'slug': n.replace(' ', '_'), 'amount': '2 cups'}
+                         for n in ('black beans', 'onion', 'garlic', 'cumin', 'tomato', 'cilantro',
+                                   'lime', 'vegetable stock', 'olive oil', f'pepper {i}')]).lower()
+             for i in range(5000)]
+
+    start = time.perf_counter()
+    loops = [{c for c, words in categories.items() if any(w in t for w in words)} for t in texts]
+    old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scans = [matcher.matched_categories(t) for t in texts]
+    new = time.perf_counter() - start
+
+    assert loops == scans
+    print(f"{len(texts)} texts - per-category loops: {old * 1000:.1f} ms  one-pass matcher: {new * 1000:.1f} ms")
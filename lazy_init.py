@@ -0,0 +1,100 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: lazy_init.py
+# * Purpose: Build expensive singletons and their components on first use, thread-safely
+# */
+
+"""
+Lazy initialization
+class Matcher:
+    @lazy_component
+    def ai_chef(self):                  # built by the first thread that reads matcher.ai_chef
+        return AIChefGenerator()
+matcher = LazySingleton(Matcher, 'Matcher')   # nothing is built at import
+matcher.find_recipe(...)                      # first attribute access builds it
+matcher.warm_up()                             # or build it (and its warm_up()) up front
+- Assigning the attribute (tests, tooling) replaces the lazy value like a plain attribute
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+class lazy_component:
+    """Thread-safe cached property: the builder runs once per instance, later reads are a dict lookup"""
+
+    def __init__(self, builder: Callable):
+        self.builder = builder
+        self.name = builder.__name__
+        self.__doc__ = builder.__doc__
+        self._lock = threading.RLock()
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            pass
+        with self._lock:
+            # Another thread may have finished building while we waited
+            if self.name not in instance.__dict__:
+                instance.__dict__[self.name] = self.builder(instance)
+            return instance.__dict__[self.name]
+
+    @staticmethod
+    def is_built(instance, name: str) -> bool:
+        return name in instance.__dict__
+
+
+class LazySingleton:
+    """Module-level stand-in that constructs `factory()` on first attribute access"""
+
+    def __init__(self, factory: Callable, name: str = None):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_name', name or getattr(factory, '__name__', 'singleton'))
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def get(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    started = time.perf_counter()
+                    object.__setattr__(self, '_instance', self._factory())
+                    print(f"⏱️ {self._name} built in {time.perf_counter() - started:.2f}s")
+                instance = self._instance
+        return instance
+
+    @property
+    def ready(self) -> bool:
+        return self._instance is not None
+
+    def warm_up(self, background: bool = False):
+        """Build now (and run the instance's own warm_up) - in a daemon thread if background"""
+        def build():
+            instance = self.get()
+            if hasattr(instance, 'warm_up'):
+                instance.warm_up()
+        if background:
+            thread = threading.Thread(target=build, name=f'warm-up-{self._name}', daemon=True)
+            thread.start()
+            return thread
+        build()
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.get(), name, value)
+
+    def __repr__(self):
+        return f"<LazySingleton {self._name} {'ready' if self.ready else 'not built'}>"
@@ -0,0 +1,217 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: level_predictor.py
+# * Purpose: Per cuisine/dish type cascade statistics → AI speculation and level routing
+# */
+
+"""
+Cascade outcome predictor (learned routing)
+Per (cuisine, dish_type, level): attempts, hits, total ms, API calls - kept in
+cascade_level_stats of the local DB so the history survives restarts
+- api_hit_probability() → chance Levels 2/3 answer once Level 1 missed (speculative AI)
+- route() → which of Levels 2/3 to run and in what order: a level that almost never
+  answers is skipped, a better one goes first; every explore_every-th request of a
+  cuisine/dish type runs the full fixed order so the numbers keep moving
+- CascadeTrace is what one cascade did, recorded when it resolves
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+STATS_TABLE = 'cascade_level_stats'
+
+# Level names used by the matcher (and its deadline report) → level numbers
+CASCADE_LEVELS = {'level1': 1, 'level2': 2, 'level3': 3, 'level4': 4}
+
+# The levels routing may skip or reorder - Level 1 is cheap, Level 4 is the last resort
+ROUTED_LEVELS = (2, 3)
+
+
+class CascadeTrace:
+    """Levels one cascade ran: {level: {'hit', 'ms', 'api_calls'}} (API calls may come from worker threads)"""
+
+    def __init__(self):
+        self.levels = {}
+        self.current = None
+        self._lock = threading.Lock()
+
+    def _entry(self, level: int) -> Dict:
+        return self.levels.setdefault(level, {'hit': False, 'ms': 0.0, 'api_calls': 0})
+
+    @contextmanager
+    def level(self, level: int):
+        entry = self._entry(level)
+        outer, self.current = self.current, level
+        started = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['ms'] += (time.perf_counter() - started) * 1000
+            self.current = outer
+
+    def count_api_call(self):
+        with self._lock:
+            if self.current is not None:
+                self._entry(self.current)['api_calls'] += 1
+
+    def resolved(self, level: int, hit: bool = True):
+        """`level` ended the cascade (a Level 4 that was skipped for time still counts as reached)"""
+        self._entry(level)['hit'] = hit
+
+
+def ensure_stats_table(conn: sqlite3.Connection):
+    """Create cascade_level_stats if missing (caller commits)"""
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+            cuisine TEXT NOT NULL,
+            dish_type TEXT NOT NULL,
+            level INTEGER NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            hits INTEGER NOT NULL DEFAULT 0,
+            total_ms REAL NOT NULL DEFAULT 0,
+            api_calls INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL,
+            PRIMARY KEY (cuisine, dish_type, level)
+        )
+    ''')
+
+
+class CascadeOutcomePredictor:
+    """Level statistics per (cuisine, dish_type), with the routing decisions derived from them"""
+
+    def __init__(self, min_samples: int = 5, prior_hits: float = 1.0, prior_misses: float = 1.0,
+                 skip_below: float = 0.1, explore_every: int = 10):
+        self.min_samples = min_samples
+        self.prior_hits = prior_hits
+        self.prior_misses = prior_misses
+        self.skip_below = skip_below
+        self.explore_every = explore_every
+        self._stats = {}    # (cuisine, dish_type) → {level: {'attempts', 'hits', 'total_ms', 'api_calls'}}
+        self._pending = {}  # the same shape, not yet written to the DB
+        self._pending_cascades = 0
+        self._routed = {}   # (cuisine, dish_type) → requests routed so far (for exploration)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(cuisine: str, dish_type: Optional[str]) -> tuple:
+        return ((cuisine or '').lower().strip(), (dish_type or 'any').lower().strip())
+
+    @staticmethod
+    def _add(table: Dict, key: tuple, level: int, attempts: int, hits: int, ms: float, api_calls: int):
+        counts = table.setdefault(key, {}).setdefault(
+            level, {'attempts': 0, 'hits': 0, 'total_ms': 0.0, 'api_calls': 0})
+        counts['attempts'] += attempts
+        counts['hits'] += hits
+        counts['total_ms'] += ms
+        counts['api_calls'] += api_calls
+
+    def record_trace(self, cuisine: str, dish_type: Optional[str], trace: CascadeTrace):
+        """Book every level one cascade ran"""
+        key = self._key(cuisine, dish_type)
+        with self._lock:
+            self._pending_cascades += 1
+            for level, entry in trace.levels.items():
+                for table in (self._stats, self._pending):
+                    self._add(table, key, level, 1, int(entry['hit']), entry['ms'], entry['api_calls'])
+
+    def record(self, cuisine: str, dish_type: Optional[str], level: int):
+        """A cascade resolved at `level` after missing every level before it (no timings)"""
+        trace = CascadeTrace()
+        for missed in range(1, level):
+            trace.resolved(missed, hit=False)
+        trace.resolved(level)
+        self.record_trace(cuisine, dish_type, trace)
+
+    def _hit_rate(self, counts: Dict) -> Optional[float]:
+        """Smoothed hit rate of one level, None below min_samples"""
+        if counts is None or counts['attempts'] < self.min_samples:
+            return None
+        return (counts['hits'] + self.prior_hits) / (counts['attempts'] + self.prior_hits + self.prior_misses)
+
+    def api_hit_probability(self, cuisine: str, dish_type: Optional[str]) -> Optional[float]:
+        """P(Level 2/3 answers | Level 1 missed), or None with too little history"""
+        with self._lock:
+            levels = self._stats.get(self._key(cuisine, dish_type), {})
+            hits = sum(levels[level]['hits'] for level in ROUTED_LEVELS if level in levels)
+            misses = levels[4]['attempts'] if 4 in levels else 0
+        if hits + misses < self.min_samples:
+            return None
+        return (hits + self.prior_hits) / (hits + misses + self.prior_hits + self.prior_misses)
+
+    def route(self, cuisine: str, dish_type: Optional[str]) -> List[int]:
+        """Levels 2/3 to run after a Level 1 miss, best first (fixed order while exploring)"""
+        key = self._key(cuisine, dish_type)
+        with self._lock:
+            count = self._routed[key] = self._routed.get(key, 0) + 1
+            levels = self._stats.get(key, {})
+            rates = {level: self._hit_rate(levels.get(level)) for level in ROUTED_LEVELS}
+        if self.explore_every and count % self.explore_every == 0:
+            return list(ROUTED_LEVELS)
+        return self._route_from(rates)
+
+    def _route_from(self, rates: Dict[int, Optional[float]]) -> List[int]:
+        kept = [level for level in ROUTED_LEVELS if rates[level] is None or rates[level] >= self.skip_below]
+        # Levels without enough history keep their place in front; known ones are ordered by hit rate
+        return sorted(kept, key=lambda level: -(rates[level] if rates[level] is not None else 1.0))
+
+    def load(self, conn: sqlite3.Connection) -> int:
+        """Add the persisted statistics to what's in memory (once, at startup). Returns rows loaded"""
+        rows = conn.execute(f'''
+            SELECT cuisine, dish_type, level, attempts, hits, total_ms, api_calls FROM {STATS_TABLE}
+        ''').fetchall()
+        with self._lock:
+            for cuisine, dish_type, level, attempts, hits, total_ms, api_calls in rows:
+                self._add(self._stats, (cuisine, dish_type), level, attempts, hits, total_ms, api_calls)
+        return len(rows)
+
+    def pending(self) -> int:
+        """Cascades recorded since the last flush"""
+        with self._lock:
+            return self._pending_cascades
+
+    def flush(self, conn: sqlite3.Connection) -> int:
+        """Add the not yet persisted counts to cascade_level_stats (caller commits). Returns rows written"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_cascades = 0
+        rows = [(cuisine, dish_type, level, c['attempts'], c['hits'], c['total_ms'], c['api_calls'], time.time())
+                for (cuisine, dish_type), levels in pending.items() for level, c in levels.items()]
+        conn.executemany(f'''
+            INSERT INTO {STATS_TABLE} (cuisine, dish_type, level, attempts, hits, total_ms, api_calls, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (cuisine, dish_type, level) DO UPDATE SET
+                attempts = attempts + excluded.attempts,
+                hits = hits + excluded.hits,
+                total_ms = total_ms + excluded.total_ms,
+                api_calls = api_calls + excluded.api_calls,
+                updated_at = excluded.updated_at
+        ''', rows)
+        return len(rows)
+
+    def get_stats(self) -> Dict:
+        """The learned routing table: per cuisine/dish type, each level's numbers and the current route"""
+        with self._lock:
+            snapshot = {key: {level: dict(c) for level, c in levels.items()} for key, levels in self._stats.items()}
+        table = {}
+        for (cuisine, dish_type), levels in sorted(snapshot.items()):
+            entry = {}
+            for level, c in sorted(levels.items()):
+                attempts = c['attempts']
+                rate = self._hit_rate(c)
+                entry[f'level{level}'] = {
+                    'attempts': attempts,
+                    'hits': c['hits'],
+                    'hit_rate': round(rate, 3) if rate is not None else None,
+                    'avg_ms': round(c['total_ms'] / attempts, 1) if attempts else 0.0,
+                    'avg_api_calls': round(c['api_calls'] / attempts, 2) if attempts else 0.0,
+                }
+            rates = {level: self._hit_rate(levels.get(level)) for level in ROUTED_LEVELS}
+            entry['route'] = [f'level{level}' for level in self._route_from(rates)]
+            table[f"{cuisine}/{dish_type}"] = entry
+        return table
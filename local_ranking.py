@@ -0,0 +1,152 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: local_ranking.py
+# * Purpose: Single-pass scoring of Level 1 candidates (replaces exact → partial fallback queries)
+# */
+
+"""
+Level 1 ranked retrieval
+One query returns every candidate of the cuisine; LocalRanker scores each row once:
+score = Σ SCORE_WEIGHTS[component] × component (each 0..1)
+- ingredients: requested ingredients the recipe has (a family member only counts RELATED_MATCH)
+- protein: share of the requested proteins it has (hard: at least one when proteins were
+  requested; none requested → recipes with meat are dropped, the vegetarian preference)
+- dish_type: filed under it 1.0, only reads like it (full-text match) DISH_TYPE_LIKE
+- time: 1.0 within the limit, falling to 0 at twice the limit (unknown time: UNKNOWN_TIME);
+  only orders candidates - a Level 1 answer must be `complete` (known time within the limit)
+- spice: closeness of spice_level_score to the requested level (0 beyond SPICE_TOLERANCE)
+- quality: quality_score / 100
+Ties keep the old protein order (earliest requested proteins first), then quality, times served
+"""
+
+import random
+from typing import Callable, Dict, Iterable, List, Optional
+
+from protein_matcher import ProteinQuery, popcount
+
+SCORE_WEIGHTS = {'ingredients': 0.20, 'protein': 0.20, 'dish_type': 0.15, 'time': 0.20,
+                 'spice': 0.15, 'quality': 0.10}
+RELATED_MATCH = 0.75   # 'chicken' requested, recipe has 'chicken_thigh'
+DISH_TYPE_LIKE = 0.5   # tacos that read like 'grilled'
+UNKNOWN_TIME = 0.5
+SPICE_TOLERANCE = 50   # spice_level_score points at which the spice fit reaches 0
+
+# Variety: Level 1 picks at random among the best few - only near-ties with the same proteins
+VARIETY_POOL = 5
+VARIETY_MARGIN = 0.05
+
+# Columns the ranked query appends after the 14 Level 1 row columns
+EFFECTIVE_TIME, SPICE_SCORE, TIMES_SERVED, DISH_MATCH = 14, 15, 16, 17
+
+
+class RankedCandidate:
+    """A Level 1 row with its score and the components behind it"""
+    __slots__ = ('row', 'score', 'breakdown', 'protein_mask', 'matched_ingredients', '_order')
+
+    def __init__(self, row, score: float, breakdown: Dict, protein_mask: int, matched_ingredients: int, order):
+        self.row = row
+        self.score = score
+        self.breakdown = breakdown
+        self.protein_mask = protein_mask
+        self.matched_ingredients = matched_ingredients
+        self._order = order
+
+    @property
+    def complete(self) -> bool:
+        """Known time within the limit - the hard filter a Level 1 answer has to pass"""
+        return self.breakdown['time'] >= 1.0
+
+    def to_dict(self) -> Dict:
+        return {'id': self.row[0], 'title': self.row[1], 'score': self.score,
+                'breakdown': dict(self.breakdown), 'matched_ingredients': self.matched_ingredients}
+
+
+class LocalRanker:
+    """Scoring of one Level 1 request"""
+
+    def __init__(self, ingredients: List[str], family_expansion: Dict[str, Iterable[str]],
+                 protein_query: ProteinQuery, keywords, dish_type_requested: bool,
+                 max_time: Optional[int] = None, spice_target: Optional[int] = None):
+        self.requested = [(ing, tuple(family_expansion.get(ing, (ing,)))) for ing in dict.fromkeys(ingredients)]
+        self.protein_query = protein_query
+        self.keywords = keywords
+        self.dish_type_requested = dish_type_requested
+        self.max_time = max_time
+        self.spice_target = spice_target
+        self.rejected_meat = 0
+        self.rejected_protein = 0
+
+    def _ingredient_fit(self, slug_text: str):
+        if not self.requested:
+            return 1.0, 0
+        total, matched = 0.0, 0
+        for ingredient, family in self.requested:
+            if f"|{ingredient}|" in slug_text:
+                total += 1.0
+            elif any(f"|{member}|" in slug_text for member in family):
+                total += RELATED_MATCH
+            else:
+                continue
+            matched += 1
+        return total / len(self.requested), matched
+
+    def _time_fit(self, minutes) -> float:
+        if self.max_time is None:
+            return 1.0
+        if not minutes or minutes < 1:
+            return UNKNOWN_TIME
+        if minutes <= self.max_time:
+            return 1.0
+        return max(0.0, 1.0 - (minutes - self.max_time) / self.max_time)
+
+    def score(self, row, slug_text: str, order: int = 0) -> Optional[RankedCandidate]:
+        """RankedCandidate for a row, or None when a hard protein/vegetarian rule drops it"""
+        protein_mask = 0
+        if self.protein_query:
+            protein_mask = self.protein_query.mask(self.keywords.words(slug_text))
+            if not protein_mask:
+                self.rejected_protein += 1
+                return None
+            protein = popcount(protein_mask) / len(self.protein_query)
+        else:
+            if self.keywords.contains(slug_text, 'meat'):
+                self.rejected_meat += 1
+                return None
+            protein = 1.0
+
+        ingredients, matched = self._ingredient_fit(slug_text)
+        dish_match = row[DISH_MATCH]
+        breakdown = {
+            'ingredients': round(ingredients, 3),
+            'protein': round(protein, 3),
+            'dish_type': 1.0 if dish_match >= 2 or not self.dish_type_requested else DISH_TYPE_LIKE,
+            'time': round(self._time_fit(row[EFFECTIVE_TIME]), 3),
+            'spice': 1.0 if self.spice_target is None else
+                     round(max(0.0, 1 - abs(row[SPICE_SCORE] - self.spice_target) / SPICE_TOLERANCE), 3),
+            'quality': min(max(row[11] or 0, 0), 100) / 100,
+        }
+        score = round(sum(SCORE_WEIGHTS[name] * value for name, value in breakdown.items()), 4)
+        proteins_first = tuple(bit for bit in range(len(self.protein_query)) if protein_mask >> bit & 1)
+        return RankedCandidate(row, score, breakdown, protein_mask, matched,
+                               (-score, proteins_first, -(row[11] or 0), -(row[TIMES_SERVED] or 0), order))
+
+    def rank(self, rows: Iterable, slug_text_of: Callable, k: int = 10) -> List[RankedCandidate]:
+        """Score every row once; the k best, best first"""
+        scored = []
+        for order, row in enumerate(rows):
+            candidate = self.score(row, slug_text_of(row), order)
+            if candidate is not None:
+                scored.append(candidate)
+        scored.sort(key=lambda candidate: candidate._order)
+        return scored[:k]
+
+
+def pick_for_variety(ranked: List[RankedCandidate], rng=random) -> RankedCandidate:
+    """Random choice among near-ties of the best candidate that have its protein combination"""
+    best = ranked[0]
+    pool = [c for c in ranked[:VARIETY_POOL]
+            if c.protein_mask == best.protein_mask and c.score >= best.score - VARIETY_MARGIN]
+    return rng.choice(pool) if len(pool) > 1 else best
@@ -24,6 +24,7 @@ import requests
 import logging
 import uuid
 import sqlite3
+import threading
 from recipe_matcher_4d import recipe_matcher_4d
 from pathlib import Path
 from datetime import datetime
@@ -110,6 +111,12 @@ openai.api_key = os.getenv("OPENAI_API_KEY")
 ADMIN_USERNAME = os.getenv('ADMIN_USERNAME', 'admin')
 ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'password123')
 
+# Total seconds /generate_recipe_instant gives the 4D cascade before falling back
+RECIPE_SEARCH_BUDGET_SECONDS = float(os.getenv('RECIPE_SEARCH_BUDGET_SECONDS', '6'))
+
+# Seconds after startup before the 4D matcher is built in the background (port bound by then)
+RECIPE_MATCHER_WARM_UP_DELAY = float(os.getenv('RECIPE_MATCHER_WARM_UP_DELAY', '1'))
+
 app = Flask(__name__, static_url_path='/static', static_folder='static')
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'supersecretkey')
 app.config['SESSION_TYPE'] = 'filesystem'
@@ -286,6 +293,47 @@ def get_categories():
         logger.error(f"Error in get_categories: {e}")
         return jsonify({'error': 'Failed to fetch categories'}), 500
 
+@app.route('/cache_stats', methods=['GET'])
+def get_cache_stats():
+    try:
+        return jsonify(recipe_matcher_4d.get_cache_stats())
+    except Exception as e:
+        logger.error(f"Error in get_cache_stats: {e}")
+        return jsonify({'error': 'Failed to fetch cache stats'}), 500
+
+@app.route('/cascade_routing', methods=['GET'])
+def get_cascade_routing():
+    try:
+        return jsonify(recipe_matcher_4d.get_routing_table())
+    except Exception as e:
+        logger.error(f"Error in get_cascade_routing: {e}")
+        return jsonify({'error': 'Failed to fetch cascade routing'}), 500
+
+@app.route('/cascade_metrics', methods=['GET'])
+def get_cascade_metrics():
+    try:
+        return jsonify(recipe_matcher_4d.get_metrics())
+    except Exception as e:
+        logger.error(f"Error in get_cascade_metrics: {e}")
+        return jsonify({'error': 'Failed to fetch cascade metrics'}), 500
+
+@app.route('/search', methods=['GET'])
+def search_recipes():
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({'error': 'Missing search text (q)'}), 400
+    try:
+        k = min(max(int(request.args.get('k', 10)), 1), 50)
+    except ValueError:
+        return jsonify({'error': 'k must be a number'}), 400
+    try:
+        cuisine = request.args.get('cuisine')
+        return jsonify({'query': query, 'cuisine': cuisine,
+                        'results': recipe_matcher_4d.search_text(query, cuisine, k)})
+    except Exception as e:
+        logger.error(f"Error in search_recipes: {e}")
+        return jsonify({'error': 'Failed to search recipes'}), 500
+
 @app.route('/recipes', methods=['GET'])
 def get_recipes():
     try:
@@ -472,8 +520,11 @@ def generate_recipe_instant():
             matched_recipe = recipe_matcher_4d.find_recipe(
                 cuisine, ingredients, dish_type, chef_preference,
                 spice_level=spice_level,
-                max_cooking_time=max_cooking_time
+                max_cooking_time=max_cooking_time,
+                deadline=RECIPE_SEARCH_BUDGET_SECONDS
             )
+            if matched_recipe and matched_recipe.get('timing'):
+                print(f"   ⏱️ 4D search timing: {matched_recipe['timing']}")
 
             # Check for spice mismatch
             if matched_recipe and matched_recipe.get('spice_mismatch'):
@@ -874,6 +925,13 @@ if __name__ == "__main__":
 
     # ⚠️ DEVELOPMENT MODE - CHANGE BEFORE PRODUCTION! ⚠️
     # app.run(host="0.0.0.0", port=port, debug=True)  # ← COMMENTED OUT
+    # Nothing of the 4D matcher is built at import - warm it up once the server is
+    # listening (under the debug reloader only the serving child process does it)
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        warm_up_timer = threading.Timer(RECIPE_MATCHER_WARM_UP_DELAY, recipe_matcher_4d.warm_up)
+        warm_up_timer.daemon = True
+        warm_up_timer.start()
+
     # DEVELOPMENT MODE (with auto-reload)
     app.run(host="0.0.0.0", port=port, debug=True)
 
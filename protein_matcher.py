@@ -0,0 +1,127 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: protein_matcher.py
+# * Purpose: Bitmask protein matching (replaces enumerating every protein combination)
+# */
+
+"""
+Protein Matcher
+Each candidate's protein set is computed ONCE as a bitmask over the requested
+proteins, then candidates are ranked by popcount(requested & present) in a single pass.
+
+Same outcome as walking the old combination list (all → fewer → single):
+- the winning combination is the largest one any candidate fully contains
+- ties between equal-size combinations go to the one that came first
+  in that list (earliest requested proteins first)
+- only candidates containing exactly that combination are kept, in input order
+"""
+
+from typing import AbstractSet, Callable, Iterable, List, Tuple, Union
+
+# What a candidate's proteins are looked up in: lowercased ingredient text (substring test, so
+# 'chicken' finds 'chicken_thigh') or a set of whole keywords such as KeywordMatcher.words()
+# returns (exact membership - the keyword scan already did the substring work)
+Ingredients = Union[str, AbstractSet[str]]
+
+
+def popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+def _bit_positions(mask: int) -> Tuple[int, ...]:
+    positions = []
+    index = 0
+    while mask:
+        if mask & 1:
+            positions.append(index)
+        mask >>= 1
+        index += 1
+    return tuple(positions)
+
+
+class ProteinQuery:
+    """The requested proteins of one search, one bit each (in request order)"""
+
+    def __init__(self, proteins: Iterable[str]):
+        self.proteins = list(dict.fromkeys(proteins))
+        self.full_mask = (1 << len(self.proteins)) - 1
+
+    def __len__(self):
+        return len(self.proteins)
+
+    def __bool__(self):
+        return bool(self.proteins)
+
+    def mask(self, ingredients: Ingredients) -> int:
+        """Bit i set ⇔ requested protein i is in the ingredients (text: substring, set: member)"""
+        present = 0
+        for bit, protein in enumerate(self.proteins):
+            if protein in ingredients:
+                present |= 1 << bit
+        return present
+
+    def match_count(self, ingredients: Ingredients) -> int:
+        """How many requested proteins a candidate has (size of its best combination)"""
+        return popcount(self.mask(ingredients))
+
+    def names(self, mask: int) -> List[str]:
+        return [self.proteins[bit] for bit in _bit_positions(mask)]
+
+    def rank(self, candidates: Iterable, text_of: Callable) -> Tuple[List[str], List]:
+        """
+        Single pass over candidates
+        Returns (winning protein combination, candidates that have exactly it)
+        or ([], []) when no candidate has any requested protein
+        """
+        best_mask, best_count, winners = 0, 0, []
+        for candidate in candidates:
+            present = self.mask(text_of(candidate))
+            if not present:
+                continue
+            if present == best_mask:
+                winners.append(candidate)
+                continue
+            count = popcount(present)
+            if count > best_count or (count == best_count and
+                                      _bit_positions(present) < _bit_positions(best_mask)):
+                best_mask, best_count, winners = present, count, [candidate]
+        return self.names(best_mask), winners
+
+
+class ProteinMatcher:
+    """Knows the PROTEINS list and turns a request's ingredients into a ProteinQuery"""
+
+    def __init__(self, proteins: Iterable[str]):
+        self.proteins = set(proteins)
+
+    def query(self, ingredients: Iterable[str]) -> ProteinQuery:
+        return ProteinQuery(ing for ing in ingredients if ing.lower() in self.proteins)
+
+
+if __name__ == "__main__":
+    import time
+    from itertools import combinations
+
+    requested = ['beef', 'chicken', 'pork', 'lamb', 'shrimp', 'duck', 'tofu', 'salmon',
+                 'turkey', 'goat']
+    texts = [str([{'name': p} for p in requested[i % 7:i % 7 + 3]]).lower() for i in range(2000)]
+
+    start = time.perf_counter()
+    for size in range(len(requested), 0, -1):
+        found = False
+        for combo in combinations(requested, size):
+            if any(all(p in t for p in combo) for t in texts):
+                found = True
+                break
+        if found:
+            break
+    old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    combo_names, winners = ProteinQuery(requested).rank(texts, lambda t: t)
+    new = time.perf_counter() - start
+
+    print(f"combinations(): {old * 1000:.1f} ms  bitmask: {new * 1000:.1f} ms  → {combo_names} ({len(winners)} recipes)")
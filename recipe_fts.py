@@ -0,0 +1,146 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: recipe_fts.py
+# * Purpose: FTS5 full-text index over recipe titles, instructions and ingredient names
+# */
+
+"""
+Recipe full-text index (SQLite FTS5)
+recipes_fts(title, instructions, ingredients) - rowid = recipes.rowid
+- Plain text extracted from the JSON columns by SQL, kept in sync by triggers
+  (so every writer - matcher, DatabaseController, download scripts - is covered).
+  INSERT OR REPLACE deletes the old row without firing AFTER DELETE (recursive_triggers
+  is off), so a BEFORE INSERT trigger drops the entry of the row about to be replaced
+- Dish-type predicates become MATCH expressions ranked with bm25
+- Everything is optional: without FTS5 the callers fall back to their old path
+"""
+
+import sqlite3
+from typing import Dict, Iterable, Optional
+
+FTS_TABLE = 'recipes_fts'
+
+# bm25 column weights: title, instructions, ingredients
+BM25_WEIGHTS = (10.0, 2.0, 1.0)
+
+# Text of a JSON list column: 'instruction'/'step'/'text' of objects, or the plain strings
+_INSTRUCTIONS_TEXT = '''(
+    SELECT group_concat(
+        CASE j.type WHEN 'object' THEN COALESCE(json_extract(j.value, '$.instruction'),
+                                                json_extract(j.value, '$.step'),
+                                                json_extract(j.value, '$.text'))
+                    ELSE j.value END, ' ')
+    FROM json_each(CASE WHEN json_valid({src}.instructions) THEN {src}.instructions ELSE '[]' END) j
+)'''
+
+_INGREDIENTS_TEXT = '''(
+    SELECT group_concat(
+        CASE j.type WHEN 'object' THEN COALESCE(json_extract(j.value, '$.name'),
+                                                json_extract(j.value, '$.item'),
+                                                json_extract(j.value, '$.slug'))
+                    ELSE j.value END, ' ')
+    FROM json_each(CASE WHEN json_valid({src}.ingredients) THEN {src}.ingredients ELSE '[]' END) j
+)'''
+
+
+def text_columns_sql(src: str) -> str:
+    """title, instructions text, ingredient names text of the recipes row aliased src"""
+    return f"{src}.title, {_INSTRUCTIONS_TEXT.format(src=src)}, {_INGREDIENTS_TEXT.format(src=src)}"
+
+
+def _row_values(src: str) -> str:
+    return f"{src}.rowid, {text_columns_sql(src)}"
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    """Is this SQLite build compiled with FTS5"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def ensure_recipe_fts(conn: sqlite3.Connection) -> bool:
+    """
+    Create recipes_fts + its triggers if missing and (re)fill it when it is out of step
+    with recipes. Returns False when FTS5 isn't available (caller commits)
+    """
+    if not fts5_available(conn):
+        print("   ⚠️ SQLite has no FTS5 - full-text dish type matching disabled")
+        return False
+
+    conn.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+        USING fts5(title, instructions, ingredients, tokenize='porter unicode61')
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS recipes_fts_insert AFTER INSERT ON recipes BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, instructions, ingredients) SELECT {_row_values('new')};
+        END
+    ''')
+    # A plain INSERT of an existing id fails and takes this DELETE back with it;
+    # only INSERT OR IGNORE would lose the entry, and no writer uses it on recipes
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS recipes_fts_replace BEFORE INSERT ON recipes BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = (SELECT rowid FROM recipes WHERE id = new.id);
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS recipes_fts_delete AFTER DELETE ON recipes BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid;
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS recipes_fts_update AFTER UPDATE OF title, instructions, ingredients ON recipes BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid;
+            INSERT INTO {FTS_TABLE}(rowid, title, instructions, ingredients) SELECT {_row_values('new')};
+        END
+    ''')
+
+    # Table rebuilt by someone else (or FTS just created) → re-index everything
+    indexed = conn.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}").fetchone()[0]
+    total = conn.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+    if indexed != total:
+        conn.execute(f"DELETE FROM {FTS_TABLE}")
+        conn.execute(f'''
+            INSERT INTO {FTS_TABLE}(rowid, title, instructions, ingredients)
+            SELECT {_row_values('r')} FROM recipes r
+        ''')
+        print(f"   🔎 Full-text index built for {total} recipes")
+    return True
+
+
+def _phrases(words: Iterable[str]) -> Optional[str]:
+    """'("stir-fry" OR "high heat")' - every word quoted as an FTS5 phrase"""
+    quoted = ['"' + w.replace('"', '""') + '"' for w in dict.fromkeys(words) if w and w.strip()]
+    if not quoted:
+        return None
+    return '(' + ' OR '.join(quoted) + ')'
+
+
+def dish_type_match_expression(indicators: Dict) -> Optional[str]:
+    """
+    MATCH expression for "looks like this dish type":
+    title words in the title OR instruction patterns/equipment in the instructions
+    OR indicator ingredients among the ingredient names
+    """
+    parts = []
+    title = _phrases(indicators.get('title_words', []))
+    if title:
+        parts.append(f'title : {title}')
+    instructions = _phrases(list(indicators.get('instruction_patterns', [])) + list(indicators.get('equipment', [])))
+    if instructions:
+        parts.append(f'instructions : {instructions}')
+    ingredients = _phrases(indicators.get('ingredients', []))
+    if ingredients:
+        parts.append(f'ingredients : {ingredients}')
+    return ' OR '.join(parts) or None
+
+
+def bm25_sql() -> str:
+    return f"bm25({FTS_TABLE}, {', '.join(str(w) for w in BM25_WEIGHTS)})"
@@ -1,6 +1,7 @@
 import json
 from typing import List, Dict, Optional
 from pathlib import Path
+from lazy_init import LazySingleton
 
 class RecipeMatcher:
     """Matches user selections to real recipes from our database"""
@@ -85,5 +86,5 @@ class RecipeMatcher:
                 return recipe
         return None
 
-# Singleton instance
-recipe_matcher = RecipeMatcher()
+# Singleton instance (recipes_db.json is loaded on first use)
+recipe_matcher = LazySingleton(RecipeMatcher, 'RecipeMatcher')
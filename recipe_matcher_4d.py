@@ -14,32 +14,134 @@ LAW: We ALWAYS try to avoid the fallback recipe!
 """
 
 import json
-import sqlite3
-from typing import List, Dict, Optional
+import math
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
-from recipe_matcher import recipe_matcher  # Your existing Level 1 matcher
 from spoonacular_fetcher import SpoonacularFetcher, API_KEY
 from themealdb_fetcher import TheMealDBFetcher
 from ai_chef_generator import AIChefGenerator
-from itertools import combinations
+from db_connection_manager import ConnectionManager
+from ingredient_index import IngredientIndex
+from config_registry import config_registry
+from cascade_cache import CascadeCache, normalize_request
+from cascade_deadline import Deadline, use_deadline, current_deadline, time_left
+from level_predictor import CascadeOutcomePredictor, CascadeTrace, CASCADE_LEVELS, ensure_stats_table
+from speculative_ai import SpeculationLedger, SpeculativeCall
+from write_behind import WriteBehindQueue
+from lazy_init import lazy_component, LazySingleton
+from cascade_tracing import Tracer, span, traced, tag_trace, call_in_span
+from protein_matcher import ProteinMatcher
+from keyword_matcher import KeywordMatcher
+from cuisine_affinity import CuisineAffinityMatrix
+from local_ranking import LocalRanker, RankedCandidate, pick_for_variety
+from recipe_minhash import (MinHasher, NearMatch, NearMatchIndex, ensure_minhash_table, save_signatures,
+                            unsigned_recipes, write_signatures)
+from recipe_tfidf import TfidfIndex, default_index_path, recipe_text
+from culinary_graph import CulinaryGraph
+from recipe_schema import (ensure_denormalized_columns, ingredient_slug_text, spice_level_score,
+                           SPICE_LEVEL_TARGETS, NEUTRAL_SPICE_SCORE)
+from recipe_fts import ensure_recipe_fts, dish_type_match_expression, FTS_TABLE
+from functools import lru_cache, partial
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextvars import ContextVar, copy_context
+import asyncio
+import atexit
+import os
+import threading
 import time
+import copy
+import weakref
 
+# Master database built by create_recipe_database.py
+DEFAULT_DB_PATH = "D:/RecipeGen_Database/processed/recipegen_master.db"
 
-def generate_protein_combinations(selected_proteins):
+# Title words that suggest the picked recipe doesn't fit a requested spice level
+SPICE_MISMATCH_WORDS = ['spicy', 'hot', 'chili', 'fiery', 'pepper']
+
+# Per-cascade state - one value per thread and per asyncio task, so concurrent cascades don't mix
+_sister_countries_tried = ContextVar('sister_countries_tried', default=None)
+_chef_preference = ContextVar('chef_preference', default='traditional')
+_cascade_trace = ContextVar('cascade_trace', default=None)
+
+# Matchers still alive at interpreter exit get their queued saves and statistics written
+_open_matchers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_matchers():
+    for matcher in list(_open_matchers):
+        try:
+            matcher.close()
+        except Exception as e:
+            print(f"⚠️ Could not close recipe matcher at exit: {e}")
+
+
+# Total time the way Level 1 always judged it: total_time, otherwise prep + cook
+_EFFECTIVE_TIME_SQL = "COALESCE(NULLIF(r.total_time, 0), COALESCE(r.prep_time, 0) + COALESCE(r.cook_time, 0))"
+
+
+# Candidates one Level 1 query hands to the ranker (best quality first) - a guard for huge cuisines
+RANK_CANDIDATE_LIMIT = 500
+
+
+@lru_cache(maxsize=128)
+def _ranked_level1_query(ingredient_count: int, with_dish_type: bool, dish_type_like: bool = False,
+                         by_rowid: bool = False) -> str:
     """
-    Generate protein combinations in decreasing order.
-    Example: [beef, chicken, pork] -> [[beef,chicken,pork], [beef,chicken], [beef,pork], [chicken,pork], [beef], [chicken], [pork]]
+    Every Level 1 candidate of a cuisine in ONE statement, for LocalRanker to score
+    Built once per shape so each pooled connection reuses its prepared statement
+    dish_match: 2 = filed under the dish type, 1 = only reads like it (recipes_fts MATCH), 0 = dropped
+    Named parameters: :cuisine, [:dish_type], [:dish_like], [:rowids JSON] or [:i0, :i1, ...]
     """
-    if not selected_proteins:
-        return []
-    
-    all_combinations = []
-    # Start from all proteins, decrease to single proteins
-    for size in range(len(selected_proteins), 0, -1):
-        for combo in combinations(selected_proteins, size):
-            all_combinations.append(list(combo))
-    
-    return all_combinations
+    if not with_dish_type:
+        dish_match = "2"
+    elif dish_type_like:
+        dish_match = f"""CASE WHEN r.dish_type = :dish_type THEN 2
+                     WHEN r.rowid IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :dish_like) THEN 1
+                     ELSE 0 END"""
+    else:
+        dish_match = "CASE WHEN r.dish_type = :dish_type THEN 2 ELSE 0 END"
+    candidate_condition = "AND r.rowid IN (SELECT value FROM json_each(:rowids))" if by_rowid else ""
+    ingredient_condition = ""
+    if ingredient_count and not by_rowid:
+        ingredient_condition = f'''AND EXISTS (
+                    SELECT 1 FROM recipe_ingredients ri 
+                    WHERE ri.recipe_id = r.id 
+                    AND ri.ingredient_slug IN ({', '.join(f':i{i}' for i in range(ingredient_count))})
+                )'''
+    return f'''
+                SELECT * FROM (
+                    SELECT r.id, r.title, r.cuisine, r.dish_type, r.ingredients, 
+                        r.instructions, r.prep_time, r.cook_time, r.servings,
+                        r.source, r.image_url, r.quality_score, r.total_time,
+                        r.ingredient_slugs,
+                        {_EFFECTIVE_TIME_SQL} AS effective_time,
+                        COALESCE(r.spice_level_score, {NEUTRAL_SPICE_SCORE}) AS spice_score,
+                        r.times_served,
+                        {dish_match} AS dish_match
+                    FROM recipes r
+                    WHERE r.cuisine = :cuisine
+                    {candidate_condition}
+                    {ingredient_condition}
+                ) AS c
+                WHERE c.dish_match > 0
+                ORDER BY c.quality_score DESC, c.times_served DESC
+                LIMIT {RANK_CANDIDATE_LIMIT}
+            '''
+
+class _TaskClock:
+    """Marks when a pooled task actually starts running (time spent queued for a worker doesn't count)"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.started_at = None
+
+    def run(self, func, *args):
+        self.started_at = time.monotonic()
+        self.started.set()
+        return func(*args)
+
 
 class RecipeMatcher4D:
     """
@@ -50,19 +152,163 @@ class RecipeMatcher4D:
     Level 4: Essential fallback (last resort)
     """
     
-    def __init__(self):
-        # Connect to LOCAL database
-        self.db_path = "D:/RecipeGen_Database/processed/recipegen_master.db"
-        self.local_db_available = self._check_local_db()
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        # Connect to LOCAL database (pooled thread-local readers + one writer)
+        # Probing it, WAL, schema, index, fetchers, AI Chef and the data files are
+        # all @lazy_component - built on first use or by warm_up()
+        self.db_path = db_path
+        self.db = ConnectionManager(self.db_path)
+        
+        # Per cuisine/dish type level statistics (loaded from cascade_level_stats with the DB)
+        self.outcome_predictor = CascadeOutcomePredictor()
+        self.fts_available = False
+        
+        # Level 2 fan-out: all providers at once, first acceptable result by priority wins
+        self.concurrent_api_search = True
+        self.api_provider_timeout = 12.0  # Seconds each provider gets before it's abandoned
+        self.api_detail_fanout = 3        # Summaries whose details are fetched concurrently
+        # Fan-outs (requests + Level 3 sister searches) that get every provider a worker at once -
+        # a provider abandoned after its timeout keeps its worker until the HTTP call returns
+        self.api_concurrent_fanouts = 8
+        self._provider_executor = ThreadPoolExecutor(max_workers=self.api_concurrent_fanouts * 2,
+                                                     thread_name_prefix='api-provider')
+        self._detail_executor = ThreadPoolExecutor(max_workers=self.api_concurrent_fanouts * 3,
+                                                   thread_name_prefix='api-detail')
+        
+        # Level 3: sister countries explored in parallel (own pool - its tasks wait on the API pools)
+        self.sister_api_concurrency = 3
+        self._sister_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='sister-search')
+        
+        # Recipes inserted by other processes (import scripts, DatabaseController) are picked up
+        # by rebuilding the ingredient index in the background, checked at most this often
+        self.ingredient_index_check_interval = 30.0
+        self._ingredient_index_checked = time.monotonic()
+        self._ingredient_index_rebuild = threading.Lock()
+        
+        # Memo of whole-cascade results + levels known to come back empty
+        self.result_cache = CascadeCache()
+        
+        # Level 1 miss → nearest local recipe by ingredient set, before any paid API
+        self.minhasher = MinHasher()
+        self.near_match_search = True
+        self.near_match_min_containment = 0.8  # Share of the requested ingredients it must have
+        self.near_match_min_shared = 2         # One shared ingredient is not "near"
+        self.near_match_containment_max_query = 8  # Up to this many: posting-list containment, above: LSH
+        self.near_match_candidate_limit = 50   # Candidates checked against the protein/time rules
+        self.minhash_backfill_batch = 500      # Unsigned recipes signed per writer transaction
+        self.minhash_backfill = None           # Background signing thread (started with the index)
+        self._backfill_stop = threading.Event()
+        
+        # Free-text search: offline index built by `python recipe_tfidf.py build <db>`, if present
+        self.text_index_path = default_index_path(db_path)
+        
+        # API/AI recipes are saved by a background writer in batches - requests only enqueue
+        self.save_queue = WriteBehindQueue(self._write_recipes, name='recipe-writer')
+        _open_matchers.add(self)  # Closed at interpreter exit without atexit keeping it alive
+        
+        # Latency budget (find_recipe(deadline=...)): share of the budget each level may use,
+        # seconds kept back for the AI Chef, least time worth spending on alternatives
+        self.level_budget_shares = {'level1': 0.15, 'level2': 0.45, 'level3': 0.3}
+        self.ai_reserve_seconds = 2.5
+        self.alternatives_min_seconds = 1.0
+        
+        # Speculative Level 4: start the AI Chef alongside Levels 2-3 when history says
+        # the APIs answer this cuisine/dish type less than speculative_ai_threshold of the time
+        self.speculative_ai = True
+        self.speculative_ai_threshold = 0.2
+        self.speculation_ledger = SpeculationLedger()
+        self._ai_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ai-speculative')
+        
+        # Spans per level/provider/sister/DB query/AI call → latency histograms (get_metrics),
+        # and one JSON line per request in CASCADE_TRACE_PATH when that is set
+        self.tracer = Tracer(trace_path=os.getenv('CASCADE_TRACE_PATH'))
+        
+        # Learned routing: Levels 2-3 are skipped/reordered from the per cuisine/dish type
+        # statistics in cascade_level_stats, written every outcome_flush_every cascades
+        self.learned_routing = True
+        self.outcome_flush_every = 20
+        
+        # Batch lookups: one worker per cuisine/dish type group
+        self.batch_concurrency = 4
+        self._batch_executor = ThreadPoolExecutor(max_workers=self.batch_concurrency,
+                                                  thread_name_prefix='batch-cascade')
+        
+        # Async cascade: SQLite work runs here instead of on the event loop
+        self._db_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='sqlite-async')
+        
+        # Culinary regions and ingredients data (loaded on first use)
+        self.regions_path = Path(__file__).parent / "data" / "culinary_regions.json"
+        self.ingredients_path = Path(__file__).parent / "data" / "ingredients.json"
         
-        # Enable WAL mode for better concurrency
-        if self.local_db_available:
-            conn = sqlite3.connect(self.db_path, timeout=10)
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.close()
+        # Track sister countries tried
+        self.sister_countries_tried = []
         
-        # Initialize ALL API fetchers (for fallback)
-        self.api_providers = {
+        # Region/sister/compatibility graph (compiled on first Level 3 or region lookup)
+        self._compiled_culinary_graph = None
+    
+    @lazy_component
+    def local_db_available(self) -> bool:
+        """Probe the LOCAL database once; WAL, schema and cascade statistics come with it"""
+        available = self._check_local_db()
+        if available:
+            # Enable WAL mode for better concurrency
+            self.db.enable_wal()
+            self._ensure_schema()
+        print(f"🚀 4D Recipe Matcher using {'LOCAL DATABASE' if available else 'APIs only (no local database)'}")
+        return available
+    
+    @lazy_component
+    def ingredient_index(self) -> Optional[IngredientIndex]:
+        """In-memory inverted index for Level 1 candidate lookup"""
+        return self._build_ingredient_index() if self.local_db_available else None
+    
+    @lazy_component
+    def near_match_index(self) -> Optional[NearMatchIndex]:
+        """LSH index over the recipe_minhash signatures (near matches + duplicate detection)"""
+        if not self.local_db_available:
+            return None
+        try:
+            index = NearMatchIndex(self.minhasher).build(self.db.read_connection())
+            print(f"   🔏 Near-match index: {len(index)} recipes")
+        except Exception as e:
+            print(f"   ⚠️ Could not build near-match index - no near-match tier: {e}")
+            return None
+        # Recipes imported without a signature are signed in the background, never on a request
+        self.minhash_backfill = threading.Thread(target=self._backfill_minhash, args=(index,),
+                                                 name='minhash-backfill', daemon=True)
+        self.minhash_backfill.start()
+        return index
+    
+    @lazy_component
+    def text_search(self) -> Optional[TfidfIndex]:
+        """TF-IDF index for free-text search - the offline one when it still covers the database"""
+        if not self.local_db_available:
+            return None
+        conn = self.db.read_connection()
+        try:
+            if os.path.isdir(self.text_index_path):
+                index = TfidfIndex.load(self.text_index_path)
+                added = index.catch_up(conn)  # Recipes saved since the offline build go to the delta
+                if added is not None:
+                    print(f"   🔤 Text search index: {index.base_docs} recipes (memory-mapped)"
+                          f"{f' + {added} newer' if added else ''}")
+                    if index.needs_rebuild:
+                        print(f"   ⚠️ Rebuild it offline: python recipe_tfidf.py build {self.db_path}")
+                    return index
+                index.close()
+                print(f"   ⚠️ Text search index at {self.text_index_path} is out of date - rebuilding in memory")
+            started = time.perf_counter()
+            index = TfidfIndex.build(conn)
+            print(f"   🔤 Text search index: {index.base_docs} recipes in {time.perf_counter() - started:.2f}s")
+            return index
+        except Exception as e:
+            print(f"   ⚠️ Could not build text search index - free-text search disabled: {e}")
+            return None
+    
+    @lazy_component
+    def api_providers(self) -> Dict:
+        """ALL API fetchers (for fallback)"""
+        return {
             'spoonacular': {
                 'fetcher': SpoonacularFetcher(API_KEY),
                 'name': 'Spoonacular',
@@ -76,40 +322,77 @@ class RecipeMatcher4D:
                 'priority': 2
             }
         }
-        
-        # Sort providers by priority
-        self.sorted_providers = sorted(
+    
+    @lazy_component
+    def sorted_providers(self) -> List[tuple]:
+        """Enabled providers by priority"""
+        return sorted(
             [(k, v) for k, v in self.api_providers.items() if v['enabled']],
             key=lambda x: x[1]['priority']
         )
-        
-        # Load culinary regions
-        self.regions_path = Path(__file__).parent / "data" / "culinary_regions.json"
-        self.culinary_regions = self._load_culinary_regions()
-        
-        # Initialize A.I. Chef generator
-        self.ai_chef = AIChefGenerator()
-
-        # Load ingredients for cuisine compatibility
-        self.ingredients_path = Path(__file__).parent / "data" / "ingredients.json"
-        self.ingredients_data = self._load_ingredients_data()
-        self.ingredient_cuisines = self._build_ingredient_cuisines()
-        
-        # SINGLE SOURCE OF TRUTH FOR PROTEINS
-        # Build from ingredients.json - look for is_protein field or use default list
-        self.PROTEINS = self._build_proteins_list()
-        
-        # SINGLE SOURCE OF TRUTH FOR MEAT PROTEINS (subset for vegetarian filtering)
-        self.MEAT_PROTEINS = self._build_meat_proteins_list()
-        
-        # Get country to Spoonacular mapping
-        self.country_to_spoonacular = self.culinary_regions.get('country_to_spoonacular', {})
-        
-        # Track sister countries tried
-        self.sister_countries_tried = []
-        
-        print(f"🚀 4D Recipe Matcher initialized {'WITH LOCAL DATABASE' if self.local_db_available else 'WITHOUT local database'}")
-        print(f"   📋 Loaded {len(self.PROTEINS)} protein types")
+    
+    @lazy_component
+    def ai_chef(self) -> AIChefGenerator:
+        return AIChefGenerator()
+    
+    @lazy_component
+    def culinary_regions(self) -> Dict:
+        return self._load_culinary_regions()
+    
+    @lazy_component
+    def country_to_spoonacular(self) -> Dict[str, str]:
+        return self.culinary_regions.get('country_to_spoonacular', {})
+    
+    @lazy_component
+    def ingredients_data(self) -> List[Dict]:
+        """Ingredients for cuisine compatibility"""
+        return self._load_ingredients_data()
+    
+    @lazy_component
+    def ingredient_cuisines(self) -> Dict[str, List[str]]:
+        return self._build_ingredient_cuisines()
+    
+    @lazy_component
+    def PROTEINS(self) -> List[str]:
+        """
+        SINGLE SOURCE OF TRUTH FOR PROTEINS
+        Build from ingredients.json - look for is_protein field or use default list
+        """
+        proteins = self._build_proteins_list()
+        print(f"   📋 Loaded {len(proteins)} protein types")
+        return proteins
+    
+    @lazy_component
+    def protein_matcher(self) -> ProteinMatcher:
+        return ProteinMatcher(self.PROTEINS)
+    
+    @lazy_component
+    def MEAT_PROTEINS(self) -> List[str]:
+        """SINGLE SOURCE OF TRUTH FOR MEAT PROTEINS (subset for vegetarian filtering)"""
+        return self._build_meat_proteins_list()
+    
+    @lazy_component
+    def keywords(self) -> KeywordMatcher:
+        """One compiled keyword scan for meat/protein/spice detection"""
+        return self._build_keyword_matcher()
+    
+    @lazy_component
+    def cuisine_affinity(self) -> CuisineAffinityMatrix:
+        """Indicator/ingredient × cuisine matrices behind cuisine suggestions"""
+        return CuisineAffinityMatrix()
+    
+    def warm_up(self):
+        """Build every lazy component now (call once the server is listening)"""
+        started = time.perf_counter()
+        for name in ('local_db_available', 'ingredient_index', 'near_match_index', 'text_search',
+                     'sorted_providers', 'ai_chef',
+                     'country_to_spoonacular', 'ingredient_cuisines', 'protein_matcher',
+                     'MEAT_PROTEINS', 'keywords', 'cuisine_affinity'):
+            try:
+                getattr(self, name)
+            except Exception as e:
+                print(f"   ⚠️ Warm-up of {name} failed - it will be retried on first use: {e}")
+        print(f"🔥 4D Recipe Matcher warmed up in {time.perf_counter() - started:.2f}s")
 
     def _load_ingredients_data(self) -> List[Dict]:
         """Load the full ingredients data"""
@@ -171,36 +454,25 @@ class RecipeMatcher4D:
             'squid', 'calamari', 'scallops', 'mussels', 'clams', 'oysters'
         ]
 
+    def _build_keyword_matcher(self) -> KeywordMatcher:
+        """Meat, protein and spice word lists compiled into one multi-keyword matcher"""
+        return KeywordMatcher({
+            'meat': self.MEAT_PROTEINS,
+            'protein': self.PROTEINS,
+            'spice_mismatch': SPICE_MISMATCH_WORDS,
+        })
+    
     def _analyze_ingredient_cuisine_fit(self, ingredients: List[str]) -> List[Dict]:
         """
         Analyze which cuisines best match the given ingredients
         Returns list of cuisine suggestions with confidence scores
         """
         print(f"   🔍 DEBUG: Analyzing ingredients: {ingredients}")
-        cuisine_scores = {}
-        
-        # Load from config file instead of hardcoding
-        cuisine_indicators = self._load_cuisine_indicators()
         
-        # Score each cuisine based on ingredient matches
-        for cuisine, indicators in cuisine_indicators.items():
-            score = 0
-            matched_ingredients = []
-            
-            for ingredient in ingredients:
-                ingredient_lower = ingredient.lower().replace('_', ' ').replace('-', ' ')
-                for indicator in indicators:
-                    indicator_lower = indicator.replace('_', ' ')
-                    if indicator_lower in ingredient_lower or ingredient_lower in indicator_lower:
-                        score += 1
-                        matched_ingredients.append(ingredient)
-                        break
-            
-            if score > 0:
-                cuisine_scores[cuisine] = {
-                    'score': score,
-                    'matched': matched_ingredients
-                }
+        # One pass over the precomputed indicator × cuisine matrix instead of cuisines × ingredients × indicators
+        self._sync_cuisine_affinity()
+        cuisine_scores = {cuisine: {'score': score, 'matched': matched}
+                          for cuisine, score, matched in self.cuisine_affinity.cuisine_fit(ingredients)}
         
         # Sort by score and create suggestions
         suggestions = []
@@ -218,17 +490,38 @@ class RecipeMatcher4D:
     
     def _load_cuisine_indicators(self) -> Dict[str, List[str]]:
         """
-        Load cuisine indicators from config file or culinary_config.json
+        Load cuisine indicators from culinary_config.json (via the config registry)
         Falls back to defaults if not found
         """
-        try:
-            # Try to load from culinary_config.json
-            config_path = Path(__file__).parent / "data" / "culinary_config.json"
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                return config.get('cuisine_indicators', self._get_default_cuisine_indicators())
-        except:
-            return self._get_default_cuisine_indicators()
+        config = config_registry.get('culinary_config.json', {})
+        return config.get('cuisine_indicators', self._get_default_cuisine_indicators())
+    
+    def _compiled_cuisine_indicators(self) -> List[tuple]:
+        """[(cuisine, (indicator with '_' → ' ', ...)), ...] - rebuilt only when the config changes"""
+        return config_registry.derive(
+            'culinary_config.json', 'cuisine_indicators',
+            lambda _: [(cuisine, tuple(ind.replace('_', ' ') for ind in indicators))
+                       for cuisine, indicators in self._load_cuisine_indicators().items()]
+        )
+    
+    def _sync_cuisine_affinity(self):
+        """Bring the affinity matrices up to date with culinary_config.json, ingredients.json and the DB"""
+        self.cuisine_affinity.sync(
+            indicators=self._compiled_cuisine_indicators(),
+            ingredient_cuisines=self.ingredient_cuisines,
+            affinity_rows=self._read_cuisine_affinity if self.local_db_available else None,
+        )
+    
+    def _read_cuisine_affinity(self, known_signature: Optional[tuple]) -> tuple:
+        """(signature, rows) of cuisine_ingredient_affinity - built by db_maintenance, may not exist"""
+        conn = self.db.read_connection()
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cuisine_ingredient_affinity'").fetchone():
+            return None, []
+        signature = tuple(conn.execute('SELECT COUNT(*), TOTAL(frequency) FROM cuisine_ingredient_affinity').fetchone())
+        if signature == known_signature:
+            return signature, None
+        rows = conn.execute('SELECT cuisine, ingredient_slug, frequency FROM cuisine_ingredient_affinity').fetchall()
+        return signature, rows
     
     def _get_default_cuisine_indicators(self) -> Dict[str, List[str]]:
         """Default cuisine indicators as fallback"""
@@ -247,41 +540,28 @@ class RecipeMatcher4D:
     
     def _get_cuisine_typical_ingredients(self, cuisine: str) -> List[str]:
         """
-        Get typical ingredients for a given cuisine from ingredients.json
+        Get typical ingredients for a given cuisine (ingredients.json tags + cuisine_ingredient_affinity)
         Returns list of ingredient slugs common to that cuisine
         """
-        typical_ingredients = []
-        
-        # Find ingredients that are associated with this cuisine
-        for ingredient_slug, allowed_cuisines in self.ingredient_cuisines.items():
-            if allowed_cuisines and cuisine.lower() in [c.lower() for c in allowed_cuisines]:
-                typical_ingredients.append(ingredient_slug)
-        
-        # If we found ingredients for this cuisine, return the first 8
+        self._sync_cuisine_affinity()
+        typical_ingredients = self.cuisine_affinity.typical_ingredients([cuisine], k=8)
         if typical_ingredients:
-            return typical_ingredients[:8]
+            return typical_ingredients
         
         # Try to find ingredients for related cuisines (e.g., 'nordic' for 'danish')
         region = self._get_region_for_country(cuisine.lower())
         if region:
-            for country in region.get('countries', []):
-                for ingredient_slug, allowed_cuisines in self.ingredient_cuisines.items():
-                    if allowed_cuisines and country in [c.lower() for c in allowed_cuisines]:
-                        typical_ingredients.append(ingredient_slug)
-            
+            typical_ingredients = self.cuisine_affinity.typical_ingredients(region.get('countries', []), k=8)
             if typical_ingredients:
-                return list(set(typical_ingredients))[:8]  # Remove duplicates, return first 8
+                return typical_ingredients
         
         # Default fallback ingredients
         return ['onion', 'garlic', 'tomato', 'olive_oil', 'salt']
 
     def _load_ingredient_families(self) -> Dict[str, Dict]:
-        """Load ingredient family mappings for smart search"""
-        try:
-            families_path = Path(__file__).parent / "data" / "ingredient_families.json"
-            with open(families_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
+        """Load ingredient family mappings for smart search (parsed once by the config registry)"""
+        families = config_registry.get('ingredient_families.json')
+        if families is None:
             # Default families if file doesn't exist
             return {
                 'chicken': {
@@ -295,386 +575,510 @@ class RecipeMatcher4D:
                     'search_behavior': 'inclusive'
                 }
             }
+        return families
+    
+    def _family_expansion_map(self) -> Dict[str, tuple]:
+        """family slug → slugs it expands to (inclusive families only), compiled once per file version"""
+        def build(_):
+            expansion = {}
+            for slug, family in self._load_ingredient_families().items():
+                if family.get('search_behavior') == 'inclusive':
+                    expansion[slug] = tuple(family['includes'])
+            return expansion
+        return config_registry.derive('ingredient_families.json', 'family_expansion', build)
 
     def _check_local_db(self) -> bool:
         """Check if local database exists and is accessible"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self.db.read_connection().cursor()
             cursor.execute("SELECT COUNT(*) FROM recipes")
             count = cursor.fetchone()[0]
-            conn.close()
             print(f"📚 Local database connected: {count} recipes available")
             return True
         except:
+            self.db.close_all()
             print("⚠️ Local database not found - will use APIs only")
             return False
     
+    @property
+    def sister_countries_tried(self) -> List[str]:
+        return _sister_countries_tried.get() or []
+    
+    @sister_countries_tried.setter
+    def sister_countries_tried(self, countries: List[str]):
+        _sister_countries_tried.set(countries)
+    
+    @property
+    def chef_preference(self) -> str:
+        return _chef_preference.get()
+    
+    @chef_preference.setter
+    def chef_preference(self, preference: str):
+        _chef_preference.set(preference)
+    
+    def _ensure_schema(self):
+        """Denormalized columns Level 1 relies on (added and back-filled once)"""
+        try:
+            with self.db.writer() as conn:
+                ensure_denormalized_columns(conn)
+        except Exception as e:
+            print(f"   ⚠️ Could not prepare ingredient_slugs column: {e}")
+        try:
+            with self.db.writer() as conn:
+                self.fts_available = ensure_recipe_fts(conn)
+        except Exception as e:
+            print(f"   ⚠️ Could not prepare full-text index: {e}")
+        try:
+            with self.db.writer() as conn:
+                ensure_minhash_table(conn)
+        except Exception as e:
+            print(f"   ⚠️ Could not prepare MinHash signatures: {e}")
+        try:
+            with self.db.writer() as conn:
+                ensure_stats_table(conn)
+                loaded = self.outcome_predictor.load(conn)
+            if loaded:
+                print(f"   🧭 Cascade statistics: {loaded} cuisine/dish type/level rows")
+        except Exception as e:
+            print(f"   ⚠️ Could not load cascade statistics - routing starts from scratch: {e}")
+    
+    def _dish_type_fts_expression(self, dish_type: str) -> Optional[str]:
+        """recipes_fts MATCH expression for a dish type (rebuilt when culinary_config.json changes)"""
+        def build(_):
+            return {name: dish_type_match_expression(indicators)
+                    for name, indicators in self._load_dish_type_indicators().items()}
+        return config_registry.derive('culinary_config.json', 'dish_type_fts', build).get(dish_type)
+    
+    def _row_slug_text(self, row) -> str:
+        """
+        '|slug|slug|' of a candidate row (column 13) - validation runs on this,
+        the ingredients JSON is only decoded for rows that were never back-filled
+        """
+        if row[13] is not None:
+            return row[13]
+        return ingredient_slug_text(json.loads(row[4]))
+    
+    def _build_ingredient_index(self) -> Optional[IngredientIndex]:
+        """Build the ingredient/cuisine/dish_type posting lists from the local database"""
+        try:
+            index = IngredientIndex().build(self.db.read_connection())
+            footprint = index.memory_footprint()
+            print(f"   🗂️ Ingredient index: {footprint['recipes']} recipes, "
+                  f"{footprint['ingredients']['keys']} ingredients, {footprint['bytes'] / 1024:.0f} KB")
+            return index
+        except Exception as e:
+            print(f"   ⚠️ Could not build ingredient index - using SQL lookups: {e}")
+            return None
+    
+    def _current_ingredient_index(self) -> Optional[IngredientIndex]:
+        """
+        The ingredient index, rebuilt in the background once recipes were inserted behind its back
+        The stale index keeps answering until the rebuilt one replaces it
+        """
+        index = self.ingredient_index
+        now = time.monotonic()
+        if index is None or now - self._ingredient_index_checked < self.ingredient_index_check_interval:
+            return index
+        self._ingredient_index_checked = now
+        try:
+            if index.is_current(self.db.read_connection()):
+                return index
+        except Exception:
+            return index
+        if self._ingredient_index_rebuild.acquire(blocking=False):
+            def rebuild():
+                try:
+                    rebuilt = self._build_ingredient_index()
+                    if rebuilt is not None:
+                        self.ingredient_index = rebuilt
+                finally:
+                    self._ingredient_index_rebuild.release()
+            threading.Thread(target=rebuild, name='ingredient-index-rebuild', daemon=True).start()
+        return index
+    
+    def _rank_local_candidates(self, cuisine: str, ingredients: List[str], dish_type: str,
+                               spice_level: str = None, max_cooking_time: str = None,
+                               k: int = 10) -> List[RankedCandidate]:
+        """
+        ONE ranked retrieval: every candidate of the cuisine (dish type filed or reading like it)
+        from a single query, scored once on ingredients, proteins, dish type, time, spice and quality
+        """
+        cuisine = cuisine.lower()
+        with_dish_type = bool(dish_type and dish_type != 'any')
+        
+        # Family search (e.g., "chicken" finds all parts), otherwise the ingredient itself
+        family_expansion = self._family_expansion_map()
+        expanded_ingredients = list(dict.fromkeys(
+            slug for ingredient in ingredients for slug in family_expansion.get(ingredient, (ingredient,))))
+        
+        # Use centralized PROTEINS list - one bit per requested protein
+        protein_query = self.protein_matcher.query(ingredients)
+        if len(protein_query) > 1:
+            print(f"   🥩 Multiple proteins requested: {protein_query.proteins}")
+        
+        # TIME and SPICE are scored, not filtered
+        max_time = None
+        if max_cooking_time and max_cooking_time != 'any':
+            try:
+                max_time = int(max_cooking_time)
+            except (ValueError, TypeError):
+                pass  # If can't parse time, don't score it
+        spice_target = SPICE_LEVEL_TARGETS.get(spice_level) if spice_level and spice_level != 'none' else None
+        
+        # Recipes filed under another dish type still count when they read like it (full-text)
+        dish_like = None
+        if with_dish_type and self.fts_available:
+            dish_like = self._dish_type_fts_expression(dish_type.lower())
+        
+        params = {'cuisine': cuisine}
+        if with_dish_type:
+            params['dish_type'] = dish_type.lower()
+        if dish_like:
+            params['dish_like'] = dish_like
+        
+        ingredient_index = self._current_ingredient_index()
+        if ingredient_index is not None:
+            # Candidate set straight from the in-memory posting lists
+            candidate_rowids = ingredient_index.candidates(
+                cuisine, dish_type.lower() if with_dish_type and not dish_like else None, expanded_ingredients)
+            print(f"   🗂️ Index candidates: {len(candidate_rowids)}")
+            if not candidate_rowids:
+                return []
+            params['rowids'] = json.dumps(candidate_rowids)
+            query = _ranked_level1_query(0, with_dish_type, bool(dish_like), by_rowid=True)
+        else:
+            params.update({f'i{i}': slug for i, slug in enumerate(expanded_ingredients)})
+            query = _ranked_level1_query(len(expanded_ingredients), with_dish_type, bool(dish_like))
+        rows = self.db.read_connection().execute(query, params).fetchall()
+        
+        ranker = LocalRanker(ingredients, family_expansion, protein_query, self.keywords, with_dish_type,
+                             max_time, spice_target)
+        ranked = ranker.rank(rows, self._row_slug_text, k)
+        print(f"   🔍 Ranked {len(rows)} candidates → {len(ranked)} kept"
+              f"{f' ({ranker.rejected_meat} with meat dropped, no protein selected)' if ranker.rejected_meat else ''}"
+              f"{f' ({ranker.rejected_protein} without the requested proteins)' if ranker.rejected_protein else ''}")
+        return ranked
+    
+    @staticmethod
+    def _local_recipe(row) -> Dict:
+        """Recipe dict of a Level 1 row (columns 0-11)"""
+        return {
+            'id': row[0],
+            'title': row[1],
+            'cuisine': row[2],
+            'dish_type': row[3],
+            'ingredients': json.loads(row[4]),
+            'instructions': json.loads(row[5]),
+            'prep_time': row[6],
+            'cook_time': row[7],
+            'servings': row[8],
+            'source': 'local_database',
+            'source_api': row[9],
+            'image_url': row[10],
+            'quality_score': row[11]
+        }
+    
+    def rank_local_recipes(self, cuisine: str, ingredients: List[str], dish_type: str,
+                           spice_level: str = None, max_cooking_time: str = None, k: int = 10) -> List[Dict]:
+        """Top-k local recipes with their score breakdowns (what Level 1 chooses from)"""
+        if not self.local_db_available:
+            return []
+        return [candidate.to_dict() for candidate in
+                self._rank_local_candidates(cuisine, ingredients, dish_type, spice_level, max_cooking_time, k)]
+    
     def _search_local_database(self, cuisine: str, ingredients: List[str], dish_type: str,
-                          spice_level: str = None, max_cooking_time: str = None) -> Optional[Dict]:
+                          spice_level: str = None, max_cooking_time: str = None,
+                          count_served: bool = True) -> Optional[Dict]:
         """
         Search LOCAL RecipeGen database with SMART ingredient matching!
         Handles chicken → all chicken parts, but preserves specificity
+        count_served=False leaves times_served alone (speculative searches)
         """
         if not self.local_db_available:
             return None
         
-        # Load ingredient families for smart matching
-        ingredient_families = self._load_ingredient_families()
-        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Use centralized PROTEINS list
-            requested_proteins = [ing for ing in ingredients if ing.lower() in self.PROTEINS]
-            has_protein_request = len(requested_proteins) > 0
-            
-            # Generate protein combinations for progressive matching
-            if has_protein_request and len(requested_proteins) > 1:
-                protein_combinations = generate_protein_combinations(requested_proteins)
-                print(f"   🥩 Multiple proteins requested: {requested_proteins}")
-                print(f"   🔄 Will try combinations: {protein_combinations}")
-            else:
-                protein_combinations = [requested_proteins] if requested_proteins else []
-            
-            # Expand ingredients based on families
-            expanded_ingredients = []
-            for ingredient in ingredients:
-                if ingredient in ingredient_families:
-                    # This is a family search (e.g., "chicken" finds all parts)
-                    family = ingredient_families[ingredient]
-                    if family.get('search_behavior') == 'inclusive':
-                        expanded_ingredients.extend(family['includes'])
-                    else:
-                        expanded_ingredients.append(ingredient)
-                else:
-                    # Regular ingredient
-                    expanded_ingredients.append(ingredient)
-            
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_ingredients = []
-            for ing in expanded_ingredients:
-                if ing not in seen:
-                    seen.add(ing)
-                    unique_ingredients.append(ing)
-            expanded_ingredients = unique_ingredients
-            
-            # First try exact match with cuisine and ingredients
-            ingredient_conditions = []
-            params = [cuisine.lower()]
-
-            # Add dish type if specified AND not 'any'
-            dish_type_condition = ""
-            if dish_type and dish_type != 'any':
-                dish_type_condition = "AND r.dish_type = ?"
-                params.append(dish_type.lower())
-            
-            # Build query for expanded ingredients
-            if expanded_ingredients:
-                ingredient_conditions.append(f'''
-                    EXISTS (
-                        SELECT 1 FROM recipe_ingredients ri 
-                        WHERE ri.recipe_id = r.id 
-                        AND ri.ingredient_slug IN ({','.join(['?'] * len(expanded_ingredients))})
-                    )
-                ''')
-                params.extend(expanded_ingredients)
-            
-                       
-            # Build the full query - include total_time for filtering
-            query = f'''
-                SELECT r.id, r.title, r.cuisine, r.dish_type, r.ingredients, 
-                    r.instructions, r.prep_time, r.cook_time, r.servings,
-                    r.source, r.image_url, r.quality_score, r.total_time
-                FROM recipes r
-                WHERE r.cuisine = ?
-                {dish_type_condition}
-                {"AND " + " AND ".join(ingredient_conditions) if ingredient_conditions else ""}
-                ORDER BY r.quality_score DESC, r.times_served DESC
-                LIMIT 10
-            '''
-            
-            # DEBUG: Log the query to see what's being searched
-            print(f"   🔍 DEBUG QUERY: Searching for cuisine='{cuisine}', dish_type='{dish_type}'")
-            print(f"   🔍 DEBUG: Ingredients being searched: {expanded_ingredients}")
-            print(f"   🔍 DEBUG: Query will return top 10 by quality_score and times_served")
-
-            # Execute query and validate protein matches
-            cursor.execute(query, params)
-            temp_results = cursor.fetchall()
-
-            # Apply TIME filter (hard filter - makes sense)
-            if max_cooking_time and max_cooking_time != 'any':
-                try:
-                    max_time = int(max_cooking_time)
-                    filtered_by_time = []
-                    for row in temp_results:
-                        # Use total_time (index 12) if available, otherwise sum prep+cook
-                        total_time = row[12] if row[12] else (row[6] or 0) + (row[7] or 0)
-                        if total_time and total_time <= max_time:
-                            filtered_by_time.append(row)
-                    
-                    if len(filtered_by_time) < len(temp_results):
-                        print(f"   ⏱️ Time filter: {len(filtered_by_time)}/{len(temp_results)} recipes under {max_time} min")
-                    temp_results = filtered_by_time
-                except (ValueError, TypeError):
-                    pass  # If can't parse time, don't filter
-
-            # Calculate SPICE SCORES for sorting (NOT filtering!)
-            if spice_level and spice_level != 'none' and len(temp_results) > 0:
-                spice_scored_results = []
-                
-                for row in temp_results:
-                    title_lower = row[1].lower()  # title is at index 1
-                    spice_score = 0
-                    
-                    # Score based on spice indicators in title
-                    if spice_level == 'mild':
-                        if any(word in title_lower for word in ['mild', 'gentle', 'sweet']):
-                            spice_score = 100  # Perfect match
-                        elif not any(word in title_lower for word in ['spicy', 'hot', 'chili', 'fiery']):
-                            spice_score = 80   # Probably mild (no spice words)
-                        else:
-                            spice_score = 20   # Has spice words, probably not mild
-                            
-                    elif spice_level in ['medium', 'hot', 'extra', 'insane']:
-                        # Progressive scoring for spicy levels
-                        spice_words = {
-                            'medium': ['spicy', 'zesty', 'tangy', 'seasoned'],
-                            'hot': ['hot', 'spicy', 'chili', 'pepper', 'fiery'],
-                            'extra': ['very hot', 'extra spicy', 'fiery', 'jalapeño'],
-                            'insane': ['ghost', 'habanero', 'scorpion', 'carolina', 'volcanic']
-                        }
-                        
-                        level_words = spice_words.get(spice_level, [])
-                        if any(word in title_lower for word in level_words):
-                            spice_score = 100  # Has matching spice words
-                        elif any(word in title_lower for word in ['spicy', 'hot', 'chili']):
-                            spice_score = 50   # Has some spice
-                        else:
-                            spice_score = 10   # No spice indicators
-                    
-                    spice_scored_results.append((row, spice_score))
-                
-                # Sort by spice score (best matches first), then by quality score
-                spice_scored_results.sort(key=lambda x: (x[1], x[0][11]), reverse=True)
-                temp_results = [row for row, score in spice_scored_results]
-                
-                # Log what we did
-                best_score = spice_scored_results[0][1] if spice_scored_results else 0
-                if best_score < 50:
-                    print(f"   🌶️ Note: No perfect {spice_level} matches, using best available")
-                else:
-                    print(f"   🌶️ Sorted by {spice_level} preference (best match: {best_score}% confidence)")
-
-            # Right before the validation
-            print(f"   🔍 Validating {len(temp_results)} recipes for protein match...", flush=True)
-
-            # VALIDATE PROTEIN MATCH
-            results = []
-
-            if has_protein_request:
-                # Try each protein combination in order (all → fewer → single)
-                for protein_combo in protein_combinations:
-                    combo_results = []
-                    
-                    for recipe_row in temp_results:
-                        recipe_data = json.loads(recipe_row[4])  # ingredients column
-                        recipe_ingredients_text = json.dumps(recipe_data).lower()
-                        
-                        # Check if ALL proteins in this combination are present
-                        proteins_matched = sum(1 for protein in protein_combo 
-                                             if protein in recipe_ingredients_text)
-                        
-                        if proteins_matched == len(protein_combo):
-                            # Perfect match for this combination!
-                            combo_results.append((recipe_row, len(protein_combo)))
-                            print(f"   ✅ Found recipe with {protein_combo}: '{recipe_row[1]}'")
-                    
-                    if combo_results:
-                        # Sort by protein match count (more proteins = better)
-                        combo_results.sort(key=lambda x: x[1], reverse=True)
-                        results = [row for row, count in combo_results]
-                        print(f"   🎯 Using recipes with {len(protein_combo)} protein(s): {protein_combo}")
-                        break  # Stop at first successful combination
-                
-                if not results and temp_results:
-                    print(f"   ❌ No recipes found with requested protein combinations")
-            else:
-                # No protein specified - prefer vegetarian (use centralized MEAT_PROTEINS)
-                for recipe_row in temp_results:
-                    recipe_data = json.loads(recipe_row[4])
-                    recipe_ingredients_text = json.dumps(recipe_data).lower()
-                    
-                    # Check if ANY meat protein is in this recipe
-                    has_meat = any(meat in recipe_ingredients_text for meat in self.MEAT_PROTEINS)
-                    
-                    if not has_meat:
-                        results.append(recipe_row)  # Vegetarian-friendly
-                    else:
-                        rejection_msg = f"   ❌ Rejected '{recipe_row[1]}' - contains meat (user selected no protein)"
-                        print(rejection_msg, flush=True)
-                        import sys
-                        sys.stdout.flush()
-            
-            if results:
-                
-                # Pick randomly from top recipes for variety
-                import random
-                
-                if len(results) > 1:
-                    # Randomly select from available results
-                    best_recipe = random.choice(results[:min(5, len(results))])
-                    print(f"   🎲 Randomly selected: {best_recipe[1]}")
-                else:
-                    best_recipe = results[0]
-
-                recipe = {
-                    'id': best_recipe[0],
-                    'title': best_recipe[1],
-                    'cuisine': best_recipe[2],
-                    'dish_type': best_recipe[3],
-                    'ingredients': json.loads(best_recipe[4]),
-                    'instructions': json.loads(best_recipe[5]),
-                    'prep_time': best_recipe[6],
-                    'cook_time': best_recipe[7],
-                    'servings': best_recipe[8],
-                    'source': 'local_database',
-                    'source_api': best_recipe[9],
-                    'image_url': best_recipe[10],
-                    'quality_score': best_recipe[11]
-                }
-                
-                # Update times served
-                cursor.execute(
-                    "UPDATE recipes SET times_served = times_served + 1 WHERE id = ?",
-                    (best_recipe[0],)
-                )
-                conn.commit()
-                
-                print(f"   ✅ Found in LOCAL database: {recipe['title']}")
+            return self._find_local_recipe(cuisine, ingredients, dish_type, spice_level, max_cooking_time,
+                                           count_served)
+        except Exception as e:
+            print(f"   ❌ Error searching local database: {e}")
+        
+        return None
+    
+    @traced('db.local_search')
+    def _find_local_recipe(self, cuisine: str, ingredients: List[str], dish_type: str,
+                           spice_level: str = None, max_cooking_time: str = None,
+                           count_served: bool = True) -> Optional[Dict]:
+        """_search_local_database without the catch-all: None only when nothing matched, errors raise"""
+        # Time is scored for ordering but the Level 1 answer must be within the limit
+        # (a known time, as the SQL filter had it) - otherwise Level 2 gets its turn
+        ranked = self._rank_local_candidates(cuisine, ingredients, dish_type, spice_level, max_cooking_time,
+                                             k=RANK_CANDIDATE_LIMIT)
+        eligible = [candidate for candidate in ranked if candidate.complete][:10]
+        if not eligible:
+            if ranked:
+                print(f"   ⏱️ {len(ranked)} local candidate(s), none within {max_cooking_time} min")
+            return None
+        
+        # Pick randomly from the near-ties at the top for variety
+        chosen = pick_for_variety(eligible)
+        best_recipe = chosen.row
+        if chosen is not eligible[0]:
+            print(f"   🎲 Randomly selected: {best_recipe[1]}")
+        
+        recipe = self._local_recipe(best_recipe)
+        recipe['match_score'] = chosen.score
+        recipe['score_breakdown'] = chosen.breakdown
+        
+        # Update times served (a busy writer must not cost the user the recipe)
+        if count_served:
+            try:
+                self._record_served(best_recipe[0])
+            except Exception as e:
+                print(f"   ⚠️ Could not count serving of {best_recipe[0]}: {e}")
+        
+        print(f"   ✅ Found in LOCAL database: {recipe['title']} (score {chosen.score})")
 
-                # Add spice mismatch flag if needed
-                if spice_level and spice_level != 'none':
-                    title_lower = recipe['title'].lower()
-                    
-                    # Detect mismatch
-                    if spice_level == 'mild':
-                        if any(word in title_lower for word in ['spicy', 'hot', 'chili', 'fiery', 'pepper']):
-                            recipe['spice_mismatch'] = {
-                                'requested': spice_level,
-                                'actual': 'spicy',
-                                'message': 'This recipe appears to be spicy'
-                            }
-                    elif spice_level in ['hot', 'extra', 'insane']:
-                        if not any(word in title_lower for word in ['spicy', 'hot', 'chili', 'pepper', 'fiery']):
-                            recipe['spice_mismatch'] = {
-                                'requested': spice_level,
-                                'actual': 'mild',
-                                'message': 'This recipe appears to be mild'
-                            }
-
-                conn.close()
-                return recipe
+        # Add spice mismatch flag if needed
+        if spice_level and spice_level != 'none':
+            title_is_spicy = self.keywords.contains(recipe['title'], 'spice_mismatch')
             
-            # Try relaxed search - cuisine only with partial ingredient match
-            # BUT STILL APPLY PROTEIN VALIDATION
-            if not results and ingredients:
-                cursor.execute('''
-                    SELECT r.id, r.title, r.cuisine, r.dish_type, r.ingredients, 
-                           r.instructions, r.prep_time, r.cook_time, r.servings,
-                           r.source, r.image_url, r.quality_score,
-                           COUNT(DISTINCT ri.ingredient_slug) as ingredient_matches
-                    FROM recipes r
-                    LEFT JOIN recipe_ingredients ri ON r.id = ri.recipe_id 
-                        AND ri.ingredient_slug IN ({})
-                    WHERE r.cuisine = ?
-                    {}
-                    GROUP BY r.id
-                    HAVING ingredient_matches > 0
-                    ORDER BY ingredient_matches DESC, r.quality_score DESC
-                    LIMIT 5
-                '''.format(','.join(['?'] * len(expanded_ingredients)), dish_type_condition),
-                    expanded_ingredients + [cuisine.lower()] + ([dish_type.lower()] if dish_type and dish_type != 'any' else [])
-                )
-                
-                partial_matches = cursor.fetchall()
-                
-                # Apply progressive protein validation to partial matches
-                validated_partial = []
-                
-                if has_protein_request:
-                    # Try each protein combination for partial matches
-                    for protein_combo in protein_combinations:
-                        for match in partial_matches:
-                            recipe_data = json.loads(match[4])
-                            recipe_ingredients_text = json.dumps(recipe_data).lower()
-                            
-                            # Check if ALL proteins in this combination are present
-                            proteins_matched = sum(1 for protein in protein_combo 
-                                                 if protein in recipe_ingredients_text)
-                            
-                            if proteins_matched == len(protein_combo):
-                                # Add with protein match count for sorting
-                                validated_partial.append((match, len(protein_combo)))
-                        
-                        if validated_partial:
-                            # Sort by protein count, then take just the matches
-                            validated_partial.sort(key=lambda x: x[1], reverse=True)
-                            validated_partial = [match for match, count in validated_partial]
-                            print(f"   🎯 Partial matches found with {protein_combo}")
-                            break
-                else:
-                    # Should not have meat (vegetarian preference) - use centralized list
-                    for match in partial_matches:
-                        recipe_data = json.loads(match[4])
-                        recipe_ingredients_text = json.dumps(recipe_data).lower()
-                        
-                        has_meat = any(meat in recipe_ingredients_text for meat in self.MEAT_PROTEINS)
-                        if not has_meat:
-                            validated_partial.append(match)
-                
-                if validated_partial:
-                    
-                    # Also randomize partial matches
-                    import random
-                    if len(validated_partial) > 1:
-                        best_match = random.choice(validated_partial[:min(5, len(validated_partial))])
-                        print(f"   🎲 Randomly selected partial match: {best_match[1]}")
-                    else:
-                        best_match = validated_partial[0]
-
-                    recipe = {
-                        'id': best_match[0],
-                        'title': best_match[1],
-                        'cuisine': best_match[2],
-                        'dish_type': best_match[3],
-                        'ingredients': json.loads(best_match[4]),
-                        'instructions': json.loads(best_match[5]),
-                        'prep_time': best_match[6],
-                        'cook_time': best_match[7],
-                        'servings': best_match[8],
-                        'source': 'local_database',
-                        'source_api': best_match[9],
-                        'image_url': best_match[10],
-                        'quality_score': best_match[11],
-                        'partial_match': True,
-                        'matched_ingredients': best_match[12]
+            # Detect mismatch
+            if spice_level == 'mild':
+                if title_is_spicy:
+                    recipe['spice_mismatch'] = {
+                        'requested': spice_level,
+                        'actual': 'spicy',
+                        'message': 'This recipe appears to be spicy'
                     }
-                    
-                    print(f"   ✅ Found partial match in LOCAL database: {recipe['title']} ({best_match[12]}/{len(ingredients)} ingredients)")
-                    conn.close()
-                    return recipe
-            
-            conn.close()
-            
+            elif spice_level in ['hot', 'extra', 'insane']:
+                if not title_is_spicy:
+                    recipe['spice_mismatch'] = {
+                        'requested': spice_level,
+                        'actual': 'mild',
+                        'message': 'This recipe appears to be mild'
+                    }
+
+        return recipe
+    
+    @traced('db.text_search')
+    def search_text(self, query: str, cuisine: Optional[str] = None, k: int = 10) -> List[Dict]:
+        """
+        LOCAL recipes for a free-text query ("creamy coconut chicken"), best first - TF-IDF cosine
+        over titles, ingredient names and instructions; no API call
+        """
+        index = self.text_search
+        if index is None:
+            return []
+        hits = index.search(query, cuisine.lower() if cuisine else None, k)
+        if not hits:
+            return []
+        scores = dict(hits)
+        rows = self.db.read_connection().execute('''
+            SELECT id, title, cuisine, dish_type, image_url, quality_score,
+                   COALESCE(NULLIF(total_time, 0), COALESCE(prep_time, 0) + COALESCE(cook_time, 0))
+            FROM recipes WHERE id IN (SELECT value FROM json_each(?))
+        ''', (json.dumps(list(scores)),)).fetchall()
+        results = [{'id': row[0], 'title': row[1], 'cuisine': row[2], 'dish_type': row[3],
+                    'image_url': row[4], 'quality_score': row[5], 'total_time': row[6] or None,
+                    'score': scores[row[0]]} for row in rows]
+        results.sort(key=lambda recipe: (-recipe['score'], str(recipe['id'])))
+        return results
+    
+    def _backfill_minhash(self, index: NearMatchIndex) -> int:
+        """
+        Sign recipes that have no signature yet (`python recipe_minhash.py sign` does it offline),
+        minhash_backfill_batch at a time: hashing outside the writer lock, one short read and write per batch
+        """
+        signed, after = 0, 0
+        started = time.perf_counter()
+        try:
+            while not self._backfill_stop.is_set():
+                with self.db.writer() as conn:  # No reader connection pooled for a one-off thread
+                    batch = unsigned_recipes(conn, self.minhasher, after, self.minhash_backfill_batch)
+                if not batch:
+                    break
+                signatures = {recipe_id: self.minhasher.signature(slugs) for _, recipe_id, _, _, slugs in batch}
+                with self.db.writer() as conn:
+                    write_signatures(conn, self.minhasher, signatures)
+                for _, recipe_id, cuisine, title, slugs in batch:
+                    index.add(recipe_id, slugs, cuisine, title, signatures[recipe_id])
+                signed += len(batch)
+                after = batch[-1][0]
         except Exception as e:
-            print(f"   ❌ Error searching local database: {e}")
-        
+            print(f"   ⚠️ MinHash back-fill stopped after {signed} recipes: {e}")
+        if signed:
+            print(f"   🔏 Signed {signed} recipes for near-match search in {time.perf_counter() - started:.1f}s")
+        return signed
+    
+    def _near_match_candidates(self, cuisine: str, query: frozenset) -> List[Tuple[NearMatch, frozenset]]:
+        """
+        Recipes of the cuisine with at least near_match_min_containment of the query, best first,
+        with their slug sets. Requests of up to near_match_containment_max_query ingredients count
+        shared ingredients on the ingredient index's posting lists: LSH follows Jaccard, and a
+        3-ingredient request against a 10-ingredient recipe has J = 0.3 even when every ingredient
+        is there. Longer requests (close to whole recipes) go through the MinHash/LSH index
+        """
+        min_shared = max(self.near_match_min_shared, math.ceil(self.near_match_min_containment * len(query) - 1e-9))
+        ingredient_index = self._current_ingredient_index()
+        if ingredient_index is not None and len(query) <= self.near_match_containment_max_query:
+            hits = ingredient_index.containing(cuisine, sorted(query), min_shared)
+            if not hits:
+                return []
+            rows = self.db.read_connection().execute('''
+                SELECT r.id, (SELECT group_concat(ri.ingredient_slug, '|') FROM recipe_ingredients ri
+                              WHERE ri.recipe_id = r.id)
+                FROM recipes r WHERE r.rowid IN (SELECT value FROM json_each(?))
+            ''', (json.dumps([rowid for rowid, _ in hits[:self.near_match_candidate_limit]]),)).fetchall()
+            candidates = []
+            for recipe_id, slugs in rows:
+                slug_set = frozenset(slug for slug in (slugs or '').split('|') if slug)
+                shared = len(query & slug_set)
+                candidates.append((NearMatch(recipe_id, round(shared / len(query | slug_set), 3),
+                                             round(shared / len(query), 3), shared), slug_set))
+            candidates.sort(key=lambda c: (-c[0].containment, -c[0].jaccard, c[0].recipe_id))
+            return candidates
+        index = self.near_match_index
+        if index is None:
+            return []
+        return [(match, index.slugs(match.recipe_id))
+                for match in index.nearest(query, cuisine, k=self.near_match_candidate_limit,
+                                           min_containment=self.near_match_min_containment)
+                if match.shared >= min_shared]
+    
+    @traced('db.near_match')
+    def _search_near_match(self, cuisine: str, ingredients: List[str],
+                           max_cooking_time: str = None) -> Optional[Dict]:
+        """
+        Closest LOCAL recipe of the cuisine by ingredient set (any dish type), when it has at
+        least near_match_min_containment (and near_match_min_shared) of the requested ingredients.
+        Protein, vegetarian and time limit rules still apply
+        Asked right after a Level 1 miss: a close local recipe saves the paid API calls
+        """
+        max_time = None
+        if max_cooking_time and max_cooking_time != 'any':
+            try:
+                max_time = int(max_cooking_time)
+            except (ValueError, TypeError):
+                pass
+        query = frozenset(s for s in (str(i).lower().strip() for i in ingredients) if s)
+        if len(query) < self.near_match_min_shared:
+            return None
+        protein_query = self.protein_matcher.query(ingredients)
+        for match, slugs in self._near_match_candidates(cuisine, query):
+            slug_text = '|' + '|'.join(sorted(slugs)) + '|'
+            if protein_query:
+                if protein_query.mask(self.keywords.words(slug_text)) != protein_query.full_mask:
+                    continue
+            elif self.keywords.contains(slug_text, 'meat'):
+                continue
+            row = self.db.read_connection().execute(f'''
+                SELECT r.id, r.title, r.cuisine, r.dish_type, r.ingredients, r.instructions, r.prep_time,
+                       r.cook_time, r.servings, r.source, r.image_url, r.quality_score, {_EFFECTIVE_TIME_SQL}
+                FROM recipes r WHERE r.id = ?
+            ''', (match.recipe_id,)).fetchone()
+            if row is None:
+                continue
+            if max_time is not None and not 1 <= row[12] <= max_time:
+                continue
+            recipe = self._local_recipe(row)
+            recipe['partial_match'] = True
+            recipe['near_match'] = {'similarity': match.jaccard, 'shared_ingredients': match.shared,
+                                    'requested_ingredients': len(query)}
+            recipe['note'] = f"Closest local recipe - has {match.shared} of your {len(query)} ingredients"
+            print(f"   🧬 Near match in LOCAL database: {recipe['title']} "
+                  f"({match.shared}/{len(query)} ingredients, Jaccard {match.jaccard})")
+            return recipe
         return None
     
+    def _record_served(self, recipe_id: str):
+        """Bump times_served (reads are query_only - go through the writer)"""
+        with self.db.writer() as conn:
+            conn.execute(
+                "UPDATE recipes SET times_served = times_served + 1 WHERE id = ?",
+                (recipe_id,)
+            )
+    
+    def _search_sister_countries(self, sisters: List[str], ingredients: List[str], dish_type: str,
+                                 spice_level: str = None, max_cooking_time: str = None) -> Optional[Dict]:
+        """
+        Level 3 across all compatible sisters, keeping the serial preference order
+        (local s1, API s1, local s2, API s2, ...):
+        - LOCAL searches for every sister run at once (cheap)
+        - API searches only for sisters ahead of the first local hit,
+          at most sister_api_concurrency in flight
+        The earliest sister in that order wins; everything else is cancelled.
+        """
+        local_futures = []
+        if self.local_db_available:
+            print(f"\n   🔄 Trying {len(sisters)} sister countries in LOCAL DB at once...")
+            local_futures = [
+                self._submit(self._sister_executor, call_in_span, 'sister.local', {'country': sister},
+                             self._search_local_database, sister, ingredients, dish_type, spice_level,
+                             max_cooking_time, False)
+                for sister in sisters
+            ]
+        
+        local_results = []
+        for sister, future in zip(sisters, local_futures):
+            try:
+                local_results.append(future.result(timeout=time_left()))
+            except Exception as e:
+                print(f"   ⚠️ Local search failed for {sister}: {e}")
+                local_results.append(None)
+        
+        # Only sisters BEFORE the first local hit can still beat it
+        first_local_hit = next((i for i, r in enumerate(local_results) if r), len(sisters))
+        
+        # Sisters sharing a Spoonacular cuisine share one API search
+        api_sisters = []
+        api_futures = {}
+        for sister in sisters[:first_local_hit]:
+            sister_spoon = self.country_to_spoonacular.get(sister)
+            if sister_spoon:
+                api_sisters.append((sister, sister_spoon))
+        next_to_submit = 0
+        
+        def submit_window(position: int):
+            nonlocal next_to_submit
+            while next_to_submit < len(api_sisters) and next_to_submit < position + self.sister_api_concurrency:
+                sister, sister_spoon = api_sisters[next_to_submit]
+                if sister_spoon not in api_futures:
+                    print(f"   🔄 Trying sister country in APIs: {sister} ({sister_spoon})")
+                    api_futures[sister_spoon] = self._submit(
+                        self._sister_executor, call_in_span, 'sister.api', {'country': sister_spoon},
+                        self._search_all_apis, sister_spoon, ingredients, dish_type, "sister")
+                next_to_submit += 1
+        
+        try:
+            api_position = 0
+            for index, sister in enumerate(sisters[:first_local_hit + 1]):
+                if index == first_local_hit:
+                    # Every earlier sister missed on both sources
+                    local_sister = local_results[index]
+                    if not local_sister.get('partial_match'):
+                        self._record_served(local_sister['id'])
+                    local_sister['note'] = f"Similar {sister.title()} recipe"
+                    return local_sister
+                
+                if api_position < len(api_sisters) and api_sisters[api_position][0] == sister:
+                    submit_window(api_position)
+                    sister_spoon = api_sisters[api_position][1]
+                    api_position += 1
+                    try:
+                        api_recipe = api_futures[sister_spoon].result(timeout=time_left())
+                    except Exception as e:
+                        print(f"   ⚠️ API search failed for {sister}: {e}")
+                        api_recipe = None
+                    if api_recipe:
+                        api_recipe['note'] = f"Similar {sister.title()} recipe"
+                        self._save_to_local_db(api_recipe)
+                        return api_recipe
+            return None
+        finally:
+            for future in api_futures.values():
+                future.cancel()
+    
     def _load_culinary_regions(self) -> Dict:
         """Load culinary regions mapping"""
         try:
@@ -684,54 +1088,71 @@ class RecipeMatcher4D:
             print("⚠️ Culinary regions not found. Run culinary_regions_updater.py!")
             return {'regions': {}, 'country_to_spoonacular': {}}
     
+    def _culinary_graph(self) -> CulinaryGraph:
+        """Compiled region/sister/compatibility graph, recompiled when its source data is replaced"""
+        sources = (self.culinary_regions, self.ingredient_cuisines, self.country_to_spoonacular)
+        graph = self._compiled_culinary_graph
+        if graph is None or any(a is not b for a, b in zip(graph.sources, sources)):
+            graph = self._compiled_culinary_graph = CulinaryGraph(*sources)
+        return graph
+    
     def _ingredients_compatible_with_country(self, ingredient_slugs: List[str], country: str) -> bool:
-        """Check if ingredients can be used in this country's cuisine - BE LENIENT!"""
-        if not self.ingredient_cuisines:
-            return True
-        
-        incompatible_count = 0
-        for ingredient in ingredient_slugs:
-            if ingredient in self.ingredient_cuisines:
-                allowed_countries = self.ingredient_cuisines[ingredient]
-                if allowed_countries and len(allowed_countries) > 0 and country not in allowed_countries:
-                    incompatible_count += 1
-        
-        # Allow if MOST ingredients work (not ALL)
-        return incompatible_count < len(ingredient_slugs) / 2
+        """Check if ingredients can be used in this country's cuisine - BE LENIENT! (most, not all)"""
+        return self._culinary_graph().compatible(ingredient_slugs, country)
     
     def _ingredients_compatible_with_spoonacular_cuisine(self, ingredient_slugs: List[str], spoon_cuisine: str) -> bool:
-        """Check if ingredients work with a Spoonacular cuisine category"""
-        # Find all countries that map to this Spoonacular cuisine
-        countries_in_cuisine = []
-        for country, cuisine in self.country_to_spoonacular.items():
-            if cuisine == spoon_cuisine:
-                countries_in_cuisine.append(country)
-        
-        # If ANY country in this cuisine can use all ingredients, it's compatible
-        for country in countries_in_cuisine:
-            if self._ingredients_compatible_with_country(ingredient_slugs, country):
-                return True
-        
-        return False
+        """Check if ingredients work with a Spoonacular cuisine category (ANY of its countries)"""
+        return self._culinary_graph().compatible_with_spoonacular(ingredient_slugs, spoon_cuisine)
     
     def _search_all_apis(self, cuisine_term: str, ingredients: List[str], 
                     dish_type: str = None,
                     search_type: str = "primary") -> Optional[Dict]:
         """
         Search across ALL enabled API providers
-        Returns first good result found
+        Returns first good result found (by provider priority)
+        An empty answer is remembered (negative cache) unless a provider failed
         """
+        empty_key = ('api', cuisine_term.lower().strip(), tuple(sorted(ingredients)), dish_type)
+        if self.result_cache.is_known_empty(empty_key):
+            print(f"\n   ⏭️ APIs already came back empty for '{cuisine_term}' + {ingredients} - skipping")
+            return None
+        
+        failures = []
+        if self.concurrent_api_search and len(self.sorted_providers) > 1:
+            result = self._search_all_apis_concurrent(cuisine_term, ingredients, dish_type,
+                                                      search_type, failures)
+        else:
+            result = self._search_all_apis_serial(cuisine_term, ingredients, dish_type,
+                                                  search_type, failures)
+        
+        if result is None and not failures:
+            self.result_cache.record_empty(empty_key, cuisine_term)
+        return result
+    
+    def _search_all_apis_serial(self, cuisine_term: str, ingredients: List[str],
+                                dish_type: str = None, search_type: str = "primary",
+                                failures: List[str] = None) -> Optional[Dict]:
+        """One provider after the other (providers that raise are added to `failures`)"""
         print(f"\n   🌐 Searching across {len(self.sorted_providers)} API providers...")
         
         for provider_key, provider_info in self.sorted_providers:
             fetcher = provider_info['fetcher']
             provider_name = provider_info['name']
             
+            if time_left() == 0:
+                print(f"      ⏱️ Out of time - not trying {provider_name}")
+                if failures is not None:
+                    failures.append(provider_name)
+                continue
+            
             print(f"\n      📡 Trying {provider_name}...")
             
             try:
                 # Each fetcher implements search_recipes with same interface
-                results = fetcher.search_recipes(cuisine_term, ingredients, number=10)
+                self._count_api_call()
+                with span('provider.search', provider=provider_name) as search:
+                    results = fetcher.search_recipes(cuisine_term, ingredients, number=10)
+                    search.tag(outcome='hit' if results.get('results') else 'miss')
                 
                 if 'results' in results and results['results']:
                     print(f"         {provider_name} returned: {len(results['results'])} recipes")
@@ -739,91 +1160,203 @@ class RecipeMatcher4D:
                     # Check each recipe for quality
                     for recipe_summary in results['results']:
                         if fetcher.is_quality_recipe(recipe_summary):
-                            # Get full details and convert to RecipeGen format
-                            full_recipe = fetcher.get_recipe_details(recipe_summary['id'])
-                            
-                            # CONVERT TO OUR RELIGION FIRST! 🙏
-                            # Each provider's converter knows how to map their fields to ours
-                            try:
-                                formatted = fetcher.convert_to_recipegen_format(full_recipe)
-                            except Exception as e:
-                                print(f"      ⚠️ Conversion failed for '{recipe_summary.get('title', 'Unknown')}': {e}")
-                                continue  # Skip malformed data
-
-                            # Progressive protein matching using centralized lists
-                            requested_proteins = [ing for ing in ingredients if ing.lower() in self.PROTEINS]
-                            has_protein_request = len(requested_proteins) > 0
-                            
-                            # Check protein match
-                            if has_protein_request:
-                                # Multiple proteins - need progressive matching
-                                if len(requested_proteins) > 1:
-                                    protein_combinations = generate_protein_combinations(requested_proteins)
-                                    recipe_ingredients = str(formatted.get('all_ingredients', [])).lower()
-                                    
-                                    # Find best protein match
-                                    best_match_count = 0
-                                    for protein_combo in protein_combinations:
-                                        proteins_matched = sum(1 for protein in protein_combo 
-                                                             if protein in recipe_ingredients)
-                                        if proteins_matched == len(protein_combo) and len(protein_combo) > best_match_count:
-                                            best_match_count = len(protein_combo)
-                                            break  # Found a match at this level
-                                    
-                                    if best_match_count == 0:
-                                        print(f"      ❌ Skipped '{formatted.get('title', 'Unknown')}' - no requested proteins found")
-                                        continue
-                                    elif best_match_count < len(requested_proteins):
-                                        print(f"      ⚠️  '{formatted.get('title', 'Unknown')}' - partial protein match ({best_match_count}/{len(requested_proteins)})")
-                                else:
-                                    # Single protein - simple check
-                                    recipe_ingredients = str(formatted.get('all_ingredients', [])).lower()
-                                    if requested_proteins[0] not in recipe_ingredients:
-                                        print(f"      ❌ Skipped '{formatted.get('title', 'Unknown')}' - missing {requested_proteins[0]}")
-                                        continue
-                            else:
-                                # No protein requested - vegetarian preference using centralized list
-                                recipe_ingredients = formatted.get('all_ingredients', [])
-                                has_meat = any(meat in str(recipe_ingredients).lower() for meat in self.MEAT_PROTEINS)
-                                
-                                if has_meat:
-                                    print(f"      ❌ Skipped '{formatted.get('title', 'Unknown')}' - contains meat/fish (vegetarian preference)")
-                                    continue
-
-                            # NOW verify dish type on OUR standardized structure
-                            print(f"🔍 DEBUG: About to verify dish_type='{dish_type}' for recipe '{formatted.get('title', 'Unknown')}'")
-                            if dish_type and dish_type != 'any':
-                                print(f"🔍 DEBUG: Entering dish type verification for '{dish_type}'")
-                                if not self._verify_dish_type_match(formatted, dish_type):
-                                    print(f"      ❌ Skipped '{formatted.get('title', 'Unknown')}' - not a {dish_type}")
-                                    continue  # Skip this recipe, try next one
-
-                            # Validate cuisine match on OUR structure
-                            recipe_cuisines = formatted.get('cuisines', [])
-                            if not isinstance(recipe_cuisines, list):
-                                recipe_cuisines = []
-                        
-                            recipe_cuisines_lower = [c.lower() for c in recipe_cuisines]
-                            cuisine_term_lower = cuisine_term.lower()
-    
-                            # Check if the cuisine matches (be somewhat flexible)
-                            if (cuisine_term_lower in recipe_cuisines_lower or 
-                                any(cuisine_term_lower in c for c in recipe_cuisines_lower) or
-                                len(recipe_cuisines) == 0):  # If no cuisine specified, accept it
-                                print(f"      ✅ Found on {provider_name}: {formatted['title']}")
-                                formatted['source_api'] = provider_name
+                            formatted = self._check_api_candidate(fetcher, provider_name, recipe_summary,
+                                                                  cuisine_term, ingredients, dish_type)
+                            if formatted:
                                 return formatted
-                            else:
-                                print(f"      ❌ Skipped '{formatted['title']}' - cuisines {recipe_cuisines} don't match {cuisine_term}")
                     
             except Exception as e:
                 import traceback
                 print(f"         ⚠️ Error with {provider_name}: {str(e)}")
                 print(f"         Full traceback: {traceback.format_exc()}")
+                if failures is not None:
+                    failures.append(provider_name)
                 # Continue to next provider
         
         return None
     
+    def _search_all_apis_concurrent(self, cuisine_term: str, ingredients: List[str],
+                                    dish_type: str = None,
+                                    search_type: str = "primary",
+                                    failures: List[str] = None) -> Optional[Dict]:
+        """
+        Fan-out version of _search_all_apis
+        All providers are queried in parallel; the highest-priority acceptable
+        result wins as soon as every higher-priority provider has come back empty.
+        Each provider gets api_provider_timeout seconds, then the rest is cancelled.
+        Providers that time out or fail are added to `failures`.
+        """
+        if failures is None:
+            failures = []
+        print(f"\n   🌐 Searching {len(self.sorted_providers)} API providers in parallel...")
+        
+        cancel = threading.Event()
+        queued = time.monotonic()
+        provider_timeout = time_left(self.api_provider_timeout)  # Capped by the cascade deadline
+        pending = []
+        for provider_key, provider_info in self.sorted_providers:
+            clock = _TaskClock()
+            pending.append((provider_info['name'], clock,
+                            self._submit(self._provider_executor, clock.run, self._search_provider,
+                                         provider_info, cuisine_term, ingredients, dish_type, cancel, failures)))
+        
+        try:
+            # Walk in priority order - a lower-priority hit only counts once everyone above it missed
+            for provider_name, clock, future in pending:
+                # A provider's clock starts when a worker picks it up, not while it waits for one
+                if not clock.started.wait(max(0.0, queued + provider_timeout - time.monotonic())):
+                    print(f"         ⏱️ {provider_name} never got a worker within {provider_timeout:.1f}s")
+                    failures.append(provider_name)
+                    continue
+                remaining = max(0.0, clock.started_at + provider_timeout - time.monotonic())
+                try:
+                    result = future.result(timeout=time_left(remaining))
+                except FutureTimeoutError:
+                    print(f"         ⏱️ {provider_name} timed out after {provider_timeout:.1f}s")
+                    failures.append(provider_name)
+                    continue
+                except Exception as e:
+                    print(f"         ⚠️ Error with {provider_name}: {str(e)}")
+                    failures.append(provider_name)
+                    continue
+                if result:
+                    return result
+            return None
+        finally:
+            # Stop whatever is still running for the losers
+            cancel.set()
+            for provider_name, clock, future in pending:
+                future.cancel()
+    
+    def _search_provider(self, provider_info: Dict, cuisine_term: str, ingredients: List[str],
+                         dish_type: str, cancel: threading.Event,
+                         failures: List[str] = None) -> Optional[Dict]:
+        """
+        One provider's share of the fan-out: search, then fetch details for the
+        top api_detail_fanout quality summaries at a time.
+        The first acceptable summary in the provider's own ranking wins.
+        """
+        fetcher = provider_info['fetcher']
+        provider_name = provider_info['name']
+        
+        print(f"\n      📡 Trying {provider_name}...")
+        self._count_api_call()
+        with span('provider.search', provider=provider_name) as search:
+            results = fetcher.search_recipes(cuisine_term, ingredients, number=10)
+            search.tag(outcome='hit' if results.get('results') else 'miss')
+        if cancel.is_set() or not results.get('results'):
+            return None
+        print(f"         {provider_name} returned: {len(results['results'])} recipes")
+        
+        summaries = [r for r in results['results'] if fetcher.is_quality_recipe(r)]
+        batch_size = max(1, self.api_detail_fanout)
+        
+        for start in range(0, len(summaries), batch_size):
+            if cancel.is_set():
+                return None
+            batch = [
+                self._submit(self._detail_executor, self._check_api_candidate, fetcher, provider_name,
+                             summary, cuisine_term, ingredients, dish_type)
+                for summary in summaries[start:start + batch_size]
+            ]
+            try:
+                for future in batch:
+                    try:
+                        formatted = future.result()
+                    except Exception as e:
+                        print(f"      ⚠️ Detail fetch failed on {provider_name}: {e}")
+                        if failures is not None:
+                            failures.append(provider_name)
+                        continue
+                    if formatted:
+                        return formatted
+            finally:
+                for future in batch:
+                    future.cancel()
+        
+        return None
+    
+    @traced('provider.details', tags=lambda self, fetcher, provider_name, *args, **kwargs: {'provider': provider_name})
+    def _check_api_candidate(self, fetcher, provider_name: str, recipe_summary: Dict,
+                             cuisine_term: str, ingredients: List[str],
+                             dish_type: str = None) -> Optional[Dict]:
+        """
+        Fetch details for one API search result and validate it
+        (protein/vegetarian, dish type, cuisine). Returns the converted recipe or None.
+        """
+        # Get full details and convert to RecipeGen format
+        self._count_api_call()
+        full_recipe = fetcher.get_recipe_details(recipe_summary['id'])
+        return self._validate_api_candidate(fetcher, provider_name, recipe_summary, full_recipe,
+                                            cuisine_term, ingredients, dish_type)
+    
+    def _validate_api_candidate(self, fetcher, provider_name: str, recipe_summary: Dict, full_recipe: Dict,
+                                cuisine_term: str, ingredients: List[str],
+                                dish_type: str = None) -> Optional[Dict]:
+        """Convert fetched details to RecipeGen format and check them against the request"""
+        # CONVERT TO OUR RELIGION FIRST! 🙏
+        # Each provider's converter knows how to map their fields to ours
+        try:
+            formatted = fetcher.convert_to_recipegen_format(full_recipe)
+        except Exception as e:
+            print(f"      ⚠️ Conversion failed for '{recipe_summary.get('title', 'Unknown')}': {e}")
+            return None  # Skip malformed data
+
+        # Protein match (or vegetarian preference) through the compiled protein matcher
+        if not self._api_proteins_acceptable(formatted, ingredients):
+            return None
+
+        # NOW verify dish type on OUR standardized structure
+        if dish_type and dish_type != 'any':
+            if not self._verify_dish_type_match(formatted, dish_type):
+                print(f"      ❌ Skipped '{formatted.get('title', 'Unknown')}' - not a {dish_type}")
+                return None  # Skip this recipe, try next one
+
+        # Validate cuisine match on OUR structure
+        recipe_cuisines = formatted.get('cuisines', [])
+        if not isinstance(recipe_cuisines, list):
+            recipe_cuisines = []
+    
+        recipe_cuisines_lower = [c.lower() for c in recipe_cuisines]
+        cuisine_term_lower = cuisine_term.lower()
+
+        # Check if the cuisine matches (be somewhat flexible)
+        if (cuisine_term_lower in recipe_cuisines_lower or 
+            any(cuisine_term_lower in c for c in recipe_cuisines_lower) or
+            len(recipe_cuisines) == 0):  # If no cuisine specified, accept it
+            print(f"      ✅ Found on {provider_name}: {formatted['title']}")
+            formatted['source_api'] = provider_name
+            return formatted
+        
+        print(f"      ❌ Skipped '{formatted['title']}' - cuisines {recipe_cuisines} don't match {cuisine_term}")
+        return None
+    
+    def _api_proteins_acceptable(self, formatted: Dict, ingredients: List[str]) -> bool:
+        """
+        Progressive protein matching on a converted API recipe, one scan of its ingredients:
+        at least one requested protein (partial matches are logged), or no meat at all
+        when no protein was requested (vegetarian preference)
+        """
+        title = formatted.get('title', 'Unknown')
+        found = self.keywords.words(str(formatted.get('all_ingredients', [])))
+        protein_query = self.protein_matcher.query(ingredients)
+        
+        if not protein_query:
+            if found & self.keywords.categories['meat']:
+                print(f"      ❌ Skipped '{title}' - contains meat/fish (vegetarian preference)")
+                return False
+            return True
+        
+        # Best protein match = how many requested proteins are present
+        best_match_count = protein_query.match_count(found)
+        if best_match_count == 0:
+            missing = protein_query.proteins[0] if len(protein_query) == 1 else 'requested proteins'
+            print(f"      ❌ Skipped '{title}' - no {missing} found")
+            return False
+        if best_match_count < len(protein_query):
+            print(f"      ⚠️  '{title}' - partial protein match ({best_match_count}/{len(protein_query)})")
+        return True
+    
     def _search_all_apis_with_verification(self, cuisine_term: str, ingredients: List[str], 
                                      required_dish_type: str) -> Optional[Dict]:
         """
@@ -855,45 +1388,8 @@ class RecipeMatcher4D:
                                 print(f"      ⚠️ Conversion failed for '{recipe_summary.get('title', 'Unknown')}': {e}")
                                 continue
                             
-                            # Progressive protein matching using centralized lists
-                            requested_proteins = [ing for ing in ingredients if ing.lower() in self.PROTEINS]
-                            has_protein_request = len(requested_proteins) > 0
-                            
-                            # Check protein match
-                            if has_protein_request:
-                                # Multiple proteins - need progressive matching
-                                if len(requested_proteins) > 1:
-                                    protein_combinations = generate_protein_combinations(requested_proteins)
-                                    recipe_ingredients = str(formatted.get('all_ingredients', [])).lower()
-                                    
-                                    # Find best protein match
-                                    best_match_count = 0
-                                    for protein_combo in protein_combinations:
-                                        proteins_matched = sum(1 for protein in protein_combo 
-                                                             if protein in recipe_ingredients)
-                                        if proteins_matched == len(protein_combo) and len(protein_combo) > best_match_count:
-                                            best_match_count = len(protein_combo)
-                                            break  # Found a match at this level
-                                    
-                                    if best_match_count == 0:
-                                        print(f"      ❌ Skipped '{formatted.get('title', 'Unknown')}' - no requested proteins found")
-                                        continue
-                                    elif best_match_count < len(requested_proteins):
-                                        print(f"      ⚠️  '{formatted.get('title', 'Unknown')}' - partial protein match ({best_match_count}/{len(requested_proteins)})")
-                                else:
-                                    # Single protein - simple check
-                                    recipe_ingredients = str(formatted.get('all_ingredients', [])).lower()
-                                    if requested_proteins[0] not in recipe_ingredients:
-                                        print(f"      ❌ Skipped '{formatted.get('title', 'Unknown')}' - missing {requested_proteins[0]}")
-                                        continue
-                            else:
-                                # No protein requested - vegetarian preference using centralized list
-                                recipe_ingredients = formatted.get('all_ingredients', [])
-                                has_meat = any(meat in str(recipe_ingredients).lower() for meat in self.MEAT_PROTEINS)
-                                
-                                if has_meat:
-                                    print(f"      ❌ Skipped '{formatted.get('title', 'Unknown')}' - contains meat/fish (vegetarian preference)")
-                                    continue
+                            if not self._api_proteins_acceptable(formatted, ingredients):
+                                continue
 
                             # NOW verify on OUR converted format
                             if self._verify_dish_type_match(formatted, required_dish_type):
@@ -919,19 +1415,20 @@ class RecipeMatcher4D:
             print(f"         ✅ Dish type already confirmed by converter: {recipe.get('dish_type')}")
             return True
 
-        # Load dish type indicators from config or use defaults
-        dish_type_indicators = self._load_dish_type_indicators()
+        # Dish type indicators + precompiled title matchers (config or defaults)
+        dish_type_matchers = self._compiled_dish_type_matchers()
         
-        indicators = dish_type_indicators.get(required_dish_type, {})
+        indicators = dish_type_matchers.get(required_dish_type, {})
         if not indicators:
             return True  # Unknown dish type, be permissive
         
         score = 0
         max_score = 0
         
+        keywords = indicators['keywords']
+        
         # Check title (most reliable indicator)
-        title = recipe.get('title', '').lower()
-        if any(word in title for word in indicators.get('title_words', [])):
+        if keywords.contains(recipe.get('title', ''), 'title'):
             score += 4  # Strong indicator!
         max_score += 4
         
@@ -954,17 +1451,15 @@ class RecipeMatcher4D:
             for step in recipe.get('steps', []):
                 instructions_text += ' ' + step.get('instruction', '')
         
-        instructions_lower = instructions_text.lower()
-        
         if instructions_text:
-            pattern_matches = sum(1 for pattern in indicators.get('instruction_patterns', []) 
-                                 if pattern in instructions_lower)
+            # One scan finds instruction patterns and equipment together
+            instruction_hits = keywords.scan(instructions_text)
+            pattern_matches = len(instruction_hits.get('instruction', ()))
             score += min(pattern_matches, 3)  # Cap at 3 points
             max_score += 3
             
             # Check equipment mentions
-            equipment_matches = sum(1 for equip in indicators.get('equipment', [])
-                                   if equip in instructions_lower)
+            equipment_matches = len(instruction_hits.get('equipment', ()))
             score += min(equipment_matches, 2)  # Cap at 2 points
             max_score += 2
         
@@ -976,9 +1471,7 @@ class RecipeMatcher4D:
             elif 'ingredients' in recipe:
                 recipe_ingredients = [ing.get('slug', '').lower() for ing in recipe.get('ingredients', [])]
             
-            ingredient_matches = sum(1 for ing in indicators['ingredients'] 
-                                   if any(ing in r_ing for r_ing in recipe_ingredients))
-            if ingredient_matches > 0:
+            if keywords.contains('\n'.join(recipe_ingredients), 'ingredients'):
                 score += 2
             max_score += 2
         
@@ -991,14 +1484,30 @@ class RecipeMatcher4D:
         return False
     
     def _load_dish_type_indicators(self) -> Dict:
-        """Load dish type indicators from config or use defaults"""
-        try:
-            config_path = Path(__file__).parent / "data" / "culinary_config.json"
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                return config.get('dish_type_indicators', self._get_default_dish_type_indicators())
-        except:
-            return self._get_default_dish_type_indicators()
+        """Load dish type indicators from config (via the config registry) or use defaults"""
+        config = config_registry.get('culinary_config.json', {})
+        return config.get('dish_type_indicators', self._get_default_dish_type_indicators())
+    
+    def _compiled_dish_type_matchers(self) -> Dict:
+        """
+        Dish type indicators with one compiled keyword matcher per type
+        (title words, instruction patterns, equipment, ingredients)
+        Rebuilt only when culinary_config.json changes
+        """
+        def build(_):
+            compiled = {}
+            for dish_type, indicators in self._load_dish_type_indicators().items():
+                compiled[dish_type] = dict(
+                    indicators,
+                    keywords=KeywordMatcher({
+                        'title': indicators.get('title_words', []),
+                        'instruction': indicators.get('instruction_patterns', []),
+                        'equipment': indicators.get('equipment', []),
+                        'ingredients': indicators.get('ingredients', []),
+                    })
+                )
+            return compiled
+        return config_registry.derive('culinary_config.json', 'dish_type_matchers', build)
     
     def _get_default_dish_type_indicators(self) -> Dict:
         """Default dish type indicators"""
@@ -1062,54 +1571,433 @@ class RecipeMatcher4D:
             }
         }
     
+    def get_cache_stats(self) -> Dict:
+        """Hit/miss/eviction counters of the result cache plus connection pool reuse"""
+        return {
+            'result_cache': self.result_cache.get_stats(),
+            'connections': self.db.get_stats(),
+            'speculative_ai': self.speculation_ledger.get_stats(),
+            'save_queue': self.save_queue.get_stats(),
+        }
+    
     def find_recipe(self, cuisine: str, ingredients: List[str], dish_type: str, 
                 chef_preference: str = 'traditional',
                 spice_level: str = None,
-                max_cooking_time: str = None) -> Optional[Dict]:
+                max_cooking_time: str = None,
+                deadline: float = None) -> Optional[Dict]:
         """
         4D Recipe Search with LOCAL DATABASE PRIORITY
+        Identical requests are answered from result_cache until it expires or
+        a new recipe is saved for the cuisine (API/AI answers only - see _cacheable)
+        deadline = total seconds for the whole cascade: every level, fetcher call and
+        AI retry stays inside it, and the result carries a 'timing' breakdown
+        """
+        budget = Deadline(deadline) if deadline else None
+        cache_key = normalize_request(cuisine, ingredients, dish_type, spice_level,
+                                      max_cooking_time, chef_preference)
+        with self.tracer.trace('find_recipe', cuisine=cuisine, dish_type=dish_type) as trace:
+            result = self.result_cache.get(cache_key)
+            trace.tag(cached=result is not None)
+            if result is not None:
+                print(f"\n⚡ 4D RECIPE SEARCH (cached): {cuisine} {dish_type} with {ingredients}")
+            else:
+                with use_deadline(budget):
+                    result = self._run_cascade(cuisine, ingredients, dish_type, chef_preference,
+                                               spice_level, max_cooking_time)
+                
+                if self._cacheable(result):
+                    self.result_cache.put(cache_key, result)
+            trace.tag(outcome=self._trace_outcome(result, trace.tags['cached']))
+        return self._with_timing(result, budget)
+    
+    async def find_recipe_async(self, cuisine: str, ingredients: List[str], dish_type: str,
+                                chef_preference: str = 'traditional',
+                                spice_level: str = None,
+                                max_cooking_time: str = None,
+                                deadline: float = None) -> Optional[Dict]:
+        """
+        find_recipe for asyncio callers - same cascade, same result cache
+        API and AI Chef calls are awaited (httpx / ChatCompletion.acreate) and SQLite
+        work runs on _db_executor, so one event loop can hold many cascades in flight
+        (find_recipe stays the blocking entry point for existing callers)
+        """
+        budget = Deadline(deadline) if deadline else None
+        cache_key = normalize_request(cuisine, ingredients, dish_type, spice_level,
+                                      max_cooking_time, chef_preference)
+        with self.tracer.trace('find_recipe', cuisine=cuisine, dish_type=dish_type, mode='async') as trace:
+            result = self.result_cache.get(cache_key)
+            trace.tag(cached=result is not None)
+            if result is not None:
+                print(f"\n⚡ 4D RECIPE SEARCH (cached): {cuisine} {dish_type} with {ingredients}")
+            else:
+                with use_deadline(budget):
+                    result = await self._run_cascade_async(cuisine, ingredients, dish_type, chef_preference,
+                                                           spice_level, max_cooking_time)
+                
+                if self._cacheable(result):
+                    self.result_cache.put(cache_key, result)
+            trace.tag(outcome=self._trace_outcome(result, trace.tags['cached']))
+        return self._with_timing(result, budget)
+    
+    @staticmethod
+    def _cacheable(result: Optional[Dict]) -> bool:
+        """
+        Whether a cascade result may be memoized
+        - a failed generation is transient (AI down) - always retry it
+        - a LOCAL recipe is not: each request re-runs the variety pick and counts times_served
         """
+        return bool(result) and result.get('type') != 'generation_failed' \
+            and result.get('source') != 'local_database'
+    
+    @staticmethod
+    def _trace_outcome(result: Optional[Dict], cached: bool) -> str:
+        if cached:
+            return 'cached'
+        if not result:
+            return 'miss'
+        return 'generation_failed' if result.get('type') == 'generation_failed' else 'hit'
+    
+    def _with_timing(self, result: Optional[Dict], budget: Optional[Deadline]) -> Optional[Dict]:
+        """Result + where the time went (a copy - the cached result stays timing-free)"""
+        if budget is None or not result:
+            return result
+        timing = budget.report()
+        print(f"⏱️ Cascade took {timing['elapsed_s']:.2f}s of {timing['budget_s']:.1f}s: {timing['levels']}")
+        return dict(result, timing=timing)
+    
+    def find_recipes(self, requests: List[Dict]) -> List[Dict]:
+        """
+        Resolve many find_recipe requests in one pass (nightly jobs, regression runs)
+        Each request is a dict of find_recipe arguments (cuisine, ingredients, dish_type, ...)
+        - Identical requests run one cascade and share its result
+        - Requests with the same cuisine + dish type run back-to-back on one worker, so the
+          group reuses the Level 1 candidates, API results and known-empty levels of the first
+        - Different groups run concurrently (batch_concurrency)
+        Returns one {'request', 'recipe', 'elapsed_ms', 'shared', 'error'} per request, in input order
+        """
+        batch_started = time.perf_counter()
+        keys = []
+        unique = {}   # cache key → find_recipe kwargs
+        groups = {}   # (cuisine, dish_type) → cache keys, in first-seen order
+        for request in requests:
+            try:
+                kwargs = self._batch_request_kwargs(request)
+            except (KeyError, TypeError, AttributeError) as e:
+                keys.append(None)
+                print(f"   ⚠️ Skipping invalid batch request {request!r}: {e}")
+                continue
+            key = normalize_request(kwargs['cuisine'], kwargs['ingredients'], kwargs['dish_type'],
+                                    kwargs['spice_level'], kwargs['max_cooking_time'], kwargs['chef_preference'])
+            keys.append(key)
+            if key not in unique:
+                unique[key] = kwargs
+                groups.setdefault((key[0], key[2]), []).append(key)
+        
+        print(f"\n📦 BATCH SEARCH: {len(requests)} requests → {len(unique)} cascades in {len(groups)} groups")
+        
+        outcomes = {}
+        
+        def run_group(group_keys: List[tuple]):
+            for key in group_keys:
+                started = time.perf_counter()
+                try:
+                    recipe, error = self.find_recipe(**unique[key]), None
+                except Exception as e:
+                    recipe, error = None, str(e)
+                    print(f"   ❌ Batch cascade failed for {unique[key]['cuisine']}: {e}")
+                outcomes[key] = (recipe, (time.perf_counter() - started) * 1000, error)
+        
+        for future in [self._batch_executor.submit(run_group, group_keys) for group_keys in groups.values()]:
+            future.result()
+        
+        results = []
+        served = set()
+        for request, key in zip(requests, keys):
+            if key is None:
+                results.append({'request': request, 'recipe': None, 'elapsed_ms': 0.0,
+                                 'shared': False, 'error': 'invalid request'})
+                continue
+            recipe, elapsed_ms, error = outcomes[key]
+            shared = key in served
+            served.add(key)
+            results.append({
+                'request': request,
+                'recipe': copy.deepcopy(recipe) if shared else recipe,
+                'elapsed_ms': round(elapsed_ms, 1),
+                'shared': shared,
+                'error': error
+            })
+        
+        print(f"📦 Batch done in {time.perf_counter() - batch_started:.2f}s")
+        return results
+    
+    def _batch_request_kwargs(self, request: Dict) -> Dict:
+        """find_recipe keyword arguments of one batch request (cuisine is required)"""
+        if not request['cuisine']:
+            raise KeyError('cuisine')
+        return {
+            'cuisine': request['cuisine'],
+            'ingredients': list(request.get('ingredients') or []),
+            'dish_type': request.get('dish_type') or 'any',
+            'chef_preference': request.get('chef_preference') or 'traditional',
+            'spice_level': request.get('spice_level'),
+            'max_cooking_time': request.get('max_cooking_time'),
+        }
+    
+    def _run_cascade(self, cuisine: str, ingredients: List[str], dish_type: str,
+                     chef_preference: str = 'traditional',
+                     spice_level: str = None,
+                     max_cooking_time: str = None) -> Optional[Dict]:
+        """The full Level 1 → Level 4 cascade (uncached)"""
         print(f"\n🎯 4D RECIPE SEARCH: {cuisine} {dish_type} with {ingredients}")
         print(f"👨‍🍳 Chef preference: {chef_preference}")
         self.chef_preference = chef_preference
-        cuisine_lower = cuisine.lower().strip()
-        
+
         # Reset tracking
         self.sister_countries_tried = []
-        
+        _cascade_trace.set(CascadeTrace())
+
         # NEW LEVEL 1: Search LOCAL RecipeGen database FIRST!
-        if self.local_db_available:
-            print("📚 LEVEL 1: Searching LOCAL RecipeGen database...")
-            local_recipe = self._search_local_database(cuisine_lower, ingredients, dish_type,
-                                          spice_level, max_cooking_time)
-            
-            if local_recipe:
-                # Validate cuisine match
-                recipe_cuisine = local_recipe.get('cuisine', '').lower().strip()
-                if recipe_cuisine == cuisine_lower:
-                    return local_recipe
+        with self._level('level1'):
+            local_recipe = self._search_level1(cuisine, ingredients, dish_type, spice_level, max_cooking_time)
+            if not local_recipe:
+                # Closest local recipe (any dish type) - saves the paid API calls of Levels 2-3
+                local_recipe = self._near_match_tier(cuisine, ingredients, max_cooking_time)
+        if local_recipe:
+            return self._resolved(cuisine, dish_type, 1, local_recipe)
+
+        # APIs rarely deliver for this cuisine/dish type → AI Chef starts now, in parallel
+        speculative_ai = self._start_speculative_ai(cuisine, dish_type, ingredients)
+        try:
+            # LEVELS 2-3 in the order (and selection) learned for this cuisine/dish type
+            for level in self._route(cuisine, dish_type):
+                if level == 2:
+                    recipe = self._run_level2(cuisine, ingredients, dish_type)
                 else:
-                    print(f"❌ Cuisine mismatch: wanted '{cuisine}', got '{recipe_cuisine}' - continuing search")
-        
-        # LEVEL 2: Search ALL APIs with regional mapping
+                    recipe = self._run_level3(cuisine, ingredients, dish_type, spice_level, max_cooking_time)
+                if recipe:
+                    return self._resolved(cuisine, dish_type, level, recipe)
+
+            # LEVEL 4: Generate REAL recipe with AI
+            if speculative_ai is None and self._out_of_time('level4', self.ai_chef.min_attempt_seconds):
+                return self._resolved(cuisine, dish_type, 4, self._generation_failed(cuisine, dish_type, ingredients))
+            print(f"\n🤖 LEVEL 4: Generating REAL recipe with AI Chef...")
+
+            try:
+                # AI Chef should ALWAYS generate something real
+                with self._level('level4'):
+                    if speculative_ai is not None:
+                        ai_recipe = speculative_ai.take(timeout=time_left())
+                    else:
+                        ai_recipe = self._generate_ai(cuisine, dish_type, self._ai_ingredient_names(ingredients))
+                if self._accept_ai_recipe(ai_recipe, cuisine, dish_type):
+                    # Save to database for future use
+                    self._save_to_local_db(ai_recipe)
+
+                    # Add alternatives for user
+                    ai_recipe['alternatives'] = self._alternatives_within_budget(cuisine, dish_type, ingredients)
+
+                    return self._resolved(cuisine, dish_type, 4, ai_recipe)
+
+            except Exception as e:
+                print(f"   ❌ AI Chef error: {str(e)}")
+                import traceback
+                traceback.print_exc()
+
+            return self._resolved(cuisine, dish_type, 4, self._generation_failed(cuisine, dish_type, ingredients))
+        finally:
+            if speculative_ai is not None:
+                speculative_ai.settle()
+
+    def _run_level2(self, cuisine: str, ingredients: List[str], dish_type: str) -> Optional[Dict]:
+        """LEVEL 2: Search ALL APIs with regional mapping"""
+        if self._out_of_time('level2'):
+            return None
+        with self._level('level2'):
+            for cuisine_term in self._level2_cuisine_terms(cuisine, ingredients):
+                api_recipe = self._search_all_apis(cuisine_term, ingredients, dish_type, "primary")
+                if api_recipe:
+                    self._save_to_local_db(api_recipe)
+                    return api_recipe
+        return None
+
+    def _run_level3(self, cuisine: str, ingredients: List[str], dish_type: str,
+                    spice_level: str = None, max_cooking_time: str = None) -> Optional[Dict]:
+        """LEVEL 3: Try sister countries across LOCAL DB + ALL APIs"""
+        if self._out_of_time('level3'):
+            return None
+        with self._level('level3'):
+            compatible_sisters = self._compatible_sister_countries(cuisine, ingredients)
+            if compatible_sisters:
+                # Local DB for every sister at once, then APIs with bounded concurrency
+                return self._search_sister_countries(compatible_sisters, ingredients, dish_type,
+                                                     spice_level, max_cooking_time)
+        return None
+
+    def _route(self, cuisine: str, dish_type: str) -> List[int]:
+        """Levels 2/3 to run after a Level 1 miss (both, in order, when routing is off)"""
+        if not self.learned_routing:
+            return [2, 3]
+        route = self.outcome_predictor.route(cuisine, dish_type)
+        if route != [2, 3]:
+            skipped = [f"level{level}" for level in (2, 3) if level not in route]
+            print(f"   🧭 Learned route for {cuisine} {dish_type}: "
+                  f"{' → '.join(f'level{level}' for level in route) or 'straight to level4'}"
+                  f"{f' (skipping {skipped})' if skipped else ''}")
+        return route
+
+    def _resolved(self, cuisine: str, dish_type: str, level: int, result: Optional[Dict]) -> Optional[Dict]:
+        """Book the levels this cascade ran and the one that answered (routing + speculative AI)"""
+        tag_trace(level=level)
+        trace = _cascade_trace.get()
+        if trace is None:
+            self.outcome_predictor.record(cuisine, dish_type, level)
+        else:
+            trace.resolved(level, hit=bool(result) and result.get('type') != 'generation_failed')
+            self.outcome_predictor.record_trace(cuisine, dish_type, trace)
+        if self.outcome_predictor.pending() >= self.outcome_flush_every:
+            self.flush_outcomes()
+        return result
+
+    def flush_outcomes(self) -> int:
+        """Write the cascade statistics gathered since the last flush to cascade_level_stats"""
+        if not self.local_db_available:
+            return 0
+        try:
+            with self.db.writer() as conn:
+                return self.outcome_predictor.flush(conn)
+        except Exception as e:
+            print(f"   ⚠️ Could not save cascade statistics: {e}")
+            return 0
+
+    def get_metrics(self) -> Dict:
+        """Latency histograms (p50/p95/p99) per cascade level, provider, sister country, DB query and AI call"""
+        return self.tracer.get_metrics()
+    
+    def get_routing_table(self) -> Dict:
+        """Learned per cuisine/dish type level statistics and the route each one gets"""
+        self.local_db_available  # Loads the persisted statistics on a fresh matcher
+        return self.outcome_predictor.get_stats()
+
+    def _count_api_call(self):
+        trace = _cascade_trace.get()
+        if trace is not None:
+            trace.count_api_call()
+
+    def _should_speculate(self, cuisine: str, dish_type: str) -> bool:
+        if not self.speculative_ai:
+            return False
+        probability = self.outcome_predictor.api_hit_probability(cuisine, dish_type)
+        if probability is None or probability >= self.speculative_ai_threshold:
+            return False
+        print(f"   🏎️ APIs answer {cuisine} {dish_type} only {probability:.0%} of the time - "
+              f"starting AI Chef alongside Levels 2-3")
+        return True
+
+    def _speculative_budget(self) -> Optional[float]:
+        """The AI Chef runs beside the levels, so it gets what's left overall, not a level slice"""
+        deadline = current_deadline()
+        return deadline.total_remaining() if deadline is not None else None
+
+    def _start_speculative_ai(self, cuisine: str, dish_type: str,
+                              ingredients: List[str]) -> Optional[SpeculativeCall]:
+        if not self._should_speculate(cuisine, dish_type):
+            return None
+        future = self._submit(self._ai_executor, self._generate_within, self._speculative_budget(),
+                              cuisine, dish_type, self._ai_ingredient_names(ingredients))
+        return SpeculativeCall(future, self.speculation_ledger,
+                               keep=partial(self._keep_speculative_recipe, cuisine, dish_type))
+
+    def _keep_speculative_recipe(self, cuisine: str, dish_type: str, ai_recipe: Optional[Dict]) -> bool:
+        """A speculative AI recipe that lost to a higher level still goes into the local database"""
+        if not self._accept_ai_recipe(ai_recipe, cuisine, dish_type):
+            return False
+        self._save_to_local_db(ai_recipe)
+        return True
+
+    def _generate_within(self, budget: Optional[float], cuisine: str, dish_type: str,
+                         ingredient_names: List[str]) -> Dict:
+        with use_deadline(Deadline(budget) if budget is not None else None):
+            return self._generate_ai(cuisine, dish_type, ingredient_names)
+
+    async def _generate_within_async(self, budget: Optional[float], cuisine: str, dish_type: str,
+                                     ingredient_names: List[str]) -> Dict:
+        with use_deadline(Deadline(budget) if budget is not None else None):
+            return await self._generate_ai_async(cuisine, dish_type, ingredient_names)
+    
+    @traced('ai.generate')
+    def _generate_ai(self, cuisine: str, dish_type: str, ingredient_names: List[str]) -> Dict:
+        return self.ai_chef.generate_recipe(cuisine, dish_type, ingredient_names)
+    
+    @traced('ai.generate')
+    async def _generate_ai_async(self, cuisine: str, dish_type: str, ingredient_names: List[str]) -> Dict:
+        return await self.ai_chef.generate_recipe_async(cuisine, dish_type, ingredient_names)
+
+    def _search_level1(self, cuisine: str, ingredients: List[str], dish_type: str,
+                       spice_level: str = None, max_cooking_time: str = None) -> Optional[Dict]:
+        """Level 1 with its known-empty memo; only a recipe of the requested cuisine counts"""
+        if not self.local_db_available:
+            return None
+        cuisine_lower = cuisine.lower().strip()
+        local_empty_key = ('local', cuisine_lower, tuple(sorted(ingredients)), dish_type,
+                           spice_level, max_cooking_time)
+        if self.result_cache.is_known_empty(local_empty_key):
+            print("📚 LEVEL 1: LOCAL database already came back empty for this query - skipping")
+            return None
+
+        print("📚 LEVEL 1: Searching LOCAL RecipeGen database...")
+        try:
+            local_recipe = self._find_local_recipe(cuisine_lower, ingredients, dish_type,
+                                                   spice_level, max_cooking_time)
+        except Exception as e:
+            # A failed search is not an empty one - don't hide Level 1 for the negative TTL
+            print(f"   ❌ Error searching local database: {e}")
+            return None
+        if not local_recipe:
+            self.result_cache.record_empty(local_empty_key, cuisine_lower)
+            return None
+
+        # Validate cuisine match
+        recipe_cuisine = local_recipe.get('cuisine', '').lower().strip()
+        if recipe_cuisine == cuisine_lower:
+            return local_recipe
+        print(f"❌ Cuisine mismatch: wanted '{cuisine}', got '{recipe_cuisine}' - continuing search")
+        return None
+
+    def _near_match_tier(self, cuisine: str, ingredients: List[str],
+                         max_cooking_time: str = None) -> Optional[Dict]:
+        """Near match in the requested cuisine, tried when Level 1 found nothing (before any API)"""
+        if not self.near_match_search or not self.local_db_available:
+            return None
+        try:
+            return self._search_near_match(cuisine.lower().strip(), ingredients, max_cooking_time)
+        except Exception as e:
+            print(f"   ⚠️ Near-match search failed: {e}")
+            return None
+
+    def _level2_cuisine_terms(self, cuisine: str, ingredients: List[str]) -> List[str]:
+        """
+        Cuisine names Level 2 asks the APIs for, in order:
+        the exact cuisine (if the APIs know it), then its Spoonacular mapping
+        (if different and the ingredients fit)
+        """
         print("\n🌍 LEVEL 2: Multi-API search with regional mapping...")
+        cuisine_lower = cuisine.lower().strip()
+        terms = []
 
         # FIRST: Try exact cuisine name without mapping
         print(f"   Trying exact cuisine: '{cuisine}'")
 
         # Check if this cuisine is even supported by the APIs
         # If not directly supported, skip to mapping phase
-        known_spoonacular_cuisines = ['african', 'american', 'british', 'cajun', 'caribbean', 'chinese', 
-                                    'eastern european', 'european', 'french', 'german', 'greek', 
-                                    'indian', 'irish', 'italian', 'japanese', 'jewish', 'korean', 
-                                    'latin american', 'mediterranean', 'mexican', 'middle eastern', 
+        known_spoonacular_cuisines = ['african', 'american', 'british', 'cajun', 'caribbean', 'chinese',
+                                    'eastern european', 'european', 'french', 'german', 'greek',
+                                    'indian', 'irish', 'italian', 'japanese', 'jewish', 'korean',
+                                    'latin american', 'mediterranean', 'mexican', 'middle eastern',
                                     'nordic', 'southern', 'spanish', 'thai', 'vietnamese']
 
         if cuisine.lower() in known_spoonacular_cuisines:
-            exact_recipe = self._search_all_apis(cuisine, ingredients, dish_type, "primary")
-            if exact_recipe:
-                self._save_to_local_db(exact_recipe)
-                return exact_recipe
+            terms.append(cuisine)
         else:
             print(f"   ❌ '{cuisine}' not directly supported by APIs - skipping to mapping")
 
@@ -1120,63 +2008,36 @@ class RecipeMatcher4D:
             if self._ingredients_compatible_with_country(ingredients, cuisine_lower):
                 print(f"   ✓ Mapping '{cuisine}' → '{spoon_cuisine}'")
                 print(f"   ✓ Ingredients compatible with {spoon_cuisine}")
-                
-                api_recipe = self._search_all_apis(spoon_cuisine, ingredients, dish_type, "primary")
-                if api_recipe:
-                    self._save_to_local_db(api_recipe)
-                    return api_recipe
+                terms.append(spoon_cuisine)
             else:
                 print(f"   ❌ Ingredients not compatible with {spoon_cuisine} cuisine")
         else:
             print(f"   ❌ No different cuisine mapping found for '{cuisine}'")
-        
-        # LEVEL 3: Try sister countries across LOCAL DB + ALL APIs
+        return terms
+
+    def _compatible_sister_countries(self, cuisine: str, ingredients: List[str]) -> List[str]:
+        """Level 3 candidates: countries of the same region the ingredients fit (records sister_countries_tried)"""
         print("\n🌐 LEVEL 3: Searching sister countries...")
+        cuisine_lower = cuisine.lower().strip()
         region = self._get_region_for_country(cuisine_lower)
-        
-        if region:
-            print(f"   ✓ Found region: {region.get('name', 'Unknown')}")
-            sister_countries = [c for c in region.get('countries', []) if c != cuisine_lower]
-            
-            # Find compatible sisters
-            compatible_sisters = []
-            for sister in sister_countries:
-                if self._ingredients_compatible_with_country(ingredients, sister):
-                    compatible_sisters.append(sister)
-            
-            if compatible_sisters:
-                print(f"   ✓ Compatible sister countries: {compatible_sisters[:5]}...")
-                self.sister_countries_tried = compatible_sisters[:5]
-                
-                # Try each compatible sister in LOCAL DB first
-                for sister in compatible_sisters:
-                    # Try local database first
-                    if self.local_db_available:
-                        print(f"\n   🔄 Trying sister country in LOCAL DB: {sister}")
-                        local_sister = self._search_local_database(sister, ingredients, dish_type, spice_level, max_cooking_time)
-                        if local_sister:
-                            local_sister['note'] = f"Similar {sister.title()} recipe"
-                            return local_sister
-                    
-                    # Then try APIs
-                    sister_spoon = self.country_to_spoonacular.get(sister)
-                    if sister_spoon:
-                        print(f"   🔄 Trying sister country in APIs: {sister} ({sister_spoon})")
-                        
-                        api_recipe = self._search_all_apis(sister_spoon, ingredients, dish_type, "sister")
-                        if api_recipe:
-                            api_recipe['note'] = f"Similar {sister.title()} recipe"
-                            self._save_to_local_db(api_recipe)
-                            return api_recipe
-            else:
-                print(f"   ❌ No compatible sister countries found")
-        else:
+
+        if not region:
             print(f"   ❌ No regional mapping found for '{cuisine}'")
-        
-        # LEVEL 4: Generate REAL recipe with AI
-        print(f"\n🤖 LEVEL 4: Generating REAL recipe with AI Chef...")
-        
-        # Build proper ingredient list for AI
+            return []
+
+        print(f"   ✓ Found region: {region.get('name', 'Unknown')}")
+        # One AND + popcount per sister against the request's ingredient bitset
+        compatible_sisters = self._culinary_graph().compatible_sisters(cuisine_lower, ingredients)
+
+        if compatible_sisters:
+            print(f"   ✓ Compatible sister countries: {compatible_sisters[:5]}...")
+            self.sister_countries_tried = compatible_sisters[:5]
+        else:
+            print(f"   ❌ No compatible sister countries found")
+        return compatible_sisters
+
+    def _ai_ingredient_names(self, ingredients: List[str]) -> List[str]:
+        """Build proper ingredient list for AI"""
         ingredient_names = []
         for ing in ingredients:
             # Get actual ingredient names from our data
@@ -1187,38 +2048,27 @@ class RecipeMatcher4D:
             else:
                 # If not found in data, use the slug cleaned up
                 ingredient_names.append(ing.replace('_', ' ').title())
-        
-        try:
-            # AI Chef should ALWAYS generate something real
-            ai_recipe = self.ai_chef.generate_recipe(cuisine, dish_type, ingredient_names)
-            
-            if ai_recipe and 'instructions' in ai_recipe and len(ai_recipe.get('instructions', [])) > 4:
-                print(f"   ✅ Our Recipe generated: {ai_recipe.get('title', 'Our Recipe')}")
-                
-                # Ensure all required fields
-                ai_recipe['cuisine'] = cuisine
-                ai_recipe['dish_type'] = dish_type
-                ai_recipe['source'] = 'ai_chef'
-                ai_recipe['source_api'] = 'Our Recipe'
-                
-                # Save to database for future use
-                self._save_to_local_db(ai_recipe)
-                
-                # Add alternatives for user
-                ai_recipe['alternatives'] = self._generate_smart_alternatives(cuisine, dish_type, ingredients)
-                
-                return ai_recipe
-                
-        except Exception as e:
-            print(f"   ❌ AI Chef error: {str(e)}")
-            import traceback
-            traceback.print_exc()
-        
+        return ingredient_names
+
+    def _accept_ai_recipe(self, ai_recipe: Optional[Dict], cuisine: str, dish_type: str) -> bool:
+        """Is the AI Chef's answer a real recipe? Fills in the required fields if so"""
+        if not (ai_recipe and 'instructions' in ai_recipe and len(ai_recipe.get('instructions', [])) > 4):
+            return False
+        print(f"   ✅ Our Recipe generated: {ai_recipe.get('title', 'Our Recipe')}")
+
+        # Ensure all required fields
+        ai_recipe['cuisine'] = cuisine
+        ai_recipe['dish_type'] = dish_type
+        ai_recipe['source'] = 'ai_chef'
+        ai_recipe['source_api'] = 'Our Recipe'
+        return True
+
+    def _generation_failed(self, cuisine: str, dish_type: str, ingredients: List[str]) -> Dict:
         # This should NEVER happen - AI should always work
         # But if it does, we MUST return something
         print("   🆘 CRITICAL: AI Chef failed - this should not happen!")
         print("   🆘 Check OpenAI API key and connection")
-        
+
         # Return error state that main.py can handle
         return {
             'type': 'generation_failed',
@@ -1226,86 +2076,464 @@ class RecipeMatcher4D:
             'cuisine': cuisine,
             'dish_type': dish_type,
             'ingredients': ingredients,
-            'alternatives': self._generate_smart_alternatives(cuisine, dish_type, ingredients)
+            'alternatives': self._alternatives_within_budget(cuisine, dish_type, ingredients)
         }
+    
+    def _submit(self, executor: ThreadPoolExecutor, func, *args):
+        """executor.submit that carries the caller's cascade state (deadline, sisters tried) along"""
+        return executor.submit(copy_context().run, func, *args)
+    
+    @contextmanager
+    def _level(self, name: str):
+        """Budget slice of a cascade level (no slice without a deadline), timed into the cascade trace and a span"""
+        trace = _cascade_trace.get()
+        level = CASCADE_LEVELS.get(name)
+        deadline = current_deadline()
+        reserve = 0.0 if name == 'level4' else self.ai_reserve_seconds
+        with span(name), trace.level(level) if trace is not None and level is not None else nullcontext():
+            with deadline.level(name, self.level_budget_shares.get(name), reserve) if deadline else nullcontext():
+                yield
+    
+    def _out_of_time(self, name: str, needed: float = None) -> bool:
+        """Less than `needed` seconds (default: the AI Chef's reserve) left - skip this level"""
+        deadline = current_deadline()
+        needed = self.ai_reserve_seconds if needed is None else needed
+        if deadline is None or deadline.total_remaining() > needed:
+            return False
+        print(f"⏱️ {deadline.total_remaining():.1f}s left - skipping {name}")
+        deadline.skip(name)
+        return True
+    
+    def _alternatives_within_budget(self, cuisine: str, dish_type: str, ingredients: List[str]) -> List[Dict]:
+        """Smart alternatives, unless the deadline is (almost) used up"""
+        if self._out_of_time('alternatives', self.alternatives_min_seconds):
+            return []
+        with self._level('alternatives'):
+            return self._generate_smart_alternatives(cuisine, dish_type, ingredients)
 
     
+    async def _run_cascade_async(self, cuisine: str, ingredients: List[str], dish_type: str,
+                                 chef_preference: str = 'traditional',
+                                 spice_level: str = None,
+                                 max_cooking_time: str = None) -> Optional[Dict]:
+        """_run_cascade with every network call awaited and every SQLite call off the loop"""
+        print(f"\n🎯 4D RECIPE SEARCH (async): {cuisine} {dish_type} with {ingredients}")
+        print(f"👨‍🍳 Chef preference: {chef_preference}")
+        self.chef_preference = chef_preference
+        self.sister_countries_tried = []
+        _cascade_trace.set(CascadeTrace())
+        
+        # LEVEL 1: LOCAL database
+        with self._level('level1'):
+            local_recipe = await self._run_blocking(self._db_executor, self._search_level1, cuisine, ingredients,
+                                                    dish_type, spice_level, max_cooking_time)
+            if not local_recipe:
+                local_recipe = await self._run_blocking(self._db_executor, self._near_match_tier, cuisine,
+                                                        ingredients, max_cooking_time)
+        if local_recipe:
+            return await self._resolved_async(cuisine, dish_type, 1, local_recipe)
+        
+        # APIs rarely deliver for this cuisine/dish type → AI Chef task starts now
+        speculative_ai = None
+        if self._should_speculate(cuisine, dish_type):
+            speculative_ai = SpeculativeCall(
+                asyncio.ensure_future(self._generate_within_async(self._speculative_budget(), cuisine, dish_type,
+                                                                  self._ai_ingredient_names(ingredients))),
+                self.speculation_ledger, keep=partial(self._keep_speculative_recipe, cuisine, dish_type))
+        try:
+            # LEVELS 2-3 in the learned order
+            for level in self._route(cuisine, dish_type):
+                if level == 2:
+                    recipe = await self._run_level2_async(cuisine, ingredients, dish_type)
+                else:
+                    recipe = await self._run_level3_async(cuisine, ingredients, dish_type, spice_level,
+                                                          max_cooking_time)
+                if recipe:
+                    return await self._resolved_async(cuisine, dish_type, level, recipe)
+            
+            # LEVEL 4: AI Chef
+            if speculative_ai is None and self._out_of_time('level4', self.ai_chef.min_attempt_seconds):
+                failed = await self._run_blocking(None, self._generation_failed, cuisine, dish_type, ingredients)
+                return await self._resolved_async(cuisine, dish_type, 4, failed)
+            print(f"\n🤖 LEVEL 4: Generating REAL recipe with AI Chef...")
+            try:
+                with self._level('level4'):
+                    if speculative_ai is not None:
+                        ai_recipe = await speculative_ai.take_async(timeout=time_left())
+                    else:
+                        ai_recipe = await self._generate_ai_async(cuisine, dish_type,
+                                                                  self._ai_ingredient_names(ingredients))
+                if self._accept_ai_recipe(ai_recipe, cuisine, dish_type):
+                    self._save_to_local_db(ai_recipe)
+                    ai_recipe['alternatives'] = await self._run_blocking(None, self._alternatives_within_budget,
+                                                                         cuisine, dish_type, ingredients)
+                    return await self._resolved_async(cuisine, dish_type, 4, ai_recipe)
+            except Exception as e:
+                print(f"   ❌ AI Chef error: {str(e)}")
+                import traceback
+                traceback.print_exc()
+            
+            failed = await self._run_blocking(None, self._generation_failed, cuisine, dish_type, ingredients)
+            return await self._resolved_async(cuisine, dish_type, 4, failed)
+        finally:
+            if speculative_ai is not None:
+                speculative_ai.settle()
+    
+    async def _run_level2_async(self, cuisine: str, ingredients: List[str], dish_type: str) -> Optional[Dict]:
+        """LEVEL 2: APIs (exact cuisine, then its mapping)"""
+        if self._out_of_time('level2'):
+            return None
+        with self._level('level2'):
+            for cuisine_term in self._level2_cuisine_terms(cuisine, ingredients):
+                api_recipe = await self._search_all_apis_async(cuisine_term, ingredients, dish_type, "primary")
+                if api_recipe:
+                    self._save_to_local_db(api_recipe)
+                    return api_recipe
+        return None
+    
+    async def _run_level3_async(self, cuisine: str, ingredients: List[str], dish_type: str,
+                                spice_level: str = None, max_cooking_time: str = None) -> Optional[Dict]:
+        """LEVEL 3: Sister countries"""
+        if self._out_of_time('level3'):
+            return None
+        with self._level('level3'):
+            compatible_sisters = await self._run_blocking(None, self._compatible_sister_countries,
+                                                          cuisine, ingredients)
+            if compatible_sisters:
+                return await self._search_sister_countries_async(compatible_sisters, ingredients, dish_type,
+                                                                 spice_level, max_cooking_time)
+        return None
+    
+    async def _resolved_async(self, cuisine: str, dish_type: str, level: int,
+                              result: Optional[Dict]) -> Optional[Dict]:
+        """_resolved off the loop - every outcome_flush_every cascades it writes cascade_level_stats"""
+        return await self._run_blocking(self._db_executor, self._resolved, cuisine, dish_type, level, result)
+    
+    async def _run_blocking(self, executor, func, *args, **kwargs):
+        """Run a blocking call in `executor` (None = loop default), keeping this task's cascade state"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(copy_context().run, func, *args, **kwargs))
+    
+    async def _fetcher_call(self, fetcher, method: str, *args, **kwargs):
+        """fetcher.<method>_async when the provider has one, otherwise the blocking call in a thread"""
+        self._count_api_call()
+        async_method = getattr(fetcher, f'{method}_async', None)
+        if async_method is not None:
+            return await async_method(*args, **kwargs)
+        return await self._run_blocking(self._detail_executor, getattr(fetcher, method), *args, **kwargs)
+    
+    async def _search_all_apis_async(self, cuisine_term: str, ingredients: List[str],
+                                     dish_type: str = None,
+                                     search_type: str = "primary") -> Optional[Dict]:
+        """
+        _search_all_apis for the event loop: one task per provider, same priority rule,
+        api_provider_timeout and negative cache as the threaded fan-out
+        """
+        empty_key = ('api', cuisine_term.lower().strip(), tuple(sorted(ingredients)), dish_type)
+        if self.result_cache.is_known_empty(empty_key):
+            print(f"\n   ⏭️ APIs already came back empty for '{cuisine_term}' + {ingredients} - skipping")
+            return None
+        
+        print(f"\n   🌐 Searching {len(self.sorted_providers)} API providers concurrently...")
+        loop = asyncio.get_running_loop()
+        failures = []
+        started = loop.time()
+        provider_timeout = time_left(self.api_provider_timeout)
+        pending = [
+            (provider_info['name'],
+             asyncio.ensure_future(self._search_provider_async(provider_info, cuisine_term, ingredients,
+                                                               dish_type, failures)))
+            for provider_key, provider_info in self.sorted_providers
+        ]
+        
+        result = None
+        try:
+            # Walk in priority order - a lower-priority hit only counts once everyone above it missed
+            for provider_name, task in pending:
+                remaining = max(0.0, started + provider_timeout - loop.time())
+                done, _ = await asyncio.wait({task}, timeout=remaining)
+                if not done:
+                    print(f"         ⏱️ {provider_name} timed out after {provider_timeout:.1f}s")
+                    failures.append(provider_name)
+                    continue
+                try:
+                    result = task.result()
+                except Exception as e:
+                    print(f"         ⚠️ Error with {provider_name}: {str(e)}")
+                    failures.append(provider_name)
+                    continue
+                if result:
+                    break
+        finally:
+            for provider_name, task in pending:
+                task.cancel()
+        
+        if result is None and not failures:
+            self.result_cache.record_empty(empty_key, cuisine_term)
+        return result
+    
+    async def _search_provider_async(self, provider_info: Dict, cuisine_term: str, ingredients: List[str],
+                                     dish_type: str, failures: List[str] = None) -> Optional[Dict]:
+        """One provider: search, then details for api_detail_fanout quality summaries at a time"""
+        fetcher = provider_info['fetcher']
+        provider_name = provider_info['name']
+        
+        print(f"\n      📡 Trying {provider_name}...")
+        with span('provider.search', provider=provider_name) as search:
+            results = await self._fetcher_call(fetcher, 'search_recipes', cuisine_term, ingredients, number=10)
+            search.tag(outcome='hit' if results.get('results') else 'miss')
+        if not results.get('results'):
+            return None
+        print(f"         {provider_name} returned: {len(results['results'])} recipes")
+        
+        summaries = [r for r in results['results'] if fetcher.is_quality_recipe(r)]
+        batch_size = max(1, self.api_detail_fanout)
+        
+        for start in range(0, len(summaries), batch_size):
+            batch = [
+                asyncio.ensure_future(self._check_api_candidate_async(fetcher, provider_name, summary,
+                                                                      cuisine_term, ingredients, dish_type))
+                for summary in summaries[start:start + batch_size]
+            ]
+            try:
+                for task in batch:
+                    try:
+                        formatted = await task
+                    except Exception as e:
+                        print(f"      ⚠️ Detail fetch failed on {provider_name}: {e}")
+                        if failures is not None:
+                            failures.append(provider_name)
+                        continue
+                    if formatted:
+                        return formatted
+            finally:
+                for task in batch:
+                    task.cancel()
+        
+        return None
+    
+    @traced('provider.details', tags=lambda self, fetcher, provider_name, *args, **kwargs: {'provider': provider_name})
+    async def _check_api_candidate_async(self, fetcher, provider_name: str, recipe_summary: Dict,
+                                         cuisine_term: str, ingredients: List[str],
+                                         dish_type: str = None) -> Optional[Dict]:
+        full_recipe = await self._fetcher_call(fetcher, 'get_recipe_details', recipe_summary['id'])
+        return self._validate_api_candidate(fetcher, provider_name, recipe_summary, full_recipe,
+                                            cuisine_term, ingredients, dish_type)
+    
+    async def _search_sister_countries_async(self, sisters: List[str], ingredients: List[str], dish_type: str,
+                                             spice_level: str = None,
+                                             max_cooking_time: str = None) -> Optional[Dict]:
+        """
+        _search_sister_countries on the event loop: same preference order
+        (local s1, API s1, local s2, ...), sister_api_concurrency API searches at a time
+        """
+        local_results = [None] * len(sisters)
+        if self.local_db_available:
+            print(f"\n   🔄 Trying {len(sisters)} sister countries in LOCAL DB at once...")
+            gathered = await asyncio.gather(*[
+                self._run_blocking(self._db_executor, call_in_span, 'sister.local', {'country': sister},
+                                   self._search_local_database, sister, ingredients, dish_type, spice_level,
+                                   max_cooking_time, False)
+                for sister in sisters
+            ], return_exceptions=True)
+            for sister, found in zip(sisters, gathered):
+                if isinstance(found, Exception):
+                    print(f"   ⚠️ Local search failed for {sister}: {found}")
+            local_results = [None if isinstance(found, Exception) else found for found in gathered]
+        
+        # Only sisters BEFORE the first local hit can still beat it
+        first_local_hit = next((i for i, r in enumerate(local_results) if r), len(sisters))
+        
+        # Sisters sharing a Spoonacular cuisine share one API search
+        limit = asyncio.Semaphore(max(1, self.sister_api_concurrency))
+        
+        async def search_sister_apis(sister_spoon: str):
+            async with limit:
+                with span('sister.api', country=sister_spoon) as search:
+                    result = await self._search_all_apis_async(sister_spoon, ingredients, dish_type, "sister")
+                    search.tag(outcome='hit' if result else 'miss')
+                    return result
+        
+        api_tasks = {}
+        for sister in sisters[:first_local_hit]:
+            sister_spoon = self.country_to_spoonacular.get(sister)
+            if sister_spoon and sister_spoon not in api_tasks:
+                print(f"   🔄 Trying sister country in APIs: {sister} ({sister_spoon})")
+                api_tasks[sister_spoon] = asyncio.ensure_future(search_sister_apis(sister_spoon))
+        api_outcomes = {}   # sister_spoon → recipe or None
+        
+        try:
+            for index, sister in enumerate(sisters[:first_local_hit + 1]):
+                if index == first_local_hit:
+                    # Every earlier sister missed on both sources
+                    local_sister = local_results[index]
+                    if not local_sister.get('partial_match'):
+                        await self._run_blocking(self._db_executor, self._record_served, local_sister['id'])
+                    local_sister['note'] = f"Similar {sister.title()} recipe"
+                    return local_sister
+                
+                sister_spoon = self.country_to_spoonacular.get(sister)
+                if not sister_spoon:
+                    continue
+                if sister_spoon not in api_outcomes:
+                    # Awaited once per Spoonacular cuisine - a timed-out (cancelled) task is never awaited again
+                    try:
+                        api_outcomes[sister_spoon] = await asyncio.wait_for(api_tasks[sister_spoon], time_left())
+                    except Exception as e:
+                        print(f"   ⚠️ API search failed for {sister}: {e}")
+                        api_outcomes[sister_spoon] = None
+                    api_recipe = api_outcomes[sister_spoon]
+                else:
+                    api_recipe = None  # Already tried (or returned) for an earlier sister
+                if api_recipe:
+                    api_recipe['note'] = f"Similar {sister.title()} recipe"
+                    self._save_to_local_db(api_recipe)
+                    return api_recipe
+            return None
+        finally:
+            for task in api_tasks.values():
+                task.cancel()
+    
     def _save_to_local_db(self, recipe: Dict):
-        """Save API recipe to local database for future use"""
+        """Queue an API/AI recipe for the local database (written by save_queue in the background)"""
         if not self.local_db_available:
             return
         
-        try:
-            conn = sqlite3.connect(self.db_path, timeout=10)
-            cursor = conn.cursor()
+        # Generate unique ID FIRST
+        if recipe.get('id'):
+            recipe_id = f"{recipe.get('source_api', 'api')}_{recipe.get('id')}"
+        else:
+            # No ID from API, use title + timestamp to ensure uniqueness
+            recipe_id = f"{recipe.get('source_api', 'api')}_{recipe['title'].replace(' ', '_').lower()}_{int(time.time())}"
+        
+        # Shallow copy - the caller goes on to add alternatives/timing to its dict
+        self.save_queue.put(recipe_id, dict(recipe))
+    
+    def flush_saves(self, timeout: float = None) -> bool:
+        """Wait until every queued recipe is in the local database"""
+        return self.save_queue.flush(timeout)
+    
+    def close(self):
+        """Write queued recipes and cascade statistics (runs at interpreter exit too)"""
+        self._backfill_stop.set()
+        self.save_queue.close()
+        self.tracer.close()
+        if self.outcome_predictor.pending():
+            self.flush_outcomes()
+    
+    def _write_recipes(self, batch: List[tuple]):
+        """
+        Insert a batch of queued (recipe_id, recipe) in ONE transaction:
+        recipes already in the database are skipped, rows go in with executemany,
+        then the ingredient index and result cache learn about the new recipes
+        """
+        ids_json = json.dumps([recipe_id for recipe_id, _ in batch])
+        recipe_rows = []
+        ingredient_rows = []
+        new_recipes = {}
+        near_match_index = self.near_match_index if lazy_component.is_built(self, 'near_match_index') else None
+        text_search = self.text_search if lazy_component.is_built(self, 'text_search') else None
+        
+        with self.db.writer() as conn:
+            existing = {row[0] for row in conn.execute(
+                "SELECT id FROM recipes WHERE id IN (SELECT value FROM json_each(?))", (ids_json,))}
             
-            # Generate unique ID FIRST
-            import time
-            if recipe.get('id'):
-                recipe_id = f"{recipe.get('source_api', 'api')}_{recipe.get('id')}"
-            else:
-                # No ID from API, use title + timestamp to ensure uniqueness
-                recipe_id = f"{recipe.get('source_api', 'api')}_{recipe['title'].replace(' ', '_').lower()}_{int(time.time())}"
-
-            # THEN check if already exists
-            cursor.execute("SELECT id FROM recipes WHERE id = ?", (recipe_id,))
-            if cursor.fetchone():
-                conn.close()
-                return  # Already in database
-                                
-            # Insert recipe
-            cursor.execute('''
+            for recipe_id, recipe in batch:
+                if recipe_id in existing:
+                    continue  # Already in database
+                ingredient_slugs = self._recipe_ingredient_slugs(recipe)
+                if near_match_index is not None:
+                    duplicate = near_match_index.find_duplicate(ingredient_slugs, recipe.get('title'),
+                                                                recipe.get('cuisine'))
+                    if duplicate:
+                        print(f"   ♻️ Not saving '{recipe.get('title')}' - near-duplicate of {duplicate}")
+                        continue
+                slug_text = ingredient_slug_text(recipe.get('ingredients', []))
+                recipe_rows.append((
+                    recipe_id,
+                    recipe.get('title'),
+                    recipe.get('cuisine', '').lower(),
+                    recipe.get('dish_type', '').lower(),
+                    json.dumps(recipe.get('ingredients', [])),
+                    json.dumps(recipe.get('instructions', [])),
+                    recipe.get('prep_time'),
+                    recipe.get('cook_time'),
+                    recipe.get('total_time'),
+                    recipe.get('servings'),
+                    recipe.get('source_api'),
+                    recipe.get('id'),
+                    recipe.get('source_url'),
+                    recipe.get('image_url'),
+                    recipe.get('quality_score', 60),
+                    recipe.get('verified_dish_type', False),
+                    slug_text,
+                    spice_level_score(recipe.get('title'), slug_text)
+                ))
+                # Insert ingredients for searching
+                for ing, ingredient_slug in zip(recipe.get('ingredients', []), ingredient_slugs):
+                    ingredient_name = ing.get('item') or ing.get('name', '')
+                    ingredient_rows.append((recipe_id, ingredient_slug, ingredient_name, ing.get('amount', '')))
+                new_recipes[recipe_id] = (recipe, ingredient_slugs)
+            
+            if not new_recipes:
+                return
+            conn.executemany('''
                 INSERT INTO recipes (
                     id, title, cuisine, dish_type, ingredients, instructions,
                     prep_time, cook_time, total_time, servings,
                     source, source_id, source_url, image_url,
-                    quality_score, is_verified
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                recipe_id,
-                recipe.get('title'),
-                recipe.get('cuisine', '').lower(),
-                recipe.get('dish_type', '').lower(),
-                json.dumps(recipe.get('ingredients', [])),
-                json.dumps(recipe.get('instructions', [])),
-                recipe.get('prep_time'),
-                recipe.get('cook_time'),
-                recipe.get('total_time'),
-                recipe.get('servings'),
-                recipe.get('source_api'),
-                recipe.get('id'),
-                recipe.get('source_url'),
-                recipe.get('image_url'),
-                recipe.get('quality_score', 60),
-                recipe.get('verified_dish_type', False)
-            ))
-            
-            # Insert ingredients for searching - INDENT THIS PROPERLY!
-            for ing in recipe.get('ingredients', []):
-                # Handle both formats: AI Chef uses 'item', APIs use 'name'/'slug'
-                ingredient_name = ing.get('item') or ing.get('name', '')
-                ingredient_slug = ing.get('slug', '')
-                
-                # If no slug, create one from the name
-                if not ingredient_slug and ingredient_name:
-                    ingredient_slug = ingredient_name.lower().replace(' ', '_')
-                
-                cursor.execute('''
-                    INSERT INTO recipe_ingredients (recipe_id, ingredient_slug, ingredient_name, amount)
-                    VALUES (?, ?, ?, ?)
-                ''', (
-                    recipe_id,
-                    ingredient_slug,
-                    ingredient_name,
-                    ing.get('amount', '')
-                ))
-            
-            conn.commit()
-            conn.close()
-            print(f"   💾 Saved to local database for future use!")
+                    quality_score, is_verified, ingredient_slugs, spice_level_score
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', recipe_rows)
+            conn.executemany('''
+                INSERT INTO recipe_ingredients (recipe_id, ingredient_slug, ingredient_name, amount)
+                VALUES (?, ?, ?, ?)
+            ''', ingredient_rows)
+            save_signatures(conn, self.minhasher, {recipe_id: slugs for recipe_id, (_, slugs) in new_recipes.items()})
+            rowids = dict(conn.execute(
+                "SELECT id, rowid FROM recipes WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(list(new_recipes)),)).fetchall())
+        
+        # Committed - make them visible to Level 1 lookups (an index built later reads them itself)
+        index_built = lazy_component.is_built(self, 'ingredient_index')
+        saved_by_cuisine = {}
+        for recipe_id, (recipe, ingredient_slugs) in new_recipes.items():
+            if index_built and self.ingredient_index is not None:
+                self.ingredient_index.add_recipe(rowids[recipe_id], recipe.get('cuisine', '').lower(),
+                                                 recipe.get('dish_type', '').lower(), ingredient_slugs)
+            if near_match_index is not None:
+                near_match_index.add(recipe_id, ingredient_slugs, recipe.get('cuisine'), recipe.get('title'))
+            if text_search is not None:
+                text_search.add(recipe_id, recipe.get('cuisine', ''), *recipe_text(recipe))
+            saved_by_cuisine.setdefault((recipe.get('cuisine') or '').lower().strip(), set()).add(
+                self._cache_identity(recipe))
+        
+        # ...and forget empty levels and other cached answers for those cuisines - a cached
+        # answer that IS one of the recipes just saved (the usual case: API/AI results) stays
+        for cuisine_key, saved in saved_by_cuisine.items():
+            self.result_cache.invalidate_cuisine(
+                cuisine_key, keep=lambda cached, saved=saved: self._cache_identity(cached) in saved)
+        
+        print(f"   💾 Saved {len(new_recipes)} recipe(s) to local database for future use!")
+    
+    @staticmethod
+    def _cache_identity(recipe: Dict) -> tuple:
+        """Same source, id and title → the same recipe (cached copies carry extra keys)"""
+        return recipe.get('source_api'), recipe.get('id'), recipe.get('title')
+    
+    @staticmethod
+    def _recipe_ingredient_slugs(recipe: Dict) -> List[str]:
+        """recipe_ingredients slugs of a recipe, one per ingredient (AI Chef uses 'item', APIs 'name'/'slug')"""
+        slugs = []
+        for ing in recipe.get('ingredients', []):
+            ingredient_name = ing.get('item') or ing.get('name', '')
+            ingredient_slug = ing.get('slug', '')
             
-        except Exception as e:
-            print(f"   ⚠️ Could not save to local database: {e}")
+            # If no slug, create one from the name
+            if not ingredient_slug and ingredient_name:
+                ingredient_slug = ingredient_name.lower().replace(' ', '_')
+            slugs.append(ingredient_slug)
+        return slugs
     
     def _determine_failure_reason(self, cuisine: str, dish_type: str, ingredients: List[str]) -> str:
         """Analyze why we couldn't find a match"""
@@ -1344,8 +2572,7 @@ class RecipeMatcher4D:
         
         if self.local_db_available:
             try:
-                conn = sqlite3.connect(self.db_path, timeout=10)
-                cursor = conn.cursor()
+                cursor = self.db.read_connection().cursor()
                 
                 # Find what dish types ACTUALLY exist for this cuisine
                 cursor.execute('''
@@ -1373,8 +2600,6 @@ class RecipeMatcher4D:
                     methods_to_try = ['soup', 'stew', 'roast', 'salad']
                     print(f"   📊 No {cuisine} recipes in database yet, using universal dish types")
                 
-                conn.close()
-                
             except Exception as e:
                 print(f"   ⚠️ Could not query dish types: {e}")
                 methods_to_try = ['soup', 'stew', 'roast', 'salad']
@@ -1492,8 +2717,7 @@ class RecipeMatcher4D:
                     
                     if self.local_db_available:
                         try:
-                            conn = sqlite3.connect(self.db_path, timeout=10)
-                            cursor = conn.cursor()
+                            cursor = self.db.read_connection().cursor()
                             # Find most common dish type for this cuisine
                             cursor.execute('''
                                 SELECT dish_type, COUNT(*) as count
@@ -1506,7 +2730,6 @@ class RecipeMatcher4D:
                             result = cursor.fetchone()
                             if result and result[0] not in ['side', 'miscellaneous', 'vegan', 'vegetarian']:
                                 appropriate_dish_type = result[0]
-                            conn.close()
                         except:
                             pass
                     
@@ -1547,25 +2770,8 @@ class RecipeMatcher4D:
         return verified_alternatives
    
     def _get_region_for_country(self, country: str) -> Optional[Dict]:
-       """Get region info for a country from nested structure"""
-       regions = self.culinary_regions.get('regions', {})
-       
-       # Search through regions AND their subregions
-       for region_key, region_data in regions.items():
-           subregions = region_data.get('subregions', {})
-           
-           for subregion_key, subregion_data in subregions.items():
-               if country in subregion_data.get('countries', []):
-                   # Found it! Return subregion info with sister countries
-                   return {
-                       'key': subregion_key,
-                       'name': subregion_data.get('name', subregion_key),
-                       'countries': subregion_data.get('countries', []),
-                       'region': region_key,
-                       'region_name': region_data.get('name', region_key)
-                   }
-       
-       return None
+       """Get region info (subregion + sister countries) for a country - a lookup in the compiled graph"""
+       return self._culinary_graph().region(country)
 
 # Create singleton instance
-recipe_matcher_4d = RecipeMatcher4D()
\ No newline at end of file
+recipe_matcher_4d = LazySingleton(RecipeMatcher4D, 'RecipeMatcher4D')
\ No newline at end of file
@@ -0,0 +1,416 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: recipe_minhash.py
+# * Purpose: MinHash signatures of recipe ingredient sets + LSH index for near matches and duplicates
+# */
+
+"""
+MinHash / LSH over recipe ingredient sets
+recipe_minhash(recipe_id, num_perm, signature BLOB) sits next to recipe_ingredients:
+one signature per recipe, written with every saved or imported recipe
+index = NearMatchIndex().build(conn)
+index.nearest(['chicken', 'tomato', 'lime'], cuisine='mexican')  → [NearMatch, ...] best first
+index.find_duplicate(slugs, title, cuisine)                      → recipe_id or None
+python recipe_minhash.py sign <master.db>           sign recipes that have no signature (offline)
+python recipe_minhash.py benchmark [--recipes N] [--bands B]   synthetic index: candidates and latency
+- BANDS × ROWS = NUM_PERM; two ingredient sets share a bucket with probability
+  1 - (1 - J^ROWS)^BANDS. 16 × 4 puts the threshold near J = 0.5: J = 0.8 → 99.98%,
+  J = 0.5 → 64%, J = 0.3 → 12%, J = 0.2 → 2.5%, so candidate sets stay small
+- Buckets are keyed by cuisine - a query only ever touches its own cuisine's recipes
+- LSH only proposes candidates; they are re-scored exactly on the slug sets kept in memory
+- Buckets follow Jaccard, not containment: a 3-ingredient request against a 10-ingredient
+  recipe that has all three is J = 0.3. RecipeMatcher4D therefore finds near matches for
+  short requests by counting shared ingredients on IngredientIndex posting lists, and asks
+  this index for long ones and for duplicates (the benchmark reports both)
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MINHASH_TABLE = 'recipe_minhash'
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _slug_set(slugs: Iterable[str]) -> frozenset:
+    return frozenset(s for s in (str(slug).lower().strip() for slug in slugs or ()) if s)
+
+
+def _title_words(title: str) -> frozenset:
+    return frozenset(''.join(ch if ch.isalnum() else ' ' for ch in (title or '').lower()).split())
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class MinHasher:
+    """NUM_PERM universal hash functions over crc32 of each slug (stable across processes)"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        self.num_perm = num_perm
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, slugs: Iterable[str]) -> array:
+        base = [zlib.crc32(slug.encode('utf-8')) for slug in _slug_set(slugs)]
+        if not base:
+            return array('I', [_MAX_HASH] * self.num_perm)
+        return array('I', [min(((a * h + b) % _PRIME) & _MAX_HASH for h in base) for a, b in self._perms])
+
+    @staticmethod
+    def estimate(sig_a: array, sig_b: array) -> float:
+        """Estimated Jaccard similarity of the two sets"""
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def ensure_minhash_table(conn: sqlite3.Connection):
+    """Create recipe_minhash if missing (caller commits) - signing is sign_missing's job"""
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {MINHASH_TABLE} (
+            recipe_id TEXT PRIMARY KEY,
+            num_perm INTEGER NOT NULL,
+            signature BLOB NOT NULL
+        )
+    ''')
+
+
+def unsigned_recipes(conn: sqlite3.Connection, hasher: 'MinHasher', after_rowid: int = 0,
+                     limit: int = 500) -> List[Tuple]:
+    """
+    Next `limit` recipes (by rowid, after `after_rowid`) without a current signature:
+    [(rowid, recipe_id, cuisine, title, [slugs]), ...]
+    """
+    rows = conn.execute(f'''
+        SELECT r.rowid, r.id, r.cuisine, r.title,
+               (SELECT group_concat(ri.ingredient_slug, '|') FROM recipe_ingredients ri
+                WHERE ri.recipe_id = r.id)
+        FROM recipes r
+        LEFT JOIN {MINHASH_TABLE} m ON m.recipe_id = r.id
+        WHERE r.rowid > ? AND (m.recipe_id IS NULL OR m.num_perm != ?)
+        ORDER BY r.rowid
+        LIMIT ?
+    ''', (after_rowid, hasher.num_perm, limit)).fetchall()
+    return [(rowid, recipe_id, cuisine, title, (slugs or '').split('|'))
+            for rowid, recipe_id, cuisine, title, slugs in rows]
+
+
+def write_signatures(conn: sqlite3.Connection, hasher: 'MinHasher', signatures: Dict[str, array]):
+    """Store already computed signatures {recipe_id: signature} (caller commits)"""
+    conn.executemany(f"INSERT OR REPLACE INTO {MINHASH_TABLE} (recipe_id, num_perm, signature) VALUES (?, ?, ?)",
+                     [(recipe_id, hasher.num_perm, signature.tobytes())
+                      for recipe_id, signature in signatures.items()])
+
+
+def save_signatures(conn: sqlite3.Connection, hasher: 'MinHasher', recipes: Dict[str, Iterable[str]]):
+    """Store the signatures of freshly inserted recipes {recipe_id: slugs} (caller commits)"""
+    write_signatures(conn, hasher, {recipe_id: hasher.signature(slugs) for recipe_id, slugs in recipes.items()})
+
+
+def sign_missing(conn: sqlite3.Connection, hasher: 'MinHasher', batch_size: int = 1000) -> int:
+    """Sign every recipe without a signature, committing per batch (offline - see the module docstring)"""
+    ensure_minhash_table(conn)
+    signed, after = 0, 0
+    while True:
+        batch = unsigned_recipes(conn, hasher, after, batch_size)
+        if not batch:
+            break
+        write_signatures(conn, hasher, {recipe_id: hasher.signature(slugs)
+                                        for _, recipe_id, _, _, slugs in batch})
+        conn.commit()
+        signed += len(batch)
+        after = batch[-1][0]
+    return signed
+
+
+class NearMatch:
+    """A recipe proposed by LSH, scored exactly"""
+    __slots__ = ('recipe_id', 'jaccard', 'containment', 'shared')
+
+    def __init__(self, recipe_id: str, jaccard: float, containment: float, shared: int):
+        self.recipe_id = recipe_id
+        self.jaccard = jaccard
+        self.containment = containment  # share of the query's ingredients the recipe has
+        self.shared = shared
+
+
+class NearMatchIndex:
+    """LSH buckets per cuisine over MinHash signatures, plus each recipe's slug set, cuisine and title"""
+
+    def __init__(self, hasher: MinHasher = None, bands: int = BANDS):
+        self.hasher = hasher or MinHasher()
+        self.bands = bands
+        self.rows = self.hasher.num_perm // bands
+        self._buckets = {}    # cuisine → [band → {band hash → {recipe_id}}]
+        self._recipes = {}    # recipe_id → (slugs, cuisine, title words, signature)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._recipes)
+
+    def _band_keys(self, signature: array):
+        rows = self.rows
+        return [hash(tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+
+    def build(self, conn: sqlite3.Connection) -> 'NearMatchIndex':
+        """Load every stored signature (recipes signed later are add()-ed by whoever signs them)"""
+        cursor = conn.execute(f'''
+            SELECT r.id, r.cuisine, r.title, m.signature,
+                   (SELECT group_concat(ri.ingredient_slug, '|') FROM recipe_ingredients ri
+                    WHERE ri.recipe_id = r.id)
+            FROM recipes r
+            JOIN {MINHASH_TABLE} m ON m.recipe_id = r.id AND m.num_perm = ?
+        ''', (self.hasher.num_perm,))
+        for recipe_id, cuisine, title, blob, slugs in cursor:
+            signature = array('I')
+            signature.frombytes(blob)
+            self.add(recipe_id, (slugs or '').split('|'), cuisine, title, signature)
+        return self
+
+    def add(self, recipe_id: str, slugs: Iterable[str], cuisine: Optional[str] = None, title: str = '',
+            signature: array = None):
+        slug_set = _slug_set(slugs)
+        if not slug_set:
+            return
+        signature = signature if signature is not None else self.hasher.signature(slug_set)
+        cuisine = (cuisine or '').lower()
+        with self._lock:
+            self.remove(recipe_id)
+            self._recipes[recipe_id] = (slug_set, cuisine, _title_words(title), signature)
+            bands = self._buckets.get(cuisine)
+            if bands is None:
+                bands = self._buckets[cuisine] = [dict() for _ in range(self.bands)]
+            for band, key in enumerate(self._band_keys(signature)):
+                bands[band].setdefault(key, set()).add(recipe_id)
+
+    def remove(self, recipe_id: str):
+        with self._lock:
+            entry = self._recipes.pop(recipe_id, None)
+            if entry is None:
+                return
+            bands = self._buckets[entry[1]]
+            for band, key in enumerate(self._band_keys(entry[3])):
+                bucket = bands[band].get(key)
+                if bucket is not None:
+                    bucket.discard(recipe_id)
+                    if not bucket:
+                        del bands[band][key]
+
+    def slugs(self, recipe_id: str) -> frozenset:
+        entry = self._recipes.get(recipe_id)
+        return entry[0] if entry else frozenset()
+
+    def _candidates(self, signature: array, cuisine: Optional[str]) -> set:
+        """Recipe ids sharing a band with the signature - in one cuisine, or in all of them"""
+        keys = self._band_keys(signature)
+        if cuisine is None:
+            cuisines = list(self._buckets.values())
+        else:
+            cuisines = [self._buckets[cuisine]] if cuisine in self._buckets else []
+        found = set()
+        for bands in cuisines:
+            for band, key in enumerate(keys):
+                bucket = bands[band].get(key)
+                if bucket:
+                    found.update(bucket)
+        return found
+
+    def nearest(self, slugs: Iterable[str], cuisine: str = None, k: int = 5,
+                min_containment: float = 0.0) -> List[NearMatch]:
+        """Recipes sharing the most of these ingredients (same cuisine if given), best first"""
+        query = _slug_set(slugs)
+        if not query:
+            return []
+        cuisine = cuisine.lower() if cuisine else None
+        with self._lock:
+            candidates = [(recipe_id, self._recipes[recipe_id][0])
+                          for recipe_id in self._candidates(self.hasher.signature(query), cuisine)]
+        matches = []
+        for recipe_id, recipe_slugs in candidates:
+            shared = len(query & recipe_slugs)
+            containment = shared / len(query)
+            if shared and containment >= min_containment:
+                matches.append(NearMatch(recipe_id, round(_jaccard(query, recipe_slugs), 3),
+                                         round(containment, 3), shared))
+        matches.sort(key=lambda m: (-m.containment, -m.jaccard, m.recipe_id))
+        return matches[:k]
+
+    def find_duplicate(self, slugs: Iterable[str], title: str, cuisine: str = None,
+                       min_jaccard: float = 0.9, min_title_similarity: float = 0.8,
+                       exclude: str = None) -> Optional[str]:
+        """An indexed recipe (other than `exclude`) with (nearly) the same ingredients AND title, or None"""
+        query = _slug_set(slugs)
+        if not query:
+            return None
+        words = _title_words(title)
+        cuisine = cuisine.lower() if cuisine else None
+        with self._lock:
+            for recipe_id in sorted(self._candidates(self.hasher.signature(query), cuisine)):
+                if recipe_id == exclude:
+                    continue
+                recipe_slugs, _, recipe_words, _ = self._recipes[recipe_id]
+                if _jaccard(query, recipe_slugs) >= min_jaccard and _jaccard(words, recipe_words) >= min_title_similarity:
+                    return recipe_id
+        return None
+
+    def memory_footprint(self) -> Dict:
+        with self._lock:
+            return {'recipes': len(self._recipes),
+                    'cuisines': len(self._buckets),
+                    'buckets': sum(len(band) for bands in self._buckets.values() for band in bands),
+                    'signature_bytes': len(self._recipes) * self.hasher.num_perm * 4}
+
+
+class ImportDuplicateGuard:
+    """
+    Duplicate detection for the scripts that insert recipes themselves
+    (DatabaseController, download_controller.py, download_themealdb.py)
+    guard = ImportDuplicateGuard(conn)               # signs what's missing, loads the index
+    if guard.duplicate_of(recipe_id, slugs, title, cuisine): skip the recipe
+    ...INSERT recipes / recipe_ingredients...
+    guard.record(recipe_id, slugs, title, cuisine)   # signature in the same transaction
+    """
+
+    def __init__(self, conn: sqlite3.Connection, hasher: MinHasher = None):
+        self.conn = conn
+        self.hasher = hasher or MinHasher()
+        signed = sign_missing(conn, self.hasher)
+        if signed:
+            print(f"   🔏 Signed {signed} recipes for duplicate detection (MinHash)")
+        self.index = NearMatchIndex(self.hasher).build(conn)
+
+    def duplicate_of(self, recipe_id: str, slugs: Iterable[str], title: str,
+                     cuisine: Optional[str]) -> Optional[str]:
+        """Id of an already stored near-duplicate (a re-import of recipe_id itself doesn't count)"""
+        return self.index.find_duplicate(slugs, title, cuisine, exclude=recipe_id)
+
+    def record(self, recipe_id: str, slugs: Iterable[str], title: str, cuisine: Optional[str]):
+        """Sign a just inserted recipe (caller commits) and index it for the rest of the import"""
+        signature = self.hasher.signature(slugs)
+        write_signatures(self.conn, self.hasher, {recipe_id: signature})
+        self.index.add(recipe_id, slugs, cuisine, title, signature)
+
+
+_BENCH_CUISINES = ['mexican', 'thai', 'italian', 'indian', 'french', 'japanese', 'greek', 'spanish',
+                   'chinese', 'korean', 'moroccan', 'peruvian', 'turkish', 'vietnamese', 'lebanese',
+                   'ethiopian', 'brazilian', 'german', 'british', 'caribbean']
+
+
+def _percentiles(samples_ms: List[float]) -> Dict:
+    ordered = sorted(samples_ms)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    return {'count': len(samples_ms), 'p50_ms': at(0.50), 'p95_ms': at(0.95), 'p99_ms': at(0.99)}
+
+
+def benchmark(num_recipes: int = 50000, num_queries: int = 500, bands: int = BANDS, seed: int = 7) -> Dict:
+    """
+    Synthetic index: recipes of 6-14 ingredients from a 600-slug pantry, spread over 20 cuisines
+    Queries are real recipes with one ingredient swapped (near matches), random sets (misses)
+    and 2-5 ingredients taken from a recipe (what users type) - the last ones both through LSH
+    and through IngredientIndex.containing
+    """
+    from ingredient_index import IngredientIndex
+    rng = random.Random(seed)
+    pantry = [f'ingredient_{i}' for i in range(600)]
+    hasher = MinHasher()
+    recipes = [(f'r{i}', rng.choice(_BENCH_CUISINES), rng.sample(pantry, rng.randint(6, 14)))
+               for i in range(num_recipes)]
+    signatures = [hasher.signature(slugs) for _, _, slugs in recipes]
+
+    started = time.perf_counter()
+    index = NearMatchIndex(hasher, bands)
+    for (recipe_id, cuisine, slugs), signature in zip(recipes, signatures):
+        index.add(recipe_id, slugs, cuisine, recipe_id, signature)
+    build_s = time.perf_counter() - started
+    postings = IngredientIndex()
+    for rowid, (_, cuisine, slugs) in enumerate(recipes, 1):
+        postings.add_recipe(rowid, cuisine, None, slugs)
+
+    latencies = {'near_match': [], 'random_set': [], 'duplicate_check': []}
+    candidates = {'near_match': [], 'random_set': []}
+    found = 0
+    for _ in range(num_queries):
+        recipe_id, cuisine, slugs = rng.choice(recipes)
+        near = slugs[1:] + [rng.choice(pantry)]
+        for name, query in (('near_match', near), ('random_set', rng.sample(pantry, len(slugs)))):
+            candidates[name].append(len(index._candidates(hasher.signature(query), cuisine)))
+            started = time.perf_counter()
+            matches = index.nearest(query, cuisine, k=5, min_containment=0.8)
+            latencies[name].append((time.perf_counter() - started) * 1000)
+            if name == 'near_match':
+                found += any(m.recipe_id == recipe_id for m in matches)
+        started = time.perf_counter()
+        index.find_duplicate(slugs, recipe_id, cuisine)
+        latencies['duplicate_check'].append((time.perf_counter() - started) * 1000)
+
+    short = {}
+    for size in range(2, 6):
+        lsh_found = containment_found = 0
+        samples = []
+        for _ in range(num_queries):
+            rowid = rng.randrange(len(recipes)) + 1
+            recipe_id, cuisine, slugs = recipes[rowid - 1]
+            query = rng.sample(slugs, size)
+            lsh_found += any(m.recipe_id == recipe_id
+                             for m in index.nearest(query, cuisine, k=50, min_containment=0.8))
+            started = time.perf_counter()
+            hits = postings.containing(cuisine, query, size)
+            samples.append((time.perf_counter() - started) * 1000)
+            containment_found += any(hit == rowid for hit, _ in hits)
+        short[f'{size}_ingredients'] = {'lsh_recall': round(lsh_found / num_queries, 3),
+                                        'containment_recall': round(containment_found / num_queries, 3),
+                                        'containment': _percentiles(samples)}
+
+    return {'recipes': num_recipes, 'cuisines': len(_BENCH_CUISINES), 'bands': index.bands, 'rows': index.rows,
+            'build_s': round(build_s, 2), 'near_match_recall': round(found / num_queries, 3),
+            'mean_candidates': {name: round(sum(c) / len(c), 1) for name, c in candidates.items()},
+            'queries': {name: _percentiles(samples) for name, samples in latencies.items()},
+            'short_queries': short}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sign recipes for near-match search or benchmark the LSH index")
+    commands = parser.add_subparsers(dest='command', required=True)
+    sign = commands.add_parser('sign', help="sign every recipe of a master database that has no signature")
+    sign.add_argument('db_path')
+    bench = commands.add_parser('benchmark', help="time a synthetic index")
+    bench.add_argument('--recipes', type=int, default=50000)
+    bench.add_argument('--queries', type=int, default=500)
+    bench.add_argument('--bands', type=int, default=BANDS)
+    args = parser.parse_args(argv)
+
+    if args.command == 'benchmark':
+        print(json.dumps(benchmark(args.recipes, args.queries, args.bands), indent=2))
+        return 0
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(args.db_path)
+    try:
+        signed = sign_missing(conn, MinHasher())
+    finally:
+        conn.close()
+    print(f"🔏 Signed {signed} recipes in {time.perf_counter() - started:.1f}s → {args.db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
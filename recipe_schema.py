@@ -0,0 +1,122 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: recipe_schema.py
+# * Purpose: Denormalized columns of the master recipes table (shared by every writer)
+# */
+
+"""
+Recipe schema helpers
+recipes.ingredient_slugs = "|chicken_breast|tomato|onion|"
+recipes.spice_level_score = 0 (mild) … 100 (insane), from title + ingredients
+- Written together with the recipe (RecipeMatcher4D, DatabaseController)
+- Let Level 1 filter/rank in SQL and skip decoding the ingredients JSON
+- Older databases get the columns added and back-filled once
+"""
+
+import json
+import sqlite3
+from typing import Iterable, Union
+
+from keyword_matcher import KeywordMatcher
+
+SLUG_SEPARATOR = '|'
+
+# Requested spice level → spice_level_score Level 1 ranks closest to
+SPICE_LEVEL_TARGETS = {'mild': 0, 'medium': 40, 'hot': 60, 'extra': 80, 'insane': 100}
+NEUTRAL_SPICE_SCORE = 15  # No spice signal at all - closer to mild than to medium
+
+# Title words per level (hottest level checked first)
+_TITLE_SPICE = KeywordMatcher({
+    'insane': ['ghost', 'habanero', 'scorpion', 'carolina', 'volcanic'],
+    'extra': ['very hot', 'extra spicy', 'jalapeño', 'jalapeno'],
+    'hot': ['hot', 'chili', 'fiery'],
+    'medium': ['spicy', 'zesty', 'tangy', 'seasoned'],
+    'mild': ['mild', 'gentle', 'sweet'],
+})
+
+# Ingredient slugs that make an otherwise neutral title spicy
+_INGREDIENT_SPICE = KeywordMatcher({
+    'extra': ['habanero', 'ghost_pepper', 'scotch_bonnet', 'carolina_reaper', 'bird_eye'],
+    'medium': ['chili', 'chile', 'jalapeno', 'jalapeño', 'cayenne', 'chipotle', 'serrano',
+               'gochujang', 'sriracha', 'harissa', 'sambal', 'piri_piri'],
+})
+
+
+def normalize_slug(value: str) -> str:
+    return str(value).lower().strip().replace(' ', '_')
+
+
+def ingredient_slug_text(ingredients: Iterable[Union[dict, str]]) -> str:
+    """
+    '|slug|slug|' for a recipe's ingredient list
+    Both the slug and the name (slugified) are kept, so 'Chicken Thighs' with
+    slug 'chicken_thigh' is findable either way
+    """
+    slugs = []
+    for ing in ingredients or []:
+        if isinstance(ing, dict):
+            values = (ing.get('slug'), ing.get('item') or ing.get('name'))
+        else:
+            values = (ing,)
+        for value in values:
+            if value:
+                slug = normalize_slug(value)
+                if slug and slug not in slugs:
+                    slugs.append(slug)
+    if not slugs:
+        return ''
+    return SLUG_SEPARATOR + SLUG_SEPARATOR.join(slugs) + SLUG_SEPARATOR
+
+
+def spice_level_score(title: str, slug_text: str = '') -> int:
+    """Heat of a recipe on the SPICE_LEVEL_TARGETS scale (title wins over ingredients)"""
+    title_levels = _TITLE_SPICE.matched_categories(title or '')
+    for level in ('insane', 'extra', 'hot', 'medium'):
+        if level in title_levels:
+            return SPICE_LEVEL_TARGETS[level]
+    if 'mild' in title_levels:
+        return SPICE_LEVEL_TARGETS['mild']
+
+    ingredient_levels = _INGREDIENT_SPICE.matched_categories(slug_text or '')
+    for level in ('extra', 'medium'):
+        if level in ingredient_levels:
+            return SPICE_LEVEL_TARGETS[level]
+    return NEUTRAL_SPICE_SCORE
+
+
+def ensure_denormalized_columns(conn: sqlite3.Connection) -> int:
+    """
+    Add recipes.ingredient_slugs/spice_level_score (+ the Level 1 index) if missing
+    and fill them for rows that don't have them yet
+    Returns the number of rows back-filled (caller commits)
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(recipes)")]
+    if not columns:
+        return 0
+    if 'ingredient_slugs' not in columns:
+        conn.execute("ALTER TABLE recipes ADD COLUMN ingredient_slugs TEXT")
+    if 'spice_level_score' not in columns:
+        conn.execute("ALTER TABLE recipes ADD COLUMN spice_level_score INTEGER")
+    # Level 1: WHERE cuisine [AND dish_type] ORDER BY quality
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_level1 ON recipes(cuisine, dish_type, quality_score DESC)")
+
+    updates = []
+    for rowid, title, raw, slug_text in conn.execute(
+        "SELECT rowid, title, ingredients, ingredient_slugs FROM recipes "
+        "WHERE ingredient_slugs IS NULL OR spice_level_score IS NULL"
+    ):
+        if slug_text is None:
+            try:
+                ingredients = json.loads(raw) if raw else []
+            except (TypeError, ValueError):
+                ingredients = []
+            slug_text = ingredient_slug_text(ingredients)
+        updates.append((slug_text, spice_level_score(title, slug_text), rowid))
+
+    if updates:
+        conn.executemany("UPDATE recipes SET ingredient_slugs = ?, spice_level_score = ? WHERE rowid = ?", updates)
+        print(f"   🧂 Back-filled ingredient_slugs/spice_level_score for {len(updates)} recipes")
+    return len(updates)
@@ -0,0 +1,587 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: recipe_tfidf.py
+# * Purpose: Offline-buildable TF-IDF index for free-text recipe search without any API call
+# */
+
+"""
+Local TF-IDF recipe search
+index = TfidfIndex.build(conn)            # or TfidfIndex.load('recipegen_master_tfidf')
+index.search('creamy coconut chicken', cuisine='thai', k=10)   → [(recipe_id, cosine), ...] best first
+index.add(recipe_id, cuisine, title, instructions, ingredients) / index.remove(recipe_id)
+python recipe_tfidf.py build <master.db> [out_dir]      offline build next to the database
+index.catch_up(conn)                    → adds recipes inserted since the build (None: build again)
+python recipe_tfidf.py benchmark [--recipes 100000]     synthetic build + query timings
+- A recipe is its title ×3, ingredient names ×2 and instructions ×1; each term weighs
+  (1 + ln tf) × idf and the vector is L2-normalised, so a dot product is the cosine
+- Stored term-major (postings: term → docs, weights) in flat uint32/float32 files that load
+  memory-mapped, the sorted vocabulary included (bisect over the mapped term blob)
+- A query scatters its terms' posting slices into one score vector (NumPy, or a dict
+  without it), masks it to the cuisine and keeps the top k (argpartition)
+- Added recipes go to a small in-memory delta weighted with the idf of the moment;
+  rebuild offline once needs_rebuild (REBUILD_DELTA_RATIO of the base)
+"""
+
+import argparse
+import bisect
+import heapq
+import json
+import math
+import mmap
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from recipe_fts import text_columns_sql
+
+INDEX_VERSION = 1
+FIELD_WEIGHTS = (3, 2, 1)   # title, ingredients, instructions
+REBUILD_DELTA_RATIO = 0.2
+
+# File → array typecode of a saved index (plus terms.bin, the UTF-8 vocabulary blob, and meta.json)
+_ARRAYS = {'term_offsets': 'I', 'df': 'I', 'posting_offsets': 'I', 'posting_docs': 'I',
+           'posting_weights': 'f', 'doc_cuisine': 'H'}
+_NUMPY_TYPES = {'I': 'uint32', 'f': 'float32', 'H': 'uint16', 'B': 'uint8'}
+
+STOP_WORDS = frozenset('''
+a an and or the of to in into on onto for with without from by at as is are be it its this that
+then than until while about over under up down out off your you we our each all any some more
+very can will should also just well
+'''.split())
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def _stem(word: str) -> str:
+    """Plurals only: tomatoes → tomato, berries → berry, onions → onion"""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 4 and word.endswith('oes'):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(word) for word in _TOKEN.findall((text or '').lower())
+            if len(word) > 1 and word not in STOP_WORDS and not word.isdigit()]
+
+
+def recipe_text(recipe: Dict) -> Tuple[str, str, str]:
+    """(title, instructions, ingredient names) of a recipe dict - what recipes_fts indexes"""
+    steps = []
+    for step in recipe.get('instructions') or []:
+        if isinstance(step, dict):
+            step = step.get('instruction') or step.get('step') or step.get('text') or ''
+        steps.append(str(step))
+    names = []
+    for ing in recipe.get('ingredients') or []:
+        if isinstance(ing, dict):
+            ing = ing.get('name') or ing.get('item') or ing.get('slug') or ''
+        names.append(str(ing))
+    return recipe.get('title') or '', ' '.join(steps), ' '.join(names)
+
+
+def _term_counts(title: str, instructions: str, ingredients: str) -> Dict[str, int]:
+    counts = {}
+    for text, weight in zip((title, ingredients, instructions), FIELD_WEIGHTS):
+        for term in tokenize(text):
+            counts[term] = counts.get(term, 0) + weight
+    return counts
+
+
+def _idf(df: int, num_docs: int) -> float:
+    return math.log((1 + num_docs) / (1 + df)) + 1.0
+
+
+def _last_updated_sql(conn: sqlite3.Connection) -> str:
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(recipes)")}
+    return 'MAX(last_updated)' if 'last_updated' in columns else 'NULL'
+
+
+def database_stamp(conn: sqlite3.Connection) -> Dict:
+    """
+    Recipe count, highest rowid and latest last_updated: any insert, delete or edit
+    (edits bump last_updated) changes it - saved in meta.json, checked by catch_up()
+    """
+    recipes, max_rowid, last_updated = conn.execute(
+        f"SELECT COUNT(*), COALESCE(MAX(rowid), 0), {_last_updated_sql(conn)} FROM recipes").fetchone()
+    return {'recipes': recipes, 'max_rowid': max_rowid, 'last_updated': last_updated}
+
+
+def default_index_path(db_path: str) -> str:
+    """Where the offline index of a database lives: recipegen_master.db → recipegen_master_tfidf/"""
+    return os.path.splitext(db_path)[0] + '_tfidf'
+
+
+class _TermTable:
+    """Sorted vocabulary as one UTF-8 blob + offsets - looked up by bisect, no dict in memory"""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode('utf-8')
+
+    def index(self, term: str) -> int:
+        """Column of a term, -1 when it isn't in the vocabulary"""
+        i = bisect.bisect_left(self, term)
+        return i if i < len(self) and self[i] == term else -1
+
+
+def _map_file(path: str, typecode: str):
+    """Read-only memory map of a saved array → (view, mmap or None)"""
+    if os.path.getsize(path) == 0:
+        return array(typecode), None
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    return (view if typecode == 'B' else view.cast(typecode)), mapped
+
+
+def _as_numpy(buffer, typecode: str):
+    if len(buffer) == 0:
+        return np.zeros(0, dtype=_NUMPY_TYPES[typecode])
+    return np.frombuffer(buffer, dtype=_NUMPY_TYPES[typecode])
+
+
+class TfidfIndex:
+    """Base segment (built or loaded, read-only) + in-memory delta of recipes added since"""
+
+    def __init__(self, terms: bytes, arrays: Dict, doc_ids: List[str], cuisines: List[str], mapped=()):
+        self._terms = _TermTable(terms, arrays['term_offsets'])
+        self._arrays = arrays
+        self._mapped = list(mapped)
+        self._np = {name: _as_numpy(buffer, _ARRAYS[name]) for name, buffer in arrays.items()} \
+            if NUMPY_AVAILABLE else None
+        self.doc_ids = list(doc_ids)
+        self.cuisines = list(cuisines)
+        self._cuisine_codes = {cuisine: code for code, cuisine in enumerate(self.cuisines)}
+        self.base_docs = len(self.doc_ids)
+        self.db_stamp = None        # database_stamp() the base segment was built from (delta not included)
+
+        self._delta_postings = {}   # term → [(doc, weight)]
+        self._delta_df = {}
+        self._delta_cuisine = array('H')
+        self._deleted = set()
+        self._doc_index = None      # recipe_id → doc, built on the first add/remove
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.doc_ids) - len(self._deleted)
+
+    # ---- building ---------------------------------------------------------------
+
+    @classmethod
+    def build(cls, conn: sqlite3.Connection) -> 'TfidfIndex':
+        """Index every recipe of the database (title, instructions, ingredient names)"""
+        stamp = database_stamp(conn)
+        cursor = conn.execute(f"SELECT r.id, r.cuisine, {text_columns_sql('r')} FROM recipes r ORDER BY r.rowid")
+        index = cls.from_rows(cursor)
+        index.db_stamp = stamp
+        return index
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple]) -> 'TfidfIndex':
+        """rows of (recipe_id, cuisine, title, instructions, ingredients)"""
+        provisional = {}            # term → id in first-seen order
+        df = array('I')
+        doc_terms, doc_counts = [], []
+        doc_ids, doc_cuisine, cuisines = [], array('H'), {}
+        for recipe_id, cuisine, title, instructions, ingredients in rows:
+            counts = _term_counts(title, instructions, ingredients)
+            if not counts:
+                continue
+            ids, tfs = array('I'), array('f')
+            for term, count in counts.items():
+                p = provisional.get(term)
+                if p is None:
+                    p = provisional[term] = len(df)
+                    df.append(0)
+                df[p] += 1
+                ids.append(p)
+                tfs.append(count)
+            doc_ids.append(recipe_id)
+            doc_cuisine.append(cuisines.setdefault((cuisine or '').lower(), len(cuisines)))
+            doc_terms.append(ids)
+            doc_counts.append(tfs)
+
+        # Final columns in sorted term order
+        terms = sorted(provisional)
+        column = array('I', [0]) * len(terms)
+        for t, term in enumerate(terms):
+            column[provisional[term]] = t
+        encoded = [term.encode('utf-8') for term in terms]
+        term_offsets = array('I', [0])
+        for word in encoded:
+            term_offsets.append(term_offsets[-1] + len(word))
+        sorted_df = array('I', [0]) * len(terms)
+        for p, count in enumerate(df):
+            sorted_df[column[p]] = count
+
+        idf = [_idf(count, len(doc_ids)) for count in df]
+        build_postings = cls._postings_numpy if NUMPY_AVAILABLE else cls._postings_python
+        posting_offsets, posting_docs, posting_weights = build_postings(doc_terms, doc_counts, column, idf, sorted_df)
+        arrays = {'term_offsets': term_offsets, 'df': sorted_df, 'posting_offsets': posting_offsets,
+                  'posting_docs': posting_docs, 'posting_weights': posting_weights, 'doc_cuisine': doc_cuisine}
+        return cls(b''.join(encoded), arrays, doc_ids, list(cuisines))
+
+    @staticmethod
+    def _postings_python(doc_terms, doc_counts, column, idf, df):
+        posting_offsets = array('I', [0])
+        for count in df:
+            posting_offsets.append(posting_offsets[-1] + count)
+        posting_docs = array('I', [0]) * posting_offsets[-1]
+        posting_weights = array('f', [0.0]) * posting_offsets[-1]
+        cursor = array('I', posting_offsets[:-1])
+        for doc, (ids, tfs) in enumerate(zip(doc_terms, doc_counts)):
+            weights = [(1 + math.log(tf)) * idf[p] for p, tf in zip(ids, tfs)]
+            norm = math.sqrt(sum(w * w for w in weights))
+            for p, weight in zip(ids, weights):
+                t = column[p]
+                i = cursor[t]
+                posting_docs[i] = doc
+                posting_weights[i] = weight / norm
+                cursor[t] = i + 1
+        return posting_offsets, posting_docs, posting_weights
+
+    @staticmethod
+    def _postings_numpy(doc_terms, doc_counts, column, idf, df):
+        lengths = np.fromiter((len(ids) for ids in doc_terms), dtype=np.int64, count=len(doc_terms))
+        if not lengths.sum():
+            return array('I', [0] * (len(df) + 1)), array('I'), array('f')
+        provisional = np.concatenate([_as_numpy(ids, 'I') for ids in doc_terms])
+        tfs = np.concatenate([_as_numpy(counts, 'f') for counts in doc_counts])
+        docs = np.repeat(np.arange(len(doc_terms), dtype=np.uint32), lengths)
+        weights = (1 + np.log(tfs)) * np.asarray(idf, dtype=np.float32)[provisional]
+        norms = np.sqrt(np.bincount(docs, weights=weights * weights, minlength=len(doc_terms)))
+        weights = (weights / norms[docs]).astype(np.float32)
+        columns = np.asarray(column, dtype=np.uint32)[provisional]
+        order = np.argsort(columns, kind='stable')      # term-major, docs ascending within a term
+        posting_offsets = np.zeros(len(df) + 1, dtype=np.uint32)
+        np.cumsum(np.asarray(df, dtype=np.uint32), out=posting_offsets[1:])
+        return (array('I', posting_offsets.tobytes()), array('I', docs[order].tobytes()),
+                array('f', weights[order].tobytes()))
+
+    # ---- persistence ------------------------------------------------------------
+
+    def save(self, directory: str):
+        """Write the base segment (added/removed recipes are not saved - build again instead)"""
+        os.makedirs(directory, exist_ok=True)
+        for name in _ARRAYS:
+            with open(os.path.join(directory, f'{name}.bin'), 'wb') as f:
+                f.write(bytes(self._arrays[name]))
+        with open(os.path.join(directory, 'terms.bin'), 'wb') as f:
+            f.write(bytes(self._terms.blob))
+        meta = {'version': INDEX_VERSION, 'built_at': time.time(), 'documents': self.base_docs,
+                'doc_ids': self.doc_ids[:self.base_docs], 'cuisines': self.cuisines, 'db_stamp': self.db_stamp}
+        with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory: str) -> 'TfidfIndex':
+        """Memory-map a saved index (raises ValueError on another format version)"""
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != INDEX_VERSION:
+            raise ValueError(f"TF-IDF index format {meta.get('version')}, expected {INDEX_VERSION}")
+        arrays, mapped = {}, []
+        for name, typecode in _ARRAYS.items():
+            arrays[name], mm = _map_file(os.path.join(directory, f'{name}.bin'), typecode)
+            mapped.append(mm)
+        terms, mm = _map_file(os.path.join(directory, 'terms.bin'), 'B')
+        mapped.append(mm)
+        index = cls(terms, arrays, meta['doc_ids'], meta['cuisines'], [mm for mm in mapped if mm is not None])
+        index.db_stamp = meta.get('db_stamp')
+        return index
+
+    def catch_up(self, conn: sqlite3.Connection) -> Optional[int]:
+        """
+        Add the recipes inserted since db_stamp to the delta and return how many there were -
+        or None when the rows it covers changed (deletes, edits, replaces) or it has no stamp:
+        build again then
+        """
+        stamp = self.db_stamp
+        if not stamp:
+            return None
+        covered, last_updated = conn.execute(
+            f"SELECT COUNT(*), {_last_updated_sql(conn)} FROM recipes WHERE rowid <= ?",
+            (stamp['max_rowid'],)).fetchone()
+        if covered != stamp['recipes'] or last_updated != stamp['last_updated']:
+            return None
+        rows = conn.execute(f"SELECT r.id, r.cuisine, {text_columns_sql('r')} FROM recipes r "
+                            f"WHERE r.rowid > ? ORDER BY r.rowid", (stamp['max_rowid'],)).fetchall()
+        for recipe_id, cuisine, title, instructions, ingredients in rows:
+            self.add(recipe_id, cuisine, title, instructions or '', ingredients or '')
+        return len(rows)
+
+    def close(self):
+        """Unmap a loaded index (best effort - views still referenced elsewhere keep it mapped)"""
+        self._np = None
+        for buffer in list(self._arrays.values()) + [self._terms.blob]:
+            if isinstance(buffer, memoryview):
+                try:
+                    buffer.release()
+                except BufferError:
+                    pass
+        for mm in self._mapped:
+            try:
+                mm.close()
+            except BufferError:
+                pass
+        self._mapped = []
+
+    # ---- incremental updates ----------------------------------------------------
+
+    def _docs_by_id(self) -> Dict[str, int]:
+        if self._doc_index is None:
+            self._doc_index = {recipe_id: doc for doc, recipe_id in enumerate(self.doc_ids)}
+        return self._doc_index
+
+    def _df(self, term: str, column: int) -> int:
+        return (self._arrays['df'][column] if column >= 0 else 0) + self._delta_df.get(term, 0)
+
+    def add(self, recipe_id: str, cuisine: str, title: str, instructions: str = '', ingredients: str = ''):
+        """Index a new (or changed) recipe in the delta"""
+        counts = _term_counts(title, instructions, ingredients)
+        with self._lock:
+            self.remove(recipe_id)
+            if not counts:
+                return
+            for term in counts:
+                self._delta_df[term] = self._delta_df.get(term, 0) + 1
+            num_docs = len(self) + 1
+            weights = {term: (1 + math.log(tf)) * _idf(self._df(term, self._terms.index(term)), num_docs)
+                       for term, tf in counts.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values()))
+            cuisine = (cuisine or '').lower()
+            code = self._cuisine_codes.get(cuisine)
+            if code is None:
+                code = self._cuisine_codes[cuisine] = len(self.cuisines)
+                self.cuisines.append(cuisine)
+            doc = len(self.doc_ids)
+            self.doc_ids.append(recipe_id)
+            self._docs_by_id()[recipe_id] = doc
+            self._delta_cuisine.append(code)
+            for term, weight in weights.items():
+                self._delta_postings.setdefault(term, []).append((doc, weight / norm))
+
+    def remove(self, recipe_id: str):
+        with self._lock:
+            doc = self._docs_by_id().pop(recipe_id, None)
+            if doc is not None:
+                self._deleted.add(doc)
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return len(self.doc_ids) - self.base_docs > REBUILD_DELTA_RATIO * max(self.base_docs, 1)
+
+    # ---- queries ----------------------------------------------------------------
+
+    def search(self, query: str, cuisine: Optional[str] = None, k: int = 10) -> List[Tuple[str, float]]:
+        """Top k (recipe_id, cosine similarity) for a free-text query, of one cuisine if given"""
+        counts = {}
+        for term in tokenize(query):
+            counts[term] = counts.get(term, 0) + 1
+        if not counts or k < 1:
+            return []
+        with self._lock:
+            code = None
+            if cuisine:
+                code = self._cuisine_codes.get(cuisine.lower())
+                if code is None:
+                    return []
+            num_docs = len(self)
+            weighted = []
+            for term, tf in counts.items():
+                column = self._terms.index(term)
+                df = self._df(term, column)
+                if df:
+                    weighted.append((term, column, (1 + math.log(tf)) * _idf(df, num_docs)))
+            if not weighted:
+                return []
+            norm = math.sqrt(sum(w * w for _, _, w in weighted))
+            base_query = [(column, w / norm) for _, column, w in weighted if column >= 0]
+            score_base = self._score_base_numpy if self._np is not None else self._score_base_python
+            hits = score_base(base_query, code, k) if base_query and self.base_docs else []
+            hits += self._score_delta([(term, w / norm) for term, _, w in weighted], code)
+            hits.sort(key=lambda hit: (-hit[0], hit[1]))
+            return [(self.doc_ids[doc], round(score, 4)) for score, doc in hits[:k]]
+
+    def _score_base_numpy(self, query, code, k):
+        arrays = self._np
+        offsets = arrays['posting_offsets']
+        scores = np.zeros(self.base_docs, dtype=np.float32)
+        for column, weight in query:
+            start, end = int(offsets[column]), int(offsets[column + 1])
+            scores[arrays['posting_docs'][start:end]] += np.float32(weight) * arrays['posting_weights'][start:end]
+        if code is not None:
+            scores[arrays['doc_cuisine'] != code] = 0
+        if self._deleted:
+            scores[[doc for doc in self._deleted if doc < self.base_docs]] = 0
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        return [(float(scores[doc]), int(doc)) for doc in hits]
+
+    def _score_base_python(self, query, code, k):
+        arrays = self._arrays
+        offsets, docs, weights = arrays['posting_offsets'], arrays['posting_docs'], arrays['posting_weights']
+        scores = {}
+        for column, weight in query:
+            for i in range(offsets[column], offsets[column + 1]):
+                scores[docs[i]] = scores.get(docs[i], 0.0) + weight * weights[i]
+        doc_cuisine = arrays['doc_cuisine']
+        return heapq.nlargest(k, ((score, doc) for doc, score in scores.items()
+                                  if (code is None or doc_cuisine[doc] == code) and doc not in self._deleted),
+                              key=lambda hit: (hit[0], -hit[1]))
+
+    def _score_delta(self, query, code):
+        scores = {}
+        for term, weight in query:
+            for doc, doc_weight in self._delta_postings.get(term, ()):
+                if doc in self._deleted or (code is not None and self._delta_cuisine[doc - self.base_docs] != code):
+                    continue
+                scores[doc] = scores.get(doc, 0.0) + weight * doc_weight
+        return [(score, doc) for doc, score in scores.items()]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            postings = len(self._arrays['posting_docs'])
+            return {
+                'documents': len(self),
+                'terms': len(self._terms),
+                'postings': postings,
+                'delta_documents': len(self.doc_ids) - self.base_docs,
+                'deleted': len(self._deleted),
+                'needs_rebuild': self.needs_rebuild,
+                'memory_mapped': bool(self._mapped),
+                'backend': 'numpy' if self._np is not None else 'python',
+                'index_bytes': postings * 8 + len(self._terms.blob) + 4 * len(self._terms) + 2 * self.base_docs,
+            }
+
+
+# ---- benchmark ----------------------------------------------------------------------
+
+_BENCH_CUISINES = ['mexican', 'thai', 'italian', 'indian', 'japanese', 'french', 'greek', 'moroccan']
+_BENCH_INGREDIENTS = '''chicken beef pork lamb shrimp tofu salmon egg rice noodle pasta potato tomato onion
+garlic ginger chili lime lemon coconut milk cream butter cheese basil cilantro mint parsley cumin coriander
+turmeric paprika oregano thyme rosemary soy sauce fish vinegar honey sugar flour corn bean lentil chickpea
+spinach carrot pepper mushroom eggplant zucchini cabbage yogurt almond peanut sesame olive oil'''.split()
+_BENCH_TECHNIQUES = '''simmer roast grill fry saute braise bake steam whisk stir marinate toast blend
+chop slice dice knead reduce glaze poach sear caramelize'''.split()
+_BENCH_DISHES = 'curry stew soup salad tacos stir-fry casserole skewers pie bowl roast risotto'.split()
+
+
+def synthetic_rows(num_recipes: int, seed: int = 7):
+    """Deterministic fake recipes: a shared culinary vocabulary plus a long tail of rare words"""
+    rng = random.Random(seed)
+    for i in range(num_recipes):
+        ingredients = rng.sample(_BENCH_INGREDIENTS, rng.randint(5, 12)) + [f'spice{rng.randrange(20000)}']
+        title = f"{rng.choice(['creamy', 'spicy', 'smoky', 'quick', 'classic'])} {' '.join(ingredients[:2])} " \
+                f"{rng.choice(_BENCH_DISHES)}"
+        steps = ' '.join(f"{rng.choice(_BENCH_TECHNIQUES)} the {rng.choice(ingredients)} "
+                         f"for {rng.randint(2, 40)} minutes" for _ in range(rng.randint(4, 9)))
+        yield f'bench_{i}', rng.choice(_BENCH_CUISINES), title, steps, ' '.join(ingredients)
+
+
+def _percentiles(samples_ms: List[float]) -> Dict:
+    ordered = sorted(samples_ms) or [0.0]
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    return {'count': len(samples_ms), 'p50_ms': at(0.50), 'p95_ms': at(0.95), 'p99_ms': at(0.99)}
+
+
+def benchmark(num_recipes: int = 100000, num_queries: int = 200, k: int = 10, seed: int = 7) -> Dict:
+    """Build, save, memory-map and query a synthetic index of num_recipes recipes"""
+    rng = random.Random(seed + 1)
+    started = time.perf_counter()
+    index = TfidfIndex.from_rows(synthetic_rows(num_recipes, seed))
+    build_s = time.perf_counter() - started
+
+    queries = [' '.join(rng.sample(_BENCH_INGREDIENTS, rng.randint(1, 4)) + [rng.choice(_BENCH_DISHES)])
+               for _ in range(num_queries)]
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        index.save(directory)
+        save_s = time.perf_counter() - started
+        started = time.perf_counter()
+        loaded = TfidfIndex.load(directory)
+        load_s = time.perf_counter() - started
+
+        latencies = {'all_cuisines': [], 'one_cuisine': []}
+        for query in queries:
+            for name, cuisine in (('all_cuisines', None), ('one_cuisine', rng.choice(_BENCH_CUISINES))):
+                started = time.perf_counter()
+                loaded.search(query, cuisine, k)
+                latencies[name].append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        for i, row in enumerate(synthetic_rows(100, seed + 2)):
+            loaded.add(f'added_{i}', *row[1:])
+        add_ms = (time.perf_counter() - started) * 10
+        stats = loaded.get_stats()
+        loaded.close()
+
+    return {'recipes': num_recipes, 'backend': stats['backend'], 'terms': stats['terms'],
+            'postings': stats['postings'], 'index_bytes': stats['index_bytes'],
+            'build_s': round(build_s, 2), 'save_s': round(save_s, 2), 'load_s': round(load_s, 3),
+            'add_ms_per_recipe': round(add_ms, 3),
+            'queries': {name: _percentiles(samples) for name, samples in latencies.items()}}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or benchmark the local TF-IDF recipe search index")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="index every recipe of a master database")
+    build.add_argument('db_path')
+    build.add_argument('output', nargs='?', help="index directory (default: <db name>_tfidf next to it)")
+    bench = commands.add_parser('benchmark', help="time a synthetic index")
+    bench.add_argument('--recipes', type=int, default=100000)
+    bench.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    if args.command == 'benchmark':
+        print(json.dumps(benchmark(args.recipes, args.queries), indent=2))
+        return 0
+
+    output = args.output or default_index_path(args.db_path)
+    started = time.perf_counter()
+    conn = sqlite3.connect(args.db_path)
+    try:
+        index = TfidfIndex.build(conn)
+    finally:
+        conn.close()
+    index.save(output)
+    stats = index.get_stats()
+    print(f"🔤 Indexed {stats['documents']} recipes, {stats['terms']} terms in "
+          f"{time.perf_counter() - started:.1f}s → {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: speculative_ai.py
+# * Purpose: Bookkeeping for AI Chef generations started before Levels 2-3 are done
+# */
+
+"""
+Speculative AI Chef
+call = SpeculativeCall(executor.submit(generate), ledger)   (or an asyncio Task)
+- take()/take_async() when Levels 2-3 missed → the AI recipe is used
+- settle() when a higher level won → cancelled if it still can be (thread not
+  started yet, or an asyncio task), otherwise it runs out and its recipe is handed to
+  keep(recipe) - kept (e.g. saved locally) it is booked as saved, otherwise as wasted
+ledger.get_stats() → started/used/cancelled/saved/wasted/wasted_seconds, to tune the threshold
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class SpeculationLedger:
+    """Thread-safe counters of speculative AI generations"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {'started': 0, 'used': 0, 'cancelled': 0, 'saved': 0, 'wasted': 0, 'wasted_seconds': 0.0}
+
+    def record(self, outcome: str, seconds: float = 0.0):
+        with self._lock:
+            self.stats[outcome] += 1
+            if outcome == 'wasted':
+                self.stats['wasted_seconds'] = round(self.stats['wasted_seconds'] + seconds, 3)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+        stats['waste_rate'] = round(stats['wasted'] / stats['started'], 3) if stats['started'] else 0.0
+        return stats
+
+
+class SpeculativeCall:
+    """One AI Chef generation running ahead of the cascade (concurrent Future or asyncio Task)"""
+
+    def __init__(self, future, ledger: SpeculationLedger, clock=time.monotonic,
+                 keep: Optional[Callable[[Dict], bool]] = None):
+        self.future = future
+        self.ledger = ledger
+        self.clock = clock
+        self.keep = keep    # keep(recipe) → True if an unused finished recipe was stored
+        self.started = clock()
+        self.used = False
+        ledger.record('started')
+
+    def take(self, timeout: float = None):
+        """The AI recipe (blocking) - Levels 2-3 came back empty"""
+        self.used = True
+        self.ledger.record('used')
+        return self.future.result(timeout=timeout)
+
+    async def take_async(self, timeout: float = None):
+        self.used = True
+        self.ledger.record('used')
+        return await asyncio.wait_for(self.future, timeout)
+
+    def settle(self):
+        """A higher level won (or the cascade failed) - cancel the AI call, or keep its recipe"""
+        if self.used:
+            return
+        if not self.future.done() and self.future.cancel():
+            self.ledger.record('cancelled')
+            return
+        self.future.add_done_callback(self._finished_unused)
+
+    def _finished_unused(self, future):
+        seconds = self.clock() - self.started
+        if self.keep is not None and not future.cancelled() and future.exception() is None:
+            try:
+                if self.keep(future.result()):
+                    self.ledger.record('saved')
+                    return
+            except Exception as e:
+                print(f"   ⚠️ Could not keep the speculative AI recipe: {e}")
+        self.ledger.record('wasted', seconds)
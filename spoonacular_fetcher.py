@@ -7,6 +7,8 @@
 # */
 
 import requests
+import httpx
+from cascade_deadline import request_timeout
 import json
 import time
 from typing import List, Dict
@@ -15,9 +17,22 @@ class SpoonacularFetcher:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.spoonacular.com"
+        self.timeout = 15.0  # Seconds per request (capped by the cascade deadline)
         
     def search_recipes(self, cuisine: str, ingredients: List[str], number: int = 100):
         """Search recipes by cuisine and ingredients"""
+        endpoint, params = self._search_request(cuisine, ingredients, number)
+        response = requests.get(endpoint, params=params, timeout=request_timeout(self.timeout))
+        return response.json()
+    
+    async def search_recipes_async(self, cuisine: str, ingredients: List[str], number: int = 100):
+        """search_recipes without blocking the event loop"""
+        endpoint, params = self._search_request(cuisine, ingredients, number)
+        async with httpx.AsyncClient(timeout=request_timeout(self.timeout)) as client:
+            response = await client.get(endpoint, params=params)
+        return response.json()
+    
+    def _search_request(self, cuisine: str, ingredients: List[str], number: int):
         endpoint = f"{self.base_url}/recipes/complexSearch"
         
         params = {
@@ -25,12 +40,11 @@ class SpoonacularFetcher:
             'cuisine': cuisine,
             'includeIngredients': ','.join(ingredients),
             'number': number,  # Get up to 100 per request
-            'addRecipeInformation': True,
-            'fillIngredients': True
+            # Strings, not bools: requests would send 'True', httpx 'true'
+            'addRecipeInformation': 'True',
+            'fillIngredients': 'True'
         }
-        
-        response = requests.get(endpoint, params=params)
-        return response.json()
+        return endpoint, params
     
     def is_quality_recipe(self, recipe: Dict) -> bool:
         """Filter out bad recipes - FIXED for search results"""
@@ -61,15 +75,25 @@ class SpoonacularFetcher:
 
     def get_recipe_details(self, recipe_id: int) -> Dict:
         """Get full recipe details including instructions"""
+        endpoint, params = self._details_request(recipe_id)
+        response = requests.get(endpoint, params=params, timeout=request_timeout(self.timeout))
+        return response.json()
+    
+    async def get_recipe_details_async(self, recipe_id: int) -> Dict:
+        """get_recipe_details without blocking the event loop"""
+        endpoint, params = self._details_request(recipe_id)
+        async with httpx.AsyncClient(timeout=request_timeout(self.timeout)) as client:
+            response = await client.get(endpoint, params=params)
+        return response.json()
+    
+    def _details_request(self, recipe_id: int):
         endpoint = f"{self.base_url}/recipes/{recipe_id}/information"
         
         params = {
             'apiKey': self.api_key,
-            'includeNutrition': False  # Save API points
+            'includeNutrition': 'False'  # Save API points (a string - see _search_request)
         }
-        
-        response = requests.get(endpoint, params=params)
-        return response.json()
+        return endpoint, params
 
     def convert_to_recipegen_format(self, spoon_recipe: Dict) -> Dict:
         """Convert Spoonacular format to RecipeGen format"""
@@ -1,6 +1,7 @@
 import pytest
 import sys
 import os
+import time
 
 # 🔒 FORCE PROJECT ROOT INTO PYTHON PATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -12,3 +13,138 @@ def client():
     flask_app.config['TESTING'] = True
     with flask_app.test_client() as client:
         yield client
+
+
+def _create_master_db(db_path):
+    """Minimal copy of the create_recipe_database.py schema, seeded with a few recipes"""
+    import json
+    import sqlite3
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE recipes (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            cuisine TEXT,
+            dish_type TEXT,
+            ingredients JSON NOT NULL,
+            instructions JSON NOT NULL,
+            prep_time INTEGER,
+            cook_time INTEGER,
+            total_time INTEGER,
+            servings INTEGER,
+            difficulty TEXT,
+            source TEXT NOT NULL,
+            source_id TEXT,
+            source_url TEXT,
+            image_url TEXT,
+            video_url TEXT,
+            nutrition JSON,
+            tags JSON,
+            quality_score INTEGER DEFAULT 50,
+            download_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            times_served INTEGER DEFAULT 0,
+            user_rating REAL DEFAULT 0,
+            is_verified BOOLEAN DEFAULT FALSE
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE recipe_ingredients (
+            recipe_id TEXT,
+            ingredient_slug TEXT,
+            ingredient_name TEXT,
+            amount TEXT
+        )
+    ''')
+
+    seed = [
+        ('seed_1', 'Chicken Tinga', 'mexican', 'stew', ['chicken', 'tomato', 'onion'], 45, 90),
+        ('seed_2', 'Spicy Beef Chili', 'mexican', 'stew', ['beef', 'chili_pepper', 'tomato'], 60, 80),
+        ('seed_3', 'Black Bean Soup', 'mexican', 'soup', ['black_bean', 'onion', 'garlic'], 30, 70),
+        ('seed_4', 'Pad Krapow Gai', 'thai', 'stir-fry', ['chicken', 'basil', 'garlic'], 20, 85),
+    ]
+    for recipe_id, title, cuisine, dish_type, slugs, total_time, quality in seed:
+        ingredients = [{'name': s.replace('_', ' '), 'slug': s, 'amount': '1 cup'} for s in slugs]
+        conn.execute('''
+            INSERT INTO recipes (id, title, cuisine, dish_type, ingredients, instructions,
+                                 prep_time, cook_time, total_time, servings, source, quality_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (recipe_id, title, cuisine, dish_type, json.dumps(ingredients),
+              json.dumps([{'step': 1, 'instruction': f'Cook the {title}'}]),
+              10, total_time - 10, total_time, 4, 'fixture', quality))
+        for ing in ingredients:
+            conn.execute(
+                "INSERT INTO recipe_ingredients (recipe_id, ingredient_slug, ingredient_name, amount) VALUES (?, ?, ?, ?)",
+                (recipe_id, ing['slug'], ing['name'], ing['amount'])
+            )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def master_db(tmp_path):
+    """Path to a throwaway master recipe database"""
+    db_path = str(tmp_path / "recipegen_master.db")
+    _create_master_db(db_path)
+    return db_path
+
+
+@pytest.fixture
+def matcher(master_db):
+    """RecipeMatcher4D wired to the throwaway master database"""
+    from recipe_matcher_4d import RecipeMatcher4D
+
+    instance = RecipeMatcher4D(db_path=master_db)
+    instance.warm_up()
+    yield instance
+    instance.save_queue.close()
+    instance.db.close_all()
+
+
+class StubFetcher:
+    """Local stand-in for SpoonacularFetcher/TheMealDBFetcher"""
+
+    def __init__(self, recipes, search_delay=0.0, detail_delay=0.0):
+        self.recipes = {r['id']: r for r in recipes}
+        self.order = [r['id'] for r in recipes]
+        self.search_delay = search_delay
+        self.detail_delay = detail_delay
+        self.detail_calls = 0
+        self.searched = []
+
+    def search_recipes(self, cuisine, ingredients, number=10):
+        self.searched.append(cuisine)
+        time.sleep(self.search_delay)
+        return {'results': [{'id': i, 'title': self.recipes[i]['title']} for i in self.order[:number]]}
+
+    def is_quality_recipe(self, recipe):
+        return True
+
+    def get_recipe_details(self, recipe_id):
+        self.detail_calls += 1
+        time.sleep(self.detail_delay)
+        return self.recipes[recipe_id]
+
+    def convert_to_recipegen_format(self, recipe):
+        return {
+            'title': recipe['title'],
+            'dish_type': 'stew',
+            'all_ingredients': [{'name': i, 'slug': i} for i in recipe['ingredients']],
+        }
+
+
+def _stub_providers(*fetchers):
+    return [(f'stub{i}', {'fetcher': f, 'name': f'Stub{i}', 'enabled': True, 'priority': i})
+            for i, f in enumerate(fetchers, 1)]
+
+
+@pytest.fixture
+def stub_fetcher():
+    return StubFetcher
+
+
+@pytest.fixture
+def stub_providers():
+    """Build a sorted_providers list (priority = argument order) from stub fetchers"""
+    return _stub_providers
@@ -0,0 +1,69 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_higher_priority_hit_wins_even_if_slower(matcher, stub_fetcher, stub_providers):
+    slow = stub_fetcher([{'id': 1, 'title': 'Slow Chicken Stew', 'ingredients': ['chicken']}], detail_delay=0.2)
+    fast = stub_fetcher([{'id': 2, 'title': 'Fast Chicken Stew', 'ingredients': ['chicken']}])
+    matcher.sorted_providers = stub_providers(slow, fast)
+
+    result = matcher._search_all_apis('mexican', ['chicken'], 'stew')
+    assert result['title'] == 'Slow Chicken Stew'
+    assert result['source_api'] == 'Stub1'
+
+
+def test_falls_through_to_next_provider_on_miss(matcher, stub_fetcher, stub_providers):
+    miss = stub_fetcher([{'id': 1, 'title': 'Beef Stew', 'ingredients': ['beef']}])
+    hit = stub_fetcher([{'id': 2, 'title': 'Chicken Stew', 'ingredients': ['chicken']}])
+    matcher.sorted_providers = stub_providers(miss, hit)
+
+    assert matcher._search_all_apis('mexican', ['chicken'], 'stew')['source_api'] == 'Stub2'
+
+
+def test_providers_and_details_run_concurrently(matcher, stub_fetcher, stub_providers):
+    recipes = [{'id': i, 'title': f'Beef Stew {i}', 'ingredients': ['beef']} for i in range(3)]
+    first = stub_fetcher(recipes + [{'id': 9, 'title': 'Chicken Stew', 'ingredients': ['chicken']}],
+                        search_delay=0.2, detail_delay=0.2)
+    second = stub_fetcher([{'id': 5, 'title': 'Other Chicken Stew', 'ingredients': ['chicken']}],
+                         search_delay=0.2)
+    matcher.sorted_providers = stub_providers(first, second)
+    matcher.api_detail_fanout = 3
+
+    started = time.monotonic()
+    result = matcher._search_all_apis('mexican', ['chicken'], 'stew')
+    elapsed = time.monotonic() - started
+
+    assert result['title'] == 'Chicken Stew'
+    # Serial would be 0.2 + 4 * 0.2 + 0.2; fan-out is search + two detail batches
+    assert elapsed < 0.9
+
+
+def test_slow_provider_is_abandoned_after_timeout(matcher, stub_fetcher, stub_providers):
+    stuck = stub_fetcher([{'id': 1, 'title': 'Chicken Stew', 'ingredients': ['chicken']}], search_delay=1.5)
+    backup = stub_fetcher([{'id': 2, 'title': 'Backup Chicken Stew', 'ingredients': ['chicken']}])
+    matcher.sorted_providers = stub_providers(stuck, backup)
+    matcher.api_provider_timeout = 0.2
+
+    started = time.monotonic()
+    result = matcher._search_all_apis('mexican', ['chicken'], 'stew')
+    assert result['source_api'] == 'Stub2'
+    assert time.monotonic() - started < 1.0
+
+
+def test_provider_timeout_starts_when_a_worker_picks_it_up(matcher, stub_fetcher, stub_providers):
+    miss = stub_fetcher([{'id': 1, 'title': 'Beef Stew', 'ingredients': ['beef']}], search_delay=0.15)
+    hit = stub_fetcher([{'id': 2, 'title': 'Chicken Stew', 'ingredients': ['chicken']}], detail_delay=0.1)
+    matcher.sorted_providers = stub_providers(miss, hit)
+    matcher.api_provider_timeout = 0.2
+    # One worker: the second provider queues 0.15s behind the first, then needs 0.1s itself
+    matcher._provider_executor = ThreadPoolExecutor(max_workers=1)
+
+    assert matcher._search_all_apis('mexican', ['chicken'], 'stew')['source_api'] == 'Stub2'
+    matcher._provider_executor.shutdown()
+
+
+def test_sequential_mode_still_available(matcher, stub_fetcher, stub_providers):
+    hit = stub_fetcher([{'id': 2, 'title': 'Chicken Stew', 'ingredients': ['chicken']}])
+    matcher.sorted_providers = stub_providers(hit)
+    matcher.concurrent_api_search = False
+    assert matcher._search_all_apis('mexican', ['chicken'], 'stew')['title'] == 'Chicken Stew'
@@ -0,0 +1,74 @@
+import asyncio
+import sqlite3
+import time
+
+
+class AsyncStubFetcher:
+    """Provider with native coroutines (like the httpx-based fetchers)"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.searched = []
+
+    async def search_recipes_async(self, cuisine, ingredients, number=10):
+        self.searched.append(cuisine)
+        await asyncio.sleep(self.delay)
+        return {'results': [{'id': '-'.join(ingredients), 'title': 'Thai Chicken Stew'}]}
+
+    async def get_recipe_details_async(self, recipe_id):
+        await asyncio.sleep(self.delay)
+        return {'id': recipe_id}
+
+    def is_quality_recipe(self, recipe):
+        return True
+
+    def convert_to_recipegen_format(self, recipe):
+        return {'id': recipe['id'], 'title': f"Thai Chicken Stew {recipe['id']}", 'dish_type': 'stew',
+                'all_ingredients': [{'name': 'chicken', 'slug': 'chicken'}],
+                'ingredients': [{'name': 'chicken', 'slug': 'chicken'}]}
+
+
+def test_local_hit_and_blocking_fetchers_work_from_the_event_loop(matcher, stub_fetcher, stub_providers):
+    blocking = stub_fetcher([{'id': 1, 'title': 'Chicken Khao Soi', 'ingredients': ['chicken']}])
+    matcher.sorted_providers = stub_providers(blocking)
+
+    local = asyncio.run(matcher.find_recipe_async('mexican', ['chicken'], 'stew'))
+    api = asyncio.run(matcher.find_recipe_async('thai', ['chicken'], 'stew'))
+
+    assert local['title'] == 'Chicken Tinga'
+    assert api['title'] == 'Chicken Khao Soi'
+    assert blocking.searched == ['thai']
+
+
+def test_cascades_overlap_on_one_loop_and_save_results(matcher, stub_providers, master_db):
+    fetcher = AsyncStubFetcher(delay=0.2)
+    matcher.sorted_providers = stub_providers(fetcher)
+
+    async def run_all():
+        return await asyncio.gather(*[
+            matcher.find_recipe_async('thai', ['chicken', f'herb{i}'], 'stew') for i in range(5)
+        ])
+
+    started = time.perf_counter()
+    recipes = asyncio.run(run_all())
+    elapsed = time.perf_counter() - started
+
+    assert [r['source_api'] for r in recipes] == ['Stub1'] * 5
+    assert elapsed < 1.0  # 5 cascades x (search + details) x 0.2s if they ran one by one
+    matcher.flush_saves()
+    conn = sqlite3.connect(master_db)
+    saved = conn.execute("SELECT COUNT(*) FROM recipes WHERE source = 'Stub1'").fetchone()[0]
+    conn.close()
+    assert saved == 5
+
+
+def test_spoonacular_sync_and_async_requests_send_the_same_query():
+    import httpx
+    import requests
+    from spoonacular_fetcher import SpoonacularFetcher
+
+    fetcher = SpoonacularFetcher('key')
+    for endpoint, params in (fetcher._search_request('thai', ['chicken'], 10), fetcher._details_request(7)):
+        sync_url = requests.Request('GET', endpoint, params=params).prepare().url
+        async_url = str(httpx.Request('GET', endpoint, params=params).url)
+        assert sync_url == async_url
@@ -0,0 +1,37 @@
+import threading
+
+
+def test_results_keep_input_order_and_share_identical_requests(matcher, monkeypatch):
+    cascades = []
+    real_cascade = matcher._run_cascade
+
+    def counting_cascade(cuisine, *args, **kwargs):
+        cascades.append(cuisine)
+        return real_cascade(cuisine, *args, **kwargs)
+
+    monkeypatch.setattr(matcher, '_run_cascade', counting_cascade)
+    results = matcher.find_recipes([
+        {'cuisine': 'mexican', 'ingredients': ['chicken'], 'dish_type': 'stew'},
+        {'cuisine': 'thai', 'ingredients': ['chicken'], 'dish_type': 'stir-fry'},
+        {'cuisine': 'Mexican', 'ingredients': ['Chicken'], 'dish_type': 'stew'},
+        {'ingredients': ['chicken']},
+    ])
+
+    assert [r['recipe'] and r['recipe']['title'] for r in results] == \
+        ['Chicken Tinga', 'Pad Krapow Gai', 'Chicken Tinga', None]
+    assert [r['shared'] for r in results] == [False, False, True, False]
+    assert results[3]['error'] == 'invalid request'
+    assert results[2]['recipe'] is not results[0]['recipe']
+    assert all(r['elapsed_ms'] >= 0 for r in results)
+    assert sorted(cascades) == ['mexican', 'thai']
+
+
+def test_cascade_state_is_per_thread(matcher):
+    matcher.sister_countries_tried = ['guatemalan']
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(matcher.sister_countries_tried))
+    worker.start()
+    worker.join()
+
+    assert seen == [[]]
+    assert matcher.sister_countries_tried == ['guatemalan']
@@ -0,0 +1,34 @@
+import benchmark_cascade
+from benchmark_cascade import StubProvider, compare, load_workload, run_benchmark
+
+
+def _small_workload():
+    workload = load_workload(benchmark_cascade.DEFAULT_WORKLOAD)
+    return {'recipes': workload['recipes'], 'requests': workload['requests'][:6]}
+
+
+def test_stub_provider_hits_are_deterministic():
+    provider = StubProvider('Spoonacular', latency_ms=0, hit_rate=0.5)
+    first = [bool(provider.search_recipes(c, ['chicken'])['results']) for c in ('thai', 'mexican', 'greek', 'indian')]
+    again = [bool(provider.search_recipes(c, ['chicken'])['results']) for c in ('thai', 'mexican', 'greek', 'indian')]
+    assert first == again
+    assert provider.calls == 8
+
+
+def test_run_benchmark_reports_throughput_latency_and_allocations():
+    report = run_benchmark(_small_workload(), concurrency=2, provider_latency_ms=0, ai_latency_ms=0)
+
+    assert report['meta']['requests'] == 6
+    assert report['errors'] == 0
+    assert report['throughput_rps'] > 0
+    assert report['requests']['count'] == 6
+    assert report['requests']['p50_ms'] <= report['requests']['p95_ms'] <= report['requests']['p99_ms']
+    assert 'level1' in report['levels']
+    assert report['allocations']['peak_kb'] > 0
+
+
+def test_compare_reports_deltas():
+    report = run_benchmark(_small_workload(), concurrency=1, provider_latency_ms=0, ai_latency_ms=0)
+    delta = compare(report, report)
+    assert delta['requests'] == {'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0}
+    assert delta['level1'] == {'p50_ms': 0.0, 'p95_ms': 0.0}
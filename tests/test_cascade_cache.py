@@ -0,0 +1,113 @@
+from cascade_cache import CascadeCache, normalize_request
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_ignores_ingredient_order_and_case():
+    assert normalize_request('Mexican', ['Tomato', 'chicken'], 'stew') == \
+        normalize_request('mexican ', ['chicken', 'tomato'], 'Stew')
+    assert normalize_request('mexican', ['chicken'], 'stew', spice_level='hot') != \
+        normalize_request('mexican', ['chicken'], 'stew')
+
+
+def test_lru_eviction_ttl_and_copies():
+    clock = FakeClock()
+    cache = CascadeCache(max_entries=2, ttl=10, clock=clock)
+    a, b, c = (normalize_request(x, ['chicken'], 'stew') for x in ('thai', 'mexican', 'greek'))
+
+    cache.put(a, {'title': 'A'})
+    cache.put(b, {'title': 'B'})
+    cache.get(a)['title'] = 'mutated'     # Callers get a private copy
+    cache.put(c, {'title': 'C'})          # Evicts b (least recently used)
+
+    assert cache.get(a) == {'title': 'A'}
+    assert cache.get(b) is None
+    clock.now = 11
+    assert cache.get(c) is None
+
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['expirations']) == (2, 2, 1, 1)
+
+
+def test_negative_entries_expire_sooner_and_invalidate_by_cuisine():
+    clock = FakeClock()
+    cache = CascadeCache(ttl=100, negative_ttl=5, clock=clock)
+    empty = ('api', 'thai', ('coconut_milk', 'curry'), 'curry')
+    cache.record_empty(empty, 'Thai')
+    cache.put(normalize_request('thai', ['chicken'], 'curry'), {'title': 'Green Curry'})
+
+    assert cache.is_known_empty(empty)
+    assert cache.invalidate_cuisine('thai') == 2
+    assert not cache.is_known_empty(empty)
+
+    cache.record_empty(empty, 'thai')
+    clock.now = 6
+    assert not cache.is_known_empty(empty)
+
+
+def test_find_recipe_is_memoized_until_cuisine_gets_new_recipe(matcher, stub_fetcher, stub_providers):
+    api = stub_fetcher([{'id': 7, 'title': 'Thai Lamb Stew', 'ingredients': ['lamb']}])
+    matcher.sorted_providers = stub_providers(api)
+    first = matcher.find_recipe('thai', ['lamb'], 'stew')
+    first['chef_secrets'] = ['added by the caller']
+    second = matcher.find_recipe('Thai', ['lamb'], 'stew')
+
+    assert second['title'] == 'Thai Lamb Stew'
+    assert 'chef_secrets' not in second
+    assert matcher.result_cache.get_stats()['hits'] == 1
+
+    matcher.flush_saves()   # The API recipe lands in the local database - and stays the cached answer
+    assert matcher.result_cache.get_stats()['entries'] == 1
+    assert matcher.find_recipe('thai', ['lamb'], 'stew')['title'] == 'Thai Lamb Stew'
+    assert matcher.result_cache.get_stats()['hits'] == 2
+    matcher._save_to_local_db({'id': 78, 'title': 'Massaman Lamb', 'cuisine': 'thai',
+                               'dish_type': 'stew', 'source_api': 'Stub1', 'quality_score': 99,
+                               'ingredients': [{'name': 'lamb', 'slug': 'lamb'}]})
+    matcher.flush_saves()
+    assert matcher.result_cache.get_stats()['entries'] == 0
+    assert matcher.find_recipe('thai', ['lamb'], 'stew')['source'] == 'local_database'
+    assert matcher.result_cache.get_stats()['misses'] == 2
+
+
+def test_local_recipes_are_not_memoized_so_variety_and_served_counts_continue(matcher):
+    for _ in range(3):
+        assert matcher.find_recipe('mexican', ['chicken'], 'stew')['title'] == 'Chicken Tinga'
+
+    served = matcher.db.read_connection().execute(
+        "SELECT times_served FROM recipes WHERE id = 'seed_1'").fetchone()[0]
+    assert served == 3
+    assert matcher.result_cache.get_stats()['hits'] == 0
+
+
+def test_empty_api_level_is_not_searched_twice(matcher, stub_fetcher, stub_providers):
+    miss = stub_fetcher([{'id': 1, 'title': 'Beef Stew', 'ingredients': ['beef']}])
+    matcher.sorted_providers = stub_providers(miss)
+
+    assert matcher._search_all_apis('thai', ['chicken'], 'stew') is None
+    assert matcher._search_all_apis('Thai', ['chicken'], 'stew') is None
+    assert miss.searched == ['thai']
+
+
+def test_level1_errors_are_not_remembered_as_empty(matcher, monkeypatch):
+    import sqlite3
+
+    def locked(recipe_id):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(matcher, '_record_served', locked)
+    assert matcher._search_level1('mexican', ['chicken'], 'stew')['title'] == 'Chicken Tinga'
+
+    def broken(*args, **kwargs):
+        raise sqlite3.OperationalError('disk I/O error')
+
+    monkeypatch.setattr(matcher, '_rank_local_candidates', broken)
+    assert matcher._search_level1('mexican', ['beef'], 'stew') is None
+    monkeypatch.undo()
+    assert matcher._search_level1('mexican', ['beef'], 'stew')['title'] == 'Spicy Beef Chili'
+    assert matcher.result_cache.get_stats()['negative_entries'] == 0
@@ -0,0 +1,50 @@
+import time
+
+from cascade_deadline import Deadline, request_timeout, time_left, use_deadline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_levels_get_their_slice_and_leave_the_reserve():
+    clock = FakeClock()
+    deadline = Deadline(6.0, clock=clock)
+
+    with use_deadline(deadline):
+        assert request_timeout(15.0) == 6.0
+        with deadline.level('level2', share=0.5, reserve=2.5):
+            assert deadline.remaining() == 3.0
+            clock.now = 1.0
+            assert request_timeout(15.0) == 2.0
+            assert request_timeout(0.5) == 0.5
+        with deadline.level('level3', share=0.5, reserve=2.5):
+            assert deadline.remaining() == 2.5   # 6 - 1 - 2.5 reserve, not 3.0
+            clock.now = 4.0
+            assert time_left() == 0.0
+
+    report = deadline.report()
+    assert report['levels'] == {'level2': 1.0, 'level3': 3.0}
+    assert report['remaining_s'] == 2.0
+    assert request_timeout(15.0) == 15.0 and time_left() is None
+
+
+def test_slow_providers_cannot_blow_the_budget(matcher, stub_fetcher, stub_providers):
+    slow = stub_fetcher([{'id': 1, 'title': 'Chicken Khao Soi', 'ingredients': ['chicken']}],
+                        search_delay=2.0)
+    matcher.sorted_providers = stub_providers(slow, slow)
+    matcher.ai_reserve_seconds = 0.2
+
+    started = time.perf_counter()
+    result = matcher.find_recipe('thai', ['chicken'], 'stew', deadline=1.0)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.5
+    assert result['type'] == 'generation_failed'
+    assert result['alternatives'] == []
+    assert 'level2' in result['timing']['levels']
+    assert 'level4' in result['timing']['skipped']
@@ -0,0 +1,66 @@
+import sqlite3
+
+from level_predictor import CascadeOutcomePredictor, CascadeTrace, ensure_stats_table
+
+
+class InstantChef:
+    min_attempt_seconds = 0.1
+
+    def generate_recipe(self, cuisine, dish_type, ingredients):
+        return {'title': f'AI {cuisine} {dish_type}', 'instructions': [f'step {i}' for i in range(6)],
+                'ingredients': [{'name': 'chicken'}]}
+
+
+def test_route_skips_dead_levels_reorders_and_explores():
+    predictor = CascadeOutcomePredictor(min_samples=5, explore_every=4)
+    for _ in range(10):
+        predictor.record('peruvian', 'stew', 4)        # Levels 2 and 3 never answer
+        predictor.record('korean', 'soup', 3)          # Level 3 always answers, Level 2 never
+
+    assert predictor.route('peruvian', 'stew') == []
+    assert predictor.route('korean', 'soup') == [3]
+    assert predictor.route('french', 'tart') == [2, 3]  # no history - fixed order
+    predictor.route('peruvian', 'stew')
+    predictor.route('peruvian', 'stew')
+    assert predictor.route('peruvian', 'stew') == [2, 3]  # every 4th request explores
+
+
+def test_statistics_survive_a_flush_and_reload():
+    conn = sqlite3.connect(':memory:')
+    ensure_stats_table(conn)
+    predictor = CascadeOutcomePredictor()
+    trace = CascadeTrace()
+    with trace.level(2):
+        trace.count_api_call()
+        trace.count_api_call()
+    trace.resolved(2)
+    predictor.record_trace('Thai', 'Stew', trace)
+    predictor.record_trace('thai', 'stew', trace)
+
+    assert predictor.flush(conn) == 1 and predictor.pending() == 0
+    reloaded = CascadeOutcomePredictor()
+    reloaded.load(conn)
+    level2 = reloaded.get_stats()['thai/stew']['level2']
+    assert level2['attempts'] == 2 and level2['hits'] == 2 and level2['avg_api_calls'] == 2.0
+
+
+def test_matcher_skips_levels_that_never_answer(matcher, stub_fetcher, stub_providers, master_db):
+    fetcher = stub_fetcher([])
+    matcher.sorted_providers = stub_providers(fetcher)
+    matcher.ai_chef = InstantChef()
+    for _ in range(10):
+        matcher.outcome_predictor.record('ethiopian', 'stew', 4)
+
+    result = matcher.find_recipe('ethiopian', ['chicken'], 'stew')
+    matcher.flush_outcomes()
+
+    assert result['source'] == 'ai_chef'
+    from recipe_matcher_4d import RecipeMatcher4D
+    restarted = RecipeMatcher4D(db_path=master_db)
+    try:
+        table = restarted.get_routing_table()['ethiopian/stew']
+        assert table['level2']['attempts'] == 10 and table['level3']['attempts'] == 10  # not tried again
+        assert table['level4']['attempts'] == 11
+        assert restarted.outcome_predictor.route('ethiopian', 'stew') == []
+    finally:
+        restarted.db.close_all()
@@ -0,0 +1,55 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from cascade_tracing import LatencyHistogram, Tracer, span, traced
+
+
+def test_histogram_percentiles_use_bucket_upper_bounds():
+    histogram = LatencyHistogram()
+    for ms in [3] * 90 + [150] * 9 + [4000]:
+        histogram.observe(ms, 'hit')
+
+    summary = histogram.summary()
+    assert (summary['p50_ms'], summary['p95_ms'], summary['p99_ms']) == (5.0, 200.0, 200.0)
+    assert summary['max_ms'] == 4000 and summary['outcomes'] == {'hit': 100}
+
+
+def test_spans_nest_across_threads_and_land_in_the_jsonl_trace(tmp_path):
+    trace_path = tmp_path / 'traces.jsonl'
+    tracer = Tracer(trace_path=str(trace_path))
+
+    @traced('provider.details', tags=lambda provider: {'provider': provider})
+    def details(provider):
+        return {'id': 1} if provider == 'Spoonacular' else None
+
+    with tracer.trace('find_recipe', cuisine='thai'):
+        with span('level2'):
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [pool.submit(copy_context().run, details, p) for p in ['Spoonacular', 'TheMealDB']]
+                [future.result() for future in futures]
+    assert details('Spoonacular') == {'id': 1}  # outside a trace: no span, no histogram
+
+    metrics = tracer.get_metrics()
+    assert metrics['provider.details']['count'] == 2
+    assert metrics['provider.details[TheMealDB]']['outcomes'] == {'miss': 1}
+    assert tracer.flush(timeout=5)
+    tracer.close()
+    record = json.loads(trace_path.read_text().splitlines()[0])
+    assert record['tags'] == {'cuisine': 'thai'}
+    assert sorted(s['tags']['provider'] for s in record['spans'][0]['spans']) == ['Spoonacular', 'TheMealDB']
+
+
+def test_find_recipe_reports_levels_providers_and_db_queries(matcher, stub_fetcher, stub_providers):
+    matcher.sorted_providers = stub_providers(stub_fetcher([{'id': 1, 'title': 'Chicken Khao Soi',
+                                                             'ingredients': ['chicken']}]))
+
+    matcher.find_recipe('thai', ['chicken'], 'stew')
+    matcher.find_recipe('thai', ['chicken'], 'stew')
+
+    metrics = matcher.get_metrics()
+    assert metrics['find_recipe']['outcomes'] == {'hit': 1, 'cached': 1}
+    assert metrics['level1']['count'] == 1 and metrics['level2']['count'] == 1
+    assert metrics['provider.search[Stub1]']['outcomes'] == {'hit': 1}
+    assert metrics['provider.details[Stub1]']['count'] >= 1
+    assert metrics['db.local_search']['count'] >= 1
@@ -0,0 +1,63 @@
+import json
+import os
+
+from config_registry import ConfigRegistry
+
+
+def _write(path, data, mtime=None):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_parses_once_and_reloads_on_change(tmp_path):
+    cfg = tmp_path / "families.json"
+    _write(cfg, {'chicken': {'includes': ['chicken_breast']}}, mtime=1000)
+    registry = ConfigRegistry(tmp_path, check_interval=0)
+
+    first = registry.get('families.json')
+    assert registry.get('families.json') is first
+    version = registry.version
+
+    _write(cfg, {'beef': {'includes': ['beef_ribs']}}, mtime=2000)
+    assert 'beef' in registry.get('families.json')
+    assert registry.version > version
+    assert registry.stats['loads'] == 2
+
+
+def test_touch_without_content_change_keeps_version(tmp_path):
+    cfg = tmp_path / "config.json"
+    _write(cfg, {'a': 1}, mtime=1000)
+    registry = ConfigRegistry(tmp_path, check_interval=0)
+    registry.get('config.json')
+    version = registry.version
+
+    os.utime(cfg, (3000, 3000))
+    registry.get('config.json')
+    assert registry.version == version
+    assert registry.stats['reloads_skipped'] == 1
+
+
+def test_derived_structures_rebuild_per_version(tmp_path):
+    cfg = tmp_path / "config.json"
+    _write(cfg, {'words': ['stew', 'soup']}, mtime=1000)
+    registry = ConfigRegistry(tmp_path, check_interval=0)
+    builds = []
+
+    def build(data):
+        builds.append(1)
+        return frozenset(data['words'])
+
+    assert registry.derive('config.json', 'words', build) == {'stew', 'soup'}
+    registry.derive('config.json', 'words', build)
+    assert len(builds) == 1
+
+    _write(cfg, {'words': ['curry']}, mtime=2000)
+    assert registry.derive('config.json', 'words', build) == {'curry'}
+    assert len(builds) == 2
+
+
+def test_missing_file_returns_default(tmp_path):
+    registry = ConfigRegistry(tmp_path)
+    assert registry.get('nope.json', {'x': 1}) == {'x': 1}
+    assert registry.derive('nope.json', 'n', lambda data: data is None) is True
@@ -0,0 +1,68 @@
+import sqlite3
+
+from cuisine_affinity import CuisineAffinityMatrix
+
+INDICATORS = [
+    ('italian', ('tomato', 'basil', 'olive', 'garlic', 'pasta')),
+    ('thai', ('lemongrass', 'coconut milk', 'basil', 'lime', 'fish sauce')),
+    ('mexican', ('chili pepper', 'cilantro', 'lime', 'tomato', 'corn')),
+]
+
+
+def _nested_loop_fit(ingredients):
+    """The scoring _analyze_ingredient_cuisine_fit did before the matrix"""
+    scores = {}
+    for cuisine, indicators in INDICATORS:
+        matched = []
+        for ingredient in ingredients:
+            term = ingredient.lower().replace('_', ' ').replace('-', ' ')
+            if any(ind in term or term in ind for ind in indicators):
+                matched.append(ingredient)
+        if matched:
+            scores[cuisine] = matched
+    return sorted(((c, len(m), m) for c, m in scores.items()), key=lambda item: -item[1])
+
+
+def test_cuisine_fit_matches_nested_loop_scoring():
+    affinity = CuisineAffinityMatrix()
+    affinity.sync(indicators=INDICATORS)
+    for ingredients in (['coconut_milk', 'lime', 'thai_basil'], ['cherry_tomato', 'corn', 'lime'],
+                        ['olive_oil', 'garlic', 'spaghetti_pasta'], ['beef'], []):
+        assert affinity.cuisine_fit(ingredients) == _nested_loop_fit(ingredients)
+
+
+def test_typical_ingredients_rank_tags_and_db_frequency_and_rebuild_incrementally():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE cuisine_ingredient_affinity (cuisine TEXT, ingredient_slug TEXT, frequency REAL)')
+    conn.execute("INSERT INTO cuisine_ingredient_affinity VALUES ('thai', 'lime', 0.6)")
+
+    def read_rows(known):
+        signature = conn.execute('SELECT COUNT(*), TOTAL(frequency) FROM cuisine_ingredient_affinity').fetchone()
+        rows = conn.execute('SELECT cuisine, ingredient_slug, frequency FROM cuisine_ingredient_affinity').fetchall()
+        return signature, None if signature == known else rows
+
+    tags = {'lemongrass': ['Thai'], 'lime': ['thai', 'mexican'], 'basil': ['italian', 'thai']}
+    affinity = CuisineAffinityMatrix(check_interval=0)
+    affinity.sync(indicators=INDICATORS, ingredient_cuisines=tags, affinity_rows=read_rows)
+    assert affinity.typical_ingredients(['thai']) == ['lime', 'lemongrass', 'basil']
+    assert affinity.typical_ingredients(['thai', 'italian'], k=1) == ['basil']
+    assert affinity.typical_ingredients(['nordic']) == []
+
+    affinity.sync(indicators=INDICATORS, ingredient_cuisines=tags, affinity_rows=read_rows)
+    assert affinity.stats['indicator_builds'] == 1
+    assert affinity.stats['typical_builds'] == 1
+
+    conn.execute("INSERT INTO cuisine_ingredient_affinity VALUES ('thai', 'fish_sauce', 0.9)")
+    affinity.sync(indicators=INDICATORS, ingredient_cuisines=tags, affinity_rows=read_rows)
+    assert affinity.stats['indicator_builds'] == 1
+    assert affinity.stats['typical_builds'] == 2
+    assert affinity.typical_ingredients(['thai']) == ['lime', 'lemongrass', 'basil', 'fish_sauce']
+
+
+def test_matcher_suggestions_use_the_affinity_matrix(matcher):
+    suggestions = matcher._analyze_ingredient_cuisine_fit(['coconut_milk', 'lemongrass', 'fish_sauce'])
+    assert suggestions[0]['cuisine'] == 'thai'
+
+    tagged = [slug for slug, cuisines in matcher.ingredient_cuisines.items()
+              if 'italian' in [c.lower() for c in cuisines or []]][:8]
+    assert matcher._get_cuisine_typical_ingredients('italian') == tagged
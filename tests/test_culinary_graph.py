@@ -0,0 +1,50 @@
+from culinary_graph import CulinaryGraph
+
+REGIONS = {
+    'regions': {
+        'latin_american': {'name': 'Latin American', 'subregions': {
+            'andean': {'name': 'Andean', 'countries': ['peruvian', 'bolivian', 'chilean']},
+        }},
+        'asian': {'name': 'Asian', 'subregions': {
+            'southeast_asian': {'name': 'Southeast Asian', 'countries': ['thai', 'vietnamese']},
+        }},
+    },
+    'country_to_spoonacular': {'peruvian': 'latin american', 'chilean': 'latin american', 'thai': 'thai'},
+}
+
+TAGS = {'quinoa': ['peruvian', 'bolivian'], 'lemongrass': ['thai', 'vietnamese'], 'chicken': []}
+
+
+def _loop_compatible(ingredients, country):
+    """The per-ingredient rule the graph replaces"""
+    incompatible = sum(1 for i in ingredients if TAGS.get(i) and country not in TAGS[i])
+    return incompatible < len(ingredients) / 2
+
+
+def test_region_lookup_and_sisters():
+    graph = CulinaryGraph(REGIONS, TAGS)
+    region = graph.region('bolivian')
+    assert (region['key'], region['name'], region['region_name']) == ('andean', 'Andean', 'Latin American')
+    assert graph.sisters('peruvian') == ['bolivian', 'chilean']
+    assert graph.region('klingon') is None
+
+
+def test_bitset_compatibility_matches_per_ingredient_loop():
+    graph = CulinaryGraph(REGIONS, TAGS)
+    requests = [['quinoa'], ['quinoa', 'chicken'], ['quinoa', 'lemongrass'], ['lemongrass', 'quinoa', 'chicken'],
+                ['chicken'], ['unknown'], []]
+    for ingredients in requests:
+        for country in ('peruvian', 'bolivian', 'chilean', 'thai', 'martian'):
+            assert graph.compatible(ingredients, country) == _loop_compatible(ingredients, country)
+    assert graph.compatible_sisters('peruvian', ['quinoa']) == ['bolivian']
+    assert graph.compatible_sisters('peruvian', ['quinoa', 'chicken', 'rice']) == ['bolivian', 'chilean']
+    assert graph.compatible_with_spoonacular(['lemongrass'], 'thai')
+    assert not graph.compatible_with_spoonacular(['lemongrass'], 'latin american')
+
+
+def test_matcher_recompiles_when_region_data_is_replaced(matcher):
+    matcher.culinary_regions = REGIONS
+    matcher.country_to_spoonacular = REGIONS['country_to_spoonacular']
+    matcher.ingredient_cuisines = TAGS
+    assert matcher._compatible_sister_countries('peruvian', ['quinoa']) == ['bolivian']
+    assert matcher._get_region_for_country('thai')['key'] == 'southeast_asian'
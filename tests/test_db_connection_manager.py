@@ -0,0 +1,70 @@
+import sqlite3
+import threading
+
+import pytest
+
+from db_connection_manager import ConnectionManager
+
+
+def test_read_connection_is_reused_per_thread(master_db):
+    manager = ConnectionManager(master_db)
+    first = manager.read_connection()
+    second = manager.read_connection()
+    assert first is second
+
+    other = {}
+    t = threading.Thread(target=lambda: other.setdefault('conn', manager.read_connection()))
+    t.start()
+    t.join()
+    assert other['conn'] is not first
+
+    stats = manager.get_stats()
+    assert stats['read_reused'] == 1
+    assert stats['read_opened'] + stats['read_recycled'] == 2
+    manager.close_all()
+
+
+def test_read_connection_is_query_only(master_db):
+    manager = ConnectionManager(master_db)
+    with pytest.raises(sqlite3.OperationalError):
+        manager.read_connection().execute("DELETE FROM recipes")
+    manager.close_all()
+
+
+def test_writer_commits_and_counts_waits(master_db):
+    manager = ConnectionManager(master_db)
+    with manager.writer() as conn:
+        conn.execute("UPDATE recipes SET times_served = 5 WHERE id = 'seed_1'")
+
+    row = manager.read_connection().execute(
+        "SELECT times_served FROM recipes WHERE id = 'seed_1'").fetchone()
+    assert row[0] == 5
+    assert manager.get_stats()['writes'] == 1
+    manager.close_all()
+
+
+def test_writer_rolls_back_on_error(master_db):
+    manager = ConnectionManager(master_db)
+    with pytest.raises(RuntimeError):
+        with manager.writer() as conn:
+            conn.execute("UPDATE recipes SET times_served = 9 WHERE id = 'seed_1'")
+            raise RuntimeError("boom")
+
+    row = manager.read_connection().execute(
+        "SELECT times_served FROM recipes WHERE id = 'seed_1'").fetchone()
+    assert row[0] == 0
+    manager.close_all()
+
+
+def test_connections_of_dead_threads_are_untracked_when_closed(master_db):
+    manager = ConnectionManager(master_db, max_idle=0)
+    for _ in range(5):
+        t = threading.Thread(target=manager.read_connection)
+        t.start()
+        t.join()
+
+    stats = manager.get_stats()
+    assert stats['read_opened'] == 5
+    assert stats['idle_connections'] == 0
+    assert stats['open_connections'] == 0
+    manager.close_all()
@@ -0,0 +1,67 @@
+from ingredient_index import IngredientIndex
+from db_connection_manager import ConnectionManager
+
+
+def _build(master_db):
+    manager = ConnectionManager(master_db)
+    index = IngredientIndex().build(manager.read_connection())
+    manager.close_all()
+    return index
+
+
+def test_candidates_intersect_cuisine_dish_type_and_ingredients(master_db):
+    index = _build(master_db)
+    assert len(index.candidates('mexican')) == 3
+    assert len(index.candidates('mexican', 'stew')) == 2
+    assert len(index.candidates('mexican', 'stew', ['chicken', 'lamb'])) == 1
+    assert index.candidates('mexican', None, ['basil']) == []
+    assert index.candidates('japanese') == []
+
+
+def test_add_recipe_keeps_postings_sorted(master_db):
+    index = _build(master_db)
+    index.add_recipe(100, 'mexican', 'stew', ['lamb', 'onion'])
+    index.add_recipe(50, 'mexican', 'soup', ['lamb'])
+    assert index.candidates('mexican', None, ['lamb']) == [50, 100]
+    assert list(index.by_ingredient['onion']) == sorted(index.by_ingredient['onion'])
+
+
+def test_memory_footprint_reports_postings(master_db):
+    footprint = _build(master_db).memory_footprint()
+    assert footprint['recipes'] == 4
+    assert footprint['cuisines']['keys'] == 2
+    assert footprint['ingredients']['postings'] == 12
+    assert footprint['bytes'] > 0
+
+
+def test_candidates_match_set_intersection():
+    index = IngredientIndex()
+    for rowid in range(1, 200):
+        slugs = [s for s, step in (('onion', 2), ('lamb', 3), ('rice', 7)) if rowid % step == 0]
+        index.add_recipe(rowid, 'mexican' if rowid % 5 else 'thai', 'stew' if rowid % 4 else 'soup', slugs)
+
+    expected = sorted(r for r in range(1, 200)
+                      if r % 5 and r % 4 and (r % 3 == 0 or r % 7 == 0))
+    assert index.candidates('mexican', 'stew', ['lamb', 'rice', 'lamb']) == expected
+    assert index.candidates('thai', 'soup', ['basil']) == []
+
+
+def test_containing_counts_shared_ingredients_within_the_cuisine(master_db):
+    index = _build(master_db)
+    index.add_recipe(100, 'mexican', 'tacos', ['chicken', 'tomato', 'lime', 'cilantro', 'tortilla'])
+    assert index.containing('mexican', ['chicken', 'tomato', 'onion'], 2) == [(1, 3), (100, 2)]
+    assert index.containing('mexican', ['chicken', 'tomato', 'onion'], 3) == [(1, 3)]
+    assert index.containing('thai', ['chicken', 'tomato'], 2) == []
+    assert index.containing('japanese', ['chicken'], 1) == []
+
+
+def test_is_current_notices_inserts_from_elsewhere(master_db):
+    manager = ConnectionManager(master_db)
+    index = IngredientIndex().build(manager.read_connection())
+    assert index.is_current(manager.read_connection())
+
+    with manager.writer() as conn:
+        conn.execute("INSERT INTO recipes (id, title, cuisine, ingredients, instructions, source) "
+                     "VALUES ('imported_1', 'Imported', 'mexican', '[]', '[]', 'import')")
+    assert not index.is_current(manager.read_connection())
+    manager.close_all()
@@ -0,0 +1,34 @@
+import random
+
+from keyword_matcher import KeywordMatcher
+
+
+def test_overlapping_and_nested_keywords_use_substring_semantics():
+    matcher = KeywordMatcher({'meat': ['ham', 'hamburger', 'bacon'],
+                              'spice': ['hot', 'very hot', 'pepper']})
+    assert matcher.scan('Graham Cracker') == {'meat': {'ham'}}
+    assert matcher.scan('VERY HOT hamburger') == {'meat': {'ham', 'hamburger'},
+                                                  'spice': {'hot', 'very hot'}}
+    assert matcher.matched_categories('shot of peppermint') == {'spice'}
+    assert not matcher.contains('tofu', 'meat')
+
+
+def test_matches_plain_substring_loops():
+    rng = random.Random(3)
+    alphabet = 'abch '
+    categories = {f'c{i}': [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+                            for _ in range(5)] for i in range(4)}
+    matcher = KeywordMatcher(categories)
+    for _ in range(300):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        expected = {c for c, words in categories.items() if any(w in text for w in words)}
+        assert matcher.matched_categories(text) == expected
+
+
+def test_matcher_uses_keywords_for_meat_spice_and_dish_type(matcher):
+    assert matcher.keywords.contains('[{"name": "Smoked Bacon"}]', 'meat')
+    assert matcher.keywords.contains('Extra Spicy Wings', 'spice_mismatch')
+
+    stir_fry = {'title': 'Garlic Wok Noodles', 'dish_type': 'noodles', 'prep_time': 10, 'cook_time': 10,
+                'steps': [{'instruction': 'Stir quickly in a wok over high heat'}]}
+    assert matcher._verify_dish_type_match(stir_fry, 'stir-fry')
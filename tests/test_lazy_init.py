@@ -0,0 +1,52 @@
+import threading
+import time
+
+from lazy_init import LazySingleton, lazy_component
+
+
+class Slow:
+    built = 0
+
+    def __init__(self):
+        time.sleep(0.05)
+        Slow.built += 1
+
+    @lazy_component
+    def part(self):
+        time.sleep(0.05)
+        return object()
+
+
+def test_singleton_and_components_are_built_once_on_first_use():
+    Slow.built = 0
+    singleton = LazySingleton(Slow)
+    assert not singleton.ready and Slow.built == 0
+
+    parts = []
+    threads = [threading.Thread(target=lambda: parts.append(singleton.part)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert Slow.built == 1 and singleton.ready
+    assert len({id(part) for part in parts}) == 1
+
+
+def test_matcher_construction_defers_db_fetchers_and_ai_chef(master_db):
+    from recipe_matcher_4d import RecipeMatcher4D
+
+    matcher = RecipeMatcher4D(db_path=master_db)
+    try:
+        for name in ('local_db_available', 'ingredient_index', 'api_providers', 'ai_chef', 'PROTEINS'):
+            assert not lazy_component.is_built(matcher, name)
+
+        assert matcher._search_local_database('mexican', ['chicken'], 'stew')['cuisine'] == 'mexican'
+        assert lazy_component.is_built(matcher, 'local_db_available')
+        assert not lazy_component.is_built(matcher, 'ai_chef')
+
+        matcher.warm_up()
+        assert lazy_component.is_built(matcher, 'ai_chef') and lazy_component.is_built(matcher, 'keywords')
+    finally:
+        matcher.save_queue.close()
+        matcher.db.close_all()
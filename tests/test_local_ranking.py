@@ -0,0 +1,48 @@
+import random
+
+from local_ranking import RankedCandidate, pick_for_variety
+
+
+def _save(matcher, recipe_id, title, total_time, quality, slugs=('chicken',)):
+    matcher._save_to_local_db({'id': recipe_id, 'title': title, 'cuisine': 'mexican', 'dish_type': 'stew',
+                               'source_api': 'Stub1', 'total_time': total_time, 'quality_score': quality,
+                               'ingredients': [{'name': s, 'slug': s} for s in slugs]})
+    matcher.flush_saves()
+
+
+def test_local_search_is_one_ranked_query(matcher):
+    statements = []
+    matcher.db.read_connection().set_trace_callback(statements.append)
+    recipe = matcher._search_local_database('mexican', ['chicken', 'tomato'], 'stew', count_served=False)
+    matcher.db.read_connection().set_trace_callback(None)
+
+    assert recipe['title'] == 'Chicken Tinga'
+    assert recipe['score_breakdown']['ingredients'] == 1.0
+    assert recipe['score_breakdown']['protein'] == 1.0
+    assert sum(1 for sql in statements if sql.lstrip().upper().startswith('SELECT')) == 1
+
+
+def test_time_limit_orders_candidates_but_filters_the_answer(matcher):
+    _save(matcher, 1, 'Slow Braised Chicken', 180, 99)
+    _save(matcher, 2, 'Untimed Chicken Stew', 0, 99)
+
+    ranked = matcher.rank_local_recipes('mexican', ['chicken'], 'stew', max_cooking_time='30')
+    # Quality 99 doesn't make up for six times the limit; 45 of 30 minutes keeps half the time fit
+    assert [(r['title'], r['breakdown']['time']) for r in ranked] == [('Untimed Chicken Stew', 0.5),
+                                                                      ('Chicken Tinga', 0.5),
+                                                                      ('Slow Braised Chicken', 0.0)]
+
+    # Nothing with a known time under the limit - Level 1 misses and the cascade moves on
+    assert matcher._search_local_database('mexican', ['chicken'], 'stew', max_cooking_time='10') is None
+    recipe = matcher._search_local_database('mexican', ['chicken'], 'stew', max_cooking_time='45')
+    assert recipe['title'] == 'Chicken Tinga'
+    assert 'partial_match' not in recipe
+
+
+def test_variety_pick_stays_within_near_ties_with_the_same_proteins():
+    def candidate(score, mask):
+        return RankedCandidate(('id', 'title'), score, {'time': 1.0}, mask, 1, None)
+
+    ranked = [candidate(0.90, 1), candidate(0.88, 1), candidate(0.89, 2), candidate(0.70, 1)]
+    picks = {pick_for_variety(ranked, random.Random(seed)).score for seed in range(30)}
+    assert picks == {0.90, 0.88}
@@ -0,0 +1,46 @@
+import random
+from itertools import combinations
+
+from protein_matcher import ProteinMatcher, ProteinQuery
+
+
+def _old_progressive_match(requested, texts):
+    """The combinations() walk _search_local_database used to do"""
+    for size in range(len(requested), 0, -1):
+        for combo in combinations(requested, size):
+            hits = [t for t in texts if all(p in t for p in combo)]
+            if hits:
+                return list(combo), hits
+    return [], []
+
+
+def test_rank_matches_old_combination_walk():
+    rng = random.Random(7)
+    proteins = ['beef', 'chicken', 'pork', 'lamb', 'shrimp']
+    for _ in range(200):
+        requested = rng.sample(proteins, rng.randint(1, 5))
+        texts = [str([{'name': p} for p in rng.sample(proteins, rng.randint(0, 3))]).lower()
+                 for _ in range(rng.randint(0, 12))]
+        assert ProteinQuery(requested).rank(texts, lambda t: t) == _old_progressive_match(requested, texts)
+
+
+def test_match_count_and_query_filtering():
+    query = ProteinMatcher(['beef', 'chicken', 'pork']).query(['tomato', 'pork', 'beef', 'pork'])
+    assert query.proteins == ['pork', 'beef']
+    assert query.match_count("[{'name': 'pork belly'}]") == 1
+    assert query.match_count("[{'name': 'onion'}]") == 0
+    assert query.match_count({'pork', 'beef', 'onion'}) == 2          # keyword set: exact members
+    assert query.mask({'pork belly'}) == 0
+
+
+def test_local_search_prefers_recipe_with_more_requested_proteins(matcher):
+    recipe = matcher._search_local_database('mexican', ['beef', 'chicken'], 'stew')
+    assert recipe['title'] in ('Chicken Tinga', 'Spicy Beef Chili')
+
+    matcher._save_to_local_db({'id': 5, 'title': 'Mar y Tierra Stew', 'cuisine': 'mexican',
+                               'dish_type': 'stew', 'source_api': 'Stub1',
+                               'ingredients': [{'name': 'beef', 'slug': 'beef'},
+                                               {'name': 'chicken', 'slug': 'chicken'}]})
+    matcher.flush_saves()
+    recipe = matcher._search_local_database('mexican', ['beef', 'chicken'], 'stew')
+    assert recipe['title'] == 'Mar y Tierra Stew'
@@ -0,0 +1,56 @@
+import sqlite3
+
+from recipe_fts import dish_type_match_expression
+
+
+def test_match_expression_quotes_words_per_column():
+    expression = dish_type_match_expression({'title_words': ['stir-fry', 'wok'], 'equipment': ['wok'],
+                                             'instruction_patterns': ['high heat']})
+    assert expression == 'title : ("stir-fry" OR "wok") OR instructions : ("high heat" OR "wok")'
+    assert dish_type_match_expression({}) is None
+
+
+def test_triggers_keep_index_in_sync(matcher, master_db):
+    conn = sqlite3.connect(master_db)
+    assert conn.execute("SELECT COUNT(*) FROM recipes_fts").fetchone()[0] == 4
+
+    conn.execute("UPDATE recipes SET title = 'Tinga de Pollo' WHERE id = 'seed_1'")
+    conn.execute("DELETE FROM recipes WHERE id = 'seed_4'")
+    conn.commit()
+    titles = [row[0] for row in conn.execute("SELECT title FROM recipes_fts WHERE recipes_fts MATCH 'tinga'")]
+    remaining = conn.execute("SELECT COUNT(*) FROM recipes_fts").fetchone()[0]
+    instructions = conn.execute("SELECT instructions FROM recipes_fts WHERE recipes_fts MATCH 'soup'").fetchone()
+    conn.close()
+
+    assert titles == ['Tinga de Pollo']
+    assert remaining == 3
+    assert instructions == ('Cook the Black Bean Soup',)
+
+
+def test_insert_or_replace_leaves_no_stale_entry(matcher, master_db):
+    conn = sqlite3.connect(master_db)
+    conn.execute("""INSERT OR REPLACE INTO recipes (id, title, cuisine, ingredients, instructions, source)
+                    VALUES ('seed_2', 'New Soup', 'mexican', '[]', '[]', 'fixture')""")
+    conn.execute("""INSERT OR REPLACE INTO recipes (id, title, cuisine, ingredients, instructions, source)
+                    VALUES ('fresh', 'Fresh Salsa', 'mexican', '[]', '[]', 'fixture')""")
+    conn.commit()
+    chili = conn.execute("SELECT COUNT(*) FROM recipes_fts WHERE recipes_fts MATCH 'chili'").fetchone()[0]
+    soup = [row[0] for row in conn.execute("SELECT title FROM recipes_fts WHERE recipes_fts MATCH 'new'")]
+    indexed = conn.execute("SELECT COUNT(*) FROM recipes_fts").fetchone()[0]
+    conn.close()
+
+    assert chili == 0
+    assert soup == ['New Soup']
+    assert indexed == 5
+
+
+def test_level1_falls_back_to_recipes_that_read_like_the_dish_type(matcher):
+    matcher._save_to_local_db({'id': 7, 'title': 'Pollo al Carbon', 'cuisine': 'mexican', 'dish_type': 'tacos',
+                               'source_api': 'Stub1', 'quality_score': 60,
+                               'ingredients': [{'name': 'chicken', 'slug': 'chicken'}],
+                               'instructions': [{'step': 1, 'instruction': 'Grill over charcoal until charred'}]})
+    matcher.flush_saves()
+
+    recipe = matcher._search_local_database('mexican', ['chicken'], 'grilled')
+    assert recipe['title'] == 'Pollo al Carbon'
+    assert matcher._search_local_database('mexican', ['chicken'], 'salad') is None
@@ -0,0 +1,66 @@
+def test_local_search_finds_protein_match(matcher):
+    recipe = matcher._search_local_database('mexican', ['chicken'], 'any')
+    assert recipe is not None
+    assert recipe['title'] == 'Chicken Tinga'
+    assert recipe['source'] == 'local_database'
+
+
+def test_local_search_reuses_pooled_connection(matcher):
+    matcher._search_local_database('mexican', ['chicken'], 'any')
+    matcher._search_local_database('mexican', ['beef'], 'stew')
+    stats = matcher.db.get_stats()
+    assert stats['read_opened'] == 1
+    assert stats['read_reused'] >= 2
+
+
+def test_save_to_local_db_is_searchable(matcher):
+    matcher._save_to_local_db({
+        'id': 42,
+        'title': 'Lamb Barbacoa',
+        'cuisine': 'mexican',
+        'dish_type': 'stew',
+        'source_api': 'Spoonacular',
+        'ingredients': [{'name': 'lamb', 'slug': 'lamb', 'amount': '1 kg'}],
+        'instructions': ['Slow cook the lamb'],
+    })
+    matcher.flush_saves()
+    recipe = matcher._search_local_database('mexican', ['lamb'], 'stew')
+    assert recipe['title'] == 'Lamb Barbacoa'
+
+
+def test_saved_recipe_is_added_to_ingredient_index(matcher):
+    before = matcher.ingredient_index.candidates('mexican', None, ['goat'])
+    matcher._save_to_local_db({
+        'id': 7,
+        'title': 'Birria de Chivo',
+        'cuisine': 'mexican',
+        'dish_type': 'stew',
+        'source_api': 'TheMealDB',
+        'ingredients': [{'name': 'goat', 'slug': 'goat', 'amount': '1 kg'}],
+        'instructions': ['Braise the goat'],
+    })
+    matcher.flush_saves()
+    assert before == []
+    assert len(matcher.ingredient_index.candidates('mexican', 'stew', ['goat'])) == 1
+
+
+def test_family_expansion_comes_from_registry(matcher):
+    expansion = matcher._family_expansion_map()
+    assert 'chicken_breast' in expansion['chicken']
+    assert matcher._family_expansion_map() is expansion
+
+
+def test_dish_type_verification_uses_compiled_title_matcher(matcher):
+    assert matcher._verify_dish_type_match({'title': 'Chicken Curry Masala'}, 'curry')
+    assert not matcher._verify_dish_type_match({'title': 'Green Salad'}, 'curry')
+
+
+def test_api_protein_check_is_shared_by_single_and_multi_protein_requests(matcher):
+    chickpea_stew = {'title': 'Chickpea Stew', 'all_ingredients': [{'name': 'chickpeas'}, {'name': 'onion'}]}
+    chicken_stew = {'title': 'Chicken Stew', 'all_ingredients': [{'name': 'Chicken Thighs'}]}
+
+    assert not matcher._api_proteins_acceptable(chickpea_stew, ['chicken'])
+    assert matcher._api_proteins_acceptable(chicken_stew, ['chicken'])
+    assert matcher._api_proteins_acceptable(chicken_stew, ['chicken', 'beef'])
+    assert not matcher._api_proteins_acceptable(chicken_stew, ['onion'])   # vegetarian preference
+    assert matcher._api_proteins_acceptable(chickpea_stew, ['onion'])
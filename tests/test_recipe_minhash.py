@@ -0,0 +1,112 @@
+import sqlite3
+
+from recipe_minhash import (ImportDuplicateGuard, MinHasher, NearMatchIndex, benchmark, ensure_minhash_table,
+                            sign_missing)
+
+
+class FailingChef:
+    min_attempt_seconds = 0.0
+
+    def generate_recipe(self, cuisine, dish_type, ingredients):
+        raise RuntimeError('no AI in tests')
+
+
+def _recipe(recipe_id, cuisine, title, slugs):
+    return {'id': recipe_id, 'title': title, 'cuisine': cuisine, 'dish_type': 'stew', 'source_api': 'Stub1',
+            'ingredients': [{'name': s, 'slug': s} for s in slugs]}
+
+
+def _import_db():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE recipes (id TEXT PRIMARY KEY, title TEXT, cuisine TEXT)')
+    conn.execute('CREATE TABLE recipe_ingredients (recipe_id TEXT, ingredient_slug TEXT)')
+    conn.execute("INSERT INTO recipes VALUES ('r1', 'Chicken Tinga', 'mexican')")
+    conn.executemany("INSERT INTO recipe_ingredients VALUES ('r1', ?)", [('chicken',), ('tomato',), ('onion',)])
+    return conn
+
+
+def test_lsh_proposes_similar_recipes_of_the_same_cuisine_only():
+    pot = ['chicken', 'tomato', 'onion', 'garlic', 'cumin', 'lime', 'cilantro', 'chili_pepper']
+    index = NearMatchIndex()
+    index.add('pot', pot, 'mexican', 'Big Chicken Pot')
+    index.add('other', ['tofu', 'soy_sauce', 'ginger'], 'mexican', 'Tofu Bowl')
+    index.add('elsewhere', pot, 'indian', 'Chicken Curry')
+
+    matches = index.nearest(pot[:7] + ['oregano'], 'mexican', min_containment=0.8)
+    assert [(m.recipe_id, m.containment, m.shared) for m in matches] == [('pot', 0.875, 7)]
+    assert {m.recipe_id for m in index.nearest(pot, None)} == {'pot', 'elsewhere'}
+    assert index.memory_footprint()['cuisines'] == 2
+
+    hasher = MinHasher()
+    a, b = hasher.signature(['a', 'b', 'c', 'd']), hasher.signature(['a', 'b', 'c', 'e'])
+    assert 0.3 <= hasher.estimate(a, b) <= 0.9
+
+
+def test_signing_is_separate_from_the_schema_and_duplicates_need_ingredients_and_title():
+    conn = _import_db()
+    ensure_minhash_table(conn)
+    assert conn.execute('SELECT COUNT(*) FROM recipe_minhash').fetchone()[0] == 0
+    assert sign_missing(conn, MinHasher()) == 1
+    assert sign_missing(conn, MinHasher()) == 0
+
+    index = NearMatchIndex().build(conn)
+    assert index.find_duplicate(['onion', 'tomato', 'chicken'], 'Chicken Tinga!', 'Mexican') == 'r1'
+    assert index.find_duplicate(['onion', 'tomato', 'chicken'], 'Chicken Tinga', 'Mexican', exclude='r1') is None
+    assert index.find_duplicate(['onion', 'tomato', 'chicken'], 'Smoky Pulled Chicken', 'mexican') is None
+    assert index.find_duplicate(['onion', 'tomato', 'chicken'], 'Chicken Tinga', 'thai') is None
+
+
+def test_import_guard_signs_existing_recipes_and_records_new_ones():
+    conn = _import_db()
+    guard = ImportDuplicateGuard(conn)
+
+    assert guard.duplicate_of('mealdb_9', ['chicken', 'tomato', 'onion'], 'Chicken Tinga', 'mexican') == 'r1'
+    assert guard.duplicate_of('r1', ['chicken', 'tomato', 'onion'], 'Chicken Tinga', 'mexican') is None
+
+    slugs = ['beef', 'chili_pepper', 'tomato']
+    assert guard.duplicate_of('new', slugs, 'Beef Chili', 'mexican') is None
+    guard.record('new', slugs, 'Beef Chili', 'mexican')
+    assert guard.duplicate_of('new_again', slugs, 'Beef Chili', 'mexican') == 'new'
+    assert conn.execute("SELECT COUNT(*) FROM recipe_minhash").fetchone()[0] == 2
+
+
+def test_benchmark_keeps_candidate_sets_small_and_finds_near_matches():
+    report = benchmark(num_recipes=2000, num_queries=50)
+    assert report['bands'] * report['rows'] == 64
+    assert report['near_match_recall'] >= 0.9
+    assert report['mean_candidates']['random_set'] < 5
+    assert all(short['containment_recall'] == 1.0 for short in report['short_queries'].values())
+
+
+def test_near_match_answers_before_any_api_and_keeps_the_time_limit(matcher, stub_fetcher, stub_providers):
+    fetcher = stub_fetcher([])
+    matcher.sorted_providers = stub_providers(fetcher)
+    matcher.ai_chef = FailingChef()
+
+    recipe = matcher.find_recipe('mexican', ['chicken', 'tomato', 'onion'], 'grilled')
+    assert fetcher.searched == []  # no paid API call
+    assert recipe['title'] == 'Chicken Tinga'
+    assert recipe['partial_match'] is True
+    assert recipe['near_match']['shared_ingredients'] == 3
+
+    quick = matcher.find_recipe('mexican', ['chicken', 'tomato', 'onion'], 'grilled', max_cooking_time='10')
+    assert quick.get('title') != 'Chicken Tinga'
+    assert fetcher.searched  # nothing local within 10 minutes → on to the APIs
+
+
+def test_short_requests_find_recipes_that_contain_them(matcher):
+    matcher._save_to_local_db(_recipe('pozole', 'mexican', 'Pozole Rojo',
+                                      ['pork', 'hominy', 'guajillo', 'garlic', 'onion', 'oregano', 'cabbage',
+                                       'radish', 'lime', 'bay_leaf']))
+    matcher.flush_saves()
+    recipe = matcher._search_near_match('mexican', ['pork', 'hominy', 'lime'])
+    assert recipe['title'] == 'Pozole Rojo'
+    assert recipe['near_match']['similarity'] == 0.3  # far below any LSH band threshold
+
+
+def test_duplicate_saves_are_skipped(matcher):
+    matcher.minhash_backfill.join(timeout=5)
+    matcher._save_to_local_db(_recipe('dup', 'mexican', 'Chicken Tinga', ['chicken', 'tomato', 'onion']))
+    matcher.flush_saves()
+    count = matcher.db.read_connection().execute("SELECT COUNT(*) FROM recipes WHERE id = 'dup'").fetchone()[0]
+    assert count == 0
@@ -0,0 +1,70 @@
+import sqlite3
+
+from recipe_schema import ingredient_slug_text
+
+
+def test_slug_text_keeps_slugs_and_slugified_names():
+    text = ingredient_slug_text([{'name': 'Chicken Thighs', 'slug': 'chicken_thigh'},
+                                 {'item': 'Red Onion'}, 'tomato', {'name': ''}])
+    assert text == '|chicken_thigh|chicken_thighs|red_onion|tomato|'
+    assert ingredient_slug_text([]) == ''
+
+
+def test_matcher_backfills_and_saves_slug_column(matcher, master_db):
+    matcher._save_to_local_db({'id': 3, 'title': 'Tacos de Pescado', 'cuisine': 'mexican',
+                               'dish_type': 'tacos', 'source_api': 'Stub1',
+                               'ingredients': [{'name': 'White Fish', 'slug': 'fish'}]})
+    matcher.flush_saves()
+    conn = sqlite3.connect(master_db)
+    slugs = dict(conn.execute("SELECT id, ingredient_slugs FROM recipes"))
+    conn.close()
+
+    assert slugs['seed_1'] == '|chicken|tomato|onion|'
+    assert slugs['Stub1_3'] == '|fish|white_fish|'
+
+
+def test_only_the_returned_recipe_has_its_json_decoded(matcher, master_db):
+    conn = sqlite3.connect(master_db)
+    conn.execute("UPDATE recipes SET ingredients = 'not json' WHERE id = 'seed_2'")
+    conn.commit()
+    conn.close()
+
+    recipe = matcher._search_local_database('mexican', ['chicken', 'beef', 'tomato'], 'stew')
+    assert recipe['title'] == 'Chicken Tinga'
+
+
+def test_spice_level_score_prefers_title_then_ingredients():
+    from recipe_schema import spice_level_score
+
+    assert spice_level_score('Habanero Salsa') == 100
+    assert spice_level_score('Fiery Chicken Stew') == 60
+    assert spice_level_score('Mild Korma') == 0
+    assert spice_level_score('Chicken Stew', '|chicken|chipotle|') == 40
+    assert spice_level_score('Chicken Stew', '|chicken|onion|') == 15
+
+
+def _save(matcher, recipe_id, title, total_time, quality):
+    matcher._save_to_local_db({'id': recipe_id, 'title': title, 'cuisine': 'mexican', 'dish_type': 'stew',
+                               'source_api': 'Stub1', 'total_time': total_time, 'quality_score': quality,
+                               'ingredients': [{'name': 'chicken', 'slug': 'chicken'}]})
+    matcher.flush_saves()
+
+
+def test_time_limit_is_applied_before_the_top_10_cut(matcher):
+    for i in range(12):
+        _save(matcher, i, f'Slow Braised Chicken {i}', 180, 99)
+    _save(matcher, 99, 'Quick Chicken Stew', 20, 5)
+
+    recipe = matcher._search_local_database('mexican', ['chicken'], 'stew', max_cooking_time='25')
+    assert recipe['title'] == 'Quick Chicken Stew'
+
+
+def test_spice_fit_ranks_the_closest_heat_first(matcher):
+    _save(matcher, 1, 'Fiery Chicken Stew', 40, 50)
+    _save(matcher, 2, 'Mild Chicken Stew', 40, 50)
+
+    hot = [r['title'] for r in matcher.rank_local_recipes('mexican', ['chicken'], 'stew', spice_level='hot')]
+    mild = [r['title'] for r in matcher.rank_local_recipes('mexican', ['chicken'], 'stew', spice_level='mild')]
+    assert hot[0] == 'Fiery Chicken Stew'
+    assert mild[0] == 'Mild Chicken Stew'
+    assert mild.index('Chicken Tinga') < mild.index('Fiery Chicken Stew')  # Neutral, ahead of the fiery one
@@ -0,0 +1,85 @@
+from recipe_tfidf import TfidfIndex, benchmark
+
+ROWS = [
+    ('curry', 'thai', 'Thai Coconut Chicken Curry', 'Simmer the chicken in coconut milk until creamy',
+     'chicken coconut milk red curry paste'),
+    ('tinga', 'mexican', 'Chicken Tinga', 'Stew the chicken with the tomatoes', 'chicken tomatoes onion chipotle'),
+    ('noodles', 'thai', 'Pad Thai', 'Stir fry the noodles over high heat', 'rice noodles egg peanuts'),
+]
+
+
+def test_free_text_ranks_by_cosine_and_filters_by_cuisine():
+    index = TfidfIndex.from_rows(ROWS)
+    ranked = index.search('creamy coconut chicken')
+    assert [recipe_id for recipe_id, _ in ranked] == ['curry', 'tinga']
+    assert 0 < ranked[1][1] < ranked[0][1] <= 1
+    assert [recipe_id for recipe_id, _ in index.search('chicken', cuisine='Mexican')] == ['tinga']
+    assert index.search('chicken', cuisine='nordic') == []
+    assert index.search('the and of') == []
+
+
+def test_saved_index_loads_memory_mapped_and_takes_incremental_updates(tmp_path):
+    TfidfIndex.from_rows(ROWS).save(str(tmp_path))
+    index = TfidfIndex.load(str(tmp_path))
+    assert index.get_stats()['memory_mapped'] is True
+    assert index.search('noodles') == TfidfIndex.from_rows(ROWS).search('noodles')
+
+    index.add('soup', 'thai', 'Coconut Chicken Soup', 'Simmer gently', 'chicken coconut milk lemongrass')
+    index.remove('curry')
+    assert [recipe_id for recipe_id, _ in index.search('coconut lemongrass', 'thai')] == ['soup']
+    assert 'curry' not in [recipe_id for recipe_id, _ in index.search('coconut chicken curry')]
+    index.close()
+
+    report = benchmark(num_recipes=300, num_queries=5)
+    assert report['recipes'] == 300 and report['queries']['one_cuisine']['count'] == 5
+
+
+def test_matcher_text_search_sees_new_recipes(matcher, client):
+    results = matcher.search_text('black bean soup')
+    assert results[0]['title'] == 'Black Bean Soup'
+    assert matcher.search_text('chicken', cuisine='thai')[0]['title'] == 'Pad Krapow Gai'
+
+    matcher._save_to_local_db({'id': 9, 'title': 'Creamy Coconut Chicken', 'cuisine': 'thai', 'dish_type': 'curry',
+                               'source_api': 'Stub1', 'ingredients': [{'name': 'coconut milk', 'slug': 'coconut_milk'}]})
+    matcher.flush_saves()
+    assert matcher.search_text('creamy coconut', cuisine='thai')[0]['title'] == 'Creamy Coconut Chicken'
+
+    assert client.get('/search').status_code == 400
+
+
+def test_offline_index_takes_new_recipes_and_is_rebuilt_after_edits(master_db):
+    import sqlite3
+    from recipe_matcher_4d import RecipeMatcher4D
+    from recipe_tfidf import default_index_path
+
+    conn = sqlite3.connect(master_db)
+    conn.execute("""INSERT INTO recipes (id, title, cuisine, ingredients, instructions, source)
+                    VALUES ('blank', 'The', 'mexican', '[]', '[]', 'fixture')""")  # no indexable text
+    conn.commit()
+    TfidfIndex.build(conn).save(default_index_path(master_db))
+
+    def open_index():
+        matcher = RecipeMatcher4D(db_path=master_db)
+        try:
+            index = matcher.text_search
+            return index.get_stats()['memory_mapped'], [recipe_id for recipe_id, _ in index.search('pozole')]
+        finally:
+            matcher.save_queue.close()
+            matcher.db.close_all()
+
+    assert open_index() == (True, [])
+    conn.execute("""INSERT INTO recipes (id, title, cuisine, ingredients, instructions, source)
+                    VALUES ('pozole', 'Pozole Rojo', 'mexican', '[]', '[]', 'fixture')""")
+    conn.commit()
+    assert open_index() == (True, ['pozole'])  # saved base + the new recipe in the delta
+
+    conn.execute("UPDATE recipes SET title = 'Chicken Tinga Tacos', last_updated = '2999-01-01' "
+                 "WHERE id = 'seed_1'")
+    conn.commit()
+    assert open_index() == (False, ['pozole'])
+    conn.execute("DELETE FROM recipes WHERE id = 'blank'")
+    conn.commit()
+    saved = TfidfIndex.load(default_index_path(master_db))
+    assert saved.catch_up(conn) is None
+    saved.close()
+    conn.close()
@@ -0,0 +1,53 @@
+def _served(matcher, recipe_id):
+    return matcher.db.read_connection().execute(
+        "SELECT times_served FROM recipes WHERE id = ?", (recipe_id,)).fetchone()[0]
+
+
+def test_earlier_sister_api_hit_beats_later_local_hit(matcher, stub_fetcher, stub_providers):
+    api = stub_fetcher([{'id': 1, 'title': 'Pollo a la Brasa', 'ingredients': ['chicken']}], detail_delay=0.2)
+    matcher.sorted_providers = stub_providers(api)
+    matcher.country_to_spoonacular = {'peruvian': 'latin american'}
+
+    result = matcher._search_sister_countries(['peruvian', 'thai'], ['chicken'], 'any')
+    assert result['title'] == 'Pollo a la Brasa'
+    assert result['note'] == 'Similar Peruvian recipe'
+    # The losing local hit was only speculative
+    assert _served(matcher, 'seed_4') == 0
+
+
+def test_local_hit_wins_when_earlier_sisters_miss(matcher, stub_fetcher, stub_providers):
+    api = stub_fetcher([{'id': 1, 'title': 'Beef Anticuchos', 'ingredients': ['beef']}])
+    matcher.sorted_providers = stub_providers(api)
+    matcher.country_to_spoonacular = {'peruvian': 'latin american', 'thai': 'thai'}
+
+    result = matcher._search_sister_countries(['peruvian', 'thai'], ['chicken'], 'any')
+    assert result['title'] == 'Pad Krapow Gai'
+    assert result['note'] == 'Similar Thai recipe'
+    assert _served(matcher, 'seed_4') == 1
+    # No API call for the sister whose local search already won
+    assert api.searched == ['latin american']
+
+
+def test_sisters_sharing_a_spoonacular_cuisine_search_once(matcher, stub_fetcher, stub_providers):
+    api = stub_fetcher([{'id': 1, 'title': 'Beef Anticuchos', 'ingredients': ['beef']}])
+    matcher.sorted_providers = stub_providers(api)
+    matcher.country_to_spoonacular = {'peruvian': 'latin american', 'chilean': 'latin american',
+                                      'bolivian': 'latin american'}
+
+    assert matcher._search_sister_countries(['peruvian', 'chilean', 'bolivian'], ['chicken'], 'any') is None
+    assert api.searched == ['latin american']
+
+
+def test_async_sisters_sharing_a_timed_out_search_fall_through(matcher, stub_fetcher, stub_providers):
+    import asyncio
+    from cascade_deadline import Deadline, use_deadline
+
+    api = stub_fetcher([{'id': 1, 'title': 'Beef Anticuchos', 'ingredients': ['beef']}], search_delay=0.5)
+    matcher.sorted_providers = stub_providers(api)
+    matcher.country_to_spoonacular = {'peruvian': 'latin american', 'chilean': 'latin american'}
+
+    async def search():
+        with use_deadline(Deadline(0.1)):
+            return await matcher._search_sister_countries_async(['peruvian', 'chilean'], ['chicken'], 'any')
+
+    assert asyncio.run(search()) is None  # no CancelledError from the second sister
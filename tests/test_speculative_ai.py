@@ -0,0 +1,106 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from speculative_ai import SpeculationLedger, SpeculativeCall
+
+
+class StubChef:
+    """AI Chef that takes `delay` seconds and always produces a real recipe"""
+
+    min_attempt_seconds = 0.1
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.started_at = []
+
+    def generate_recipe(self, cuisine, dish_type, ingredients):
+        self.started_at.append(time.perf_counter())
+        time.sleep(self.delay)
+        return {'title': f'AI {cuisine} {dish_type}', 'instructions': [f'step {i}' for i in range(6)],
+                'ingredients': [{'name': 'chicken'}]}
+
+
+def test_settle_cancels_queued_calls_and_books_running_ones_as_wasted():
+    ledger = SpeculationLedger()
+    executor = ThreadPoolExecutor(max_workers=1)
+    running = SpeculativeCall(executor.submit(time.sleep, 0.2), ledger)
+    queued = SpeculativeCall(executor.submit(time.sleep, 0.2), ledger)
+    time.sleep(0.05)
+
+    queued.settle()
+    running.settle()
+    executor.shutdown(wait=True)
+
+    stats = ledger.get_stats()
+    assert stats['started'] == 2 and stats['cancelled'] == 1 and stats['wasted'] == 1
+    assert stats['wasted_seconds'] > 0.1
+
+
+def test_ai_runs_alongside_the_apis_once_they_keep_missing(matcher, stub_fetcher, stub_providers):
+    slow_empty = stub_fetcher([], search_delay=0.3)
+    matcher.sorted_providers = stub_providers(slow_empty)
+    matcher.ai_chef = StubChef(delay=0.3)
+    for _ in range(5):
+        matcher.outcome_predictor.record('ethiopian', 'stew', 4)
+
+    started = time.perf_counter()
+    result = matcher.find_recipe('ethiopian', ['chicken'], 'stew')
+
+    assert result['source'] == 'ai_chef'
+    assert len(matcher.ai_chef.started_at) == 1
+    assert matcher.ai_chef.started_at[0] - started < 0.3  # before the first API search came back
+    assert matcher.speculation_ledger.get_stats()['used'] == 1
+
+
+def test_api_hit_drops_the_speculative_recipe(matcher, stub_fetcher, stub_providers):
+    matcher.sorted_providers = stub_providers(stub_fetcher([{'id': 1, 'title': 'Chicken Khao Soi',
+                                                             'ingredients': ['chicken']}]))
+    matcher.ai_chef = StubChef(delay=0.3)
+    for _ in range(5):
+        matcher.outcome_predictor.record('thai', 'stew', 4)
+
+    result = matcher.find_recipe('thai', ['chicken'], 'stew')
+
+    assert result['title'] == 'Chicken Khao Soi'
+    stats = matcher.speculation_ledger.get_stats()
+    assert stats['started'] == 1 and stats['used'] == 0
+    assert stats['cancelled'] + stats['wasted'] <= 1
+    assert matcher.get_routing_table()['thai/stew']['level2']['hits'] == 1
+
+
+def test_running_loser_is_kept_when_keep_accepts_it():
+    ledger = SpeculationLedger()
+    executor = ThreadPoolExecutor(max_workers=1)
+    kept = []
+    call = SpeculativeCall(executor.submit(lambda: time.sleep(0.1) or {'title': 'AI stew'}), ledger,
+                           keep=lambda recipe: kept.append(recipe) or True)
+    failing = SpeculativeCall(executor.submit(lambda: 1 / 0), ledger, keep=lambda recipe: True)
+    time.sleep(0.05)
+
+    call.settle()
+    executor.shutdown(wait=True)
+    failing.settle()
+
+    stats = ledger.get_stats()
+    assert kept == [{'title': 'AI stew'}]
+    assert stats['saved'] == 1 and stats['wasted'] == 1
+
+
+def test_api_hit_saves_the_finished_speculative_recipe(matcher, stub_fetcher, stub_providers):
+    matcher.sorted_providers = stub_providers(stub_fetcher([{'id': 1, 'title': 'Chicken Khao Soi',
+                                                             'ingredients': ['chicken']}], search_delay=0.1))
+    matcher.ai_chef = StubChef(delay=0.2)
+    for _ in range(5):
+        matcher.outcome_predictor.record('thai', 'stew', 4)
+
+    assert matcher.find_recipe('thai', ['chicken'], 'stew')['title'] == 'Chicken Khao Soi'
+    for _ in range(50):
+        if matcher.speculation_ledger.get_stats()['saved']:
+            break
+        time.sleep(0.02)
+    matcher.flush_saves()
+
+    assert matcher.speculation_ledger.get_stats()['wasted'] == 0
+    saved = matcher.db.read_connection().execute(
+        "SELECT COUNT(*) FROM recipes WHERE title = 'AI thai stew'").fetchone()[0]
+    assert saved == 1
@@ -0,0 +1,89 @@
+import sqlite3
+import time
+
+from write_behind import WriteBehindQueue
+
+
+def test_queue_batches_dedups_and_flushes_on_close():
+    batches = []
+    queue = WriteBehindQueue(batches.append, max_batch=3, flush_interval=60)
+
+    for key in ['a', 'b', 'a', 'c', 'd']:
+        queue.put(key, key.upper())
+    time.sleep(0.1)
+    assert batches == [[('a', 'A'), ('b', 'B'), ('c', 'C')]]  # full batch went out without waiting
+
+    queue.close()
+    assert batches[1] == [('d', 'D')]
+    queue.put('e', 'E')  # after close: written synchronously
+    assert batches[2] == [('e', 'E')]
+    stats = queue.get_stats()
+    assert stats['deduplicated'] == 1 and stats['written'] == 5 and stats['pending'] == 0
+
+
+def test_matcher_saves_many_recipes_in_one_transaction(matcher, master_db):
+    matcher.save_queue.flush_interval = 60
+    for i in range(10):
+        matcher._save_to_local_db({'id': i, 'title': f'Pozole {i}', 'cuisine': 'mexican', 'dish_type': 'soup',
+                                   'source_api': 'Stub1',
+                                   'ingredients': [{'name': 'pork', 'slug': 'pork'}]})
+    matcher._save_to_local_db({'id': 3, 'title': 'Pozole 3', 'cuisine': 'mexican', 'source_api': 'Stub1'})
+
+    assert matcher.flush_saves(timeout=5)
+    stats = matcher.save_queue.get_stats()
+    assert stats['batches'] == 1 and stats['written'] == 10 and stats['deduplicated'] == 1
+    conn = sqlite3.connect(master_db)
+    assert conn.execute("SELECT COUNT(*) FROM recipe_ingredients WHERE ingredient_slug = 'pork'").fetchone()[0] == 10
+    conn.close()
+    assert len(matcher.ingredient_index.candidates('mexican', 'soup', ['pork'])) == 10
+
+
+def test_failed_batch_is_retried_before_it_is_dropped():
+    attempts = []
+
+    def flaky(batch):
+        attempts.append(batch)
+        if len(attempts) < 3:
+            raise sqlite3.OperationalError('database is locked')
+
+    queue = WriteBehindQueue(flaky, flush_interval=0, retry_backoff=0.01)
+    queue.put('a', 'A')
+    assert queue.flush(timeout=5)
+    stats = queue.get_stats()
+    assert len(attempts) == 3 and stats['written'] == 1 and stats['retries'] == 2 and stats['failed'] == 0
+
+    def broken(batch):
+        raise sqlite3.OperationalError('disk I/O error')
+
+    queue.write_batch = broken
+    queue.put('b', 'B')
+    assert queue.flush(timeout=5)
+    assert queue.get_stats()['failed'] == 1
+    queue.close()
+
+
+def test_idle_writer_thread_exits_and_restarts():
+    batches = []
+    queue = WriteBehindQueue(batches.append, flush_interval=0, idle_exit=0.05)
+    queue.put('a', 'A')
+    assert queue.flush(timeout=5)
+    time.sleep(0.2)
+    assert queue._thread is None
+
+    queue.put('b', 'B')
+    assert queue.flush(timeout=5)
+    assert batches == [[('a', 'A')], [('b', 'B')]]
+    queue.close()
+
+
+def test_matchers_are_not_kept_alive_for_interpreter_exit(master_db):
+    import gc
+    import weakref
+    from recipe_matcher_4d import RecipeMatcher4D, _open_matchers
+
+    matcher = RecipeMatcher4D(db_path=master_db)
+    assert matcher in _open_matchers
+    ref = weakref.ref(matcher)
+    del matcher
+    gc.collect()
+    assert ref() is None
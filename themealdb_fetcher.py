@@ -1,5 +1,7 @@
 # themealdb_fetcher.py
 import requests
+import httpx
+from cascade_deadline import request_timeout
 import json
 from typing import List, Dict, Optional
 
@@ -8,9 +10,34 @@ class TheMealDBFetcher:
     Fetcher for TheMealDB API
     Simple, honest, no credit card nonsense!
     """
+    # TheMealDB uses different cuisine names (e.g., "Canadian", "Chinese")
+    CUISINE_MAPPING = {
+        'italian': 'Italian',
+        'chinese': 'Chinese', 
+        'japanese': 'Japanese',
+        'french': 'French',
+        'indian': 'Indian',
+        'mexican': 'Mexican',
+        'thai': 'Thai',
+        'american': 'American',
+        'british': 'British',
+        'canadian': 'Canadian',
+        'dutch': 'Dutch',
+        'egyptian': 'Egyptian',
+        'greek': 'Greek',
+        'irish': 'Irish',
+        'jamaican': 'Jamaican',
+        'malaysian': 'Malaysian',
+        'russian': 'Russian',
+        'spanish': 'Spanish',
+        'vietnamese': 'Vietnamese',
+        # Add more as discovered
+    }
+    
     def __init__(self, api_key: str = "1"):  # Default to test key
         self.api_key = api_key
         self.base_url = "https://www.themealdb.com/api/json/v1"
+        self.timeout = 15.0  # Seconds per request (capped by the cascade deadline)
     
     def search_recipes(self, cuisine: str, ingredients: List[str], number: int = 10) -> Dict:
         """
@@ -18,97 +45,106 @@ class TheMealDBFetcher:
         Note: Less sophisticated than Spoonacular but HONEST!
         """
         print(f"      🍽️ TheMealDB searching for: {cuisine} with {ingredients}")
-
-        # TheMealDB uses different cuisine names (e.g., "Canadian", "Chinese")
-        cuisine_mapping = {
-            'italian': 'Italian',
-            'chinese': 'Chinese', 
-            'japanese': 'Japanese',
-            'french': 'French',
-            'indian': 'Indian',
-            'mexican': 'Mexican',
-            'thai': 'Thai',
-            'american': 'American',
-            'british': 'British',
-            'canadian': 'Canadian',
-            'dutch': 'Dutch',
-            'egyptian': 'Egyptian',
-            'greek': 'Greek',
-            'irish': 'Irish',
-            'jamaican': 'Jamaican',
-            'malaysian': 'Malaysian',
-            'russian': 'Russian',
-            'spanish': 'Spanish',
-            'vietnamese': 'Vietnamese',
-            # Add more as discovered
-        }
-        
         results = {'results': []}
         
         # Try searching by cuisine first
-        themeal_cuisine = cuisine_mapping.get(cuisine.lower())
-        if themeal_cuisine:
-            print(f"      🍽️ Mapped {cuisine} → {themeal_cuisine}")
-            endpoint = f"{self.base_url}/{self.api_key}/filter.php"
-            params = {'a': themeal_cuisine}
-            
+        request = self._cuisine_request(cuisine)
+        if request:
             try:
-                response = requests.get(endpoint, params=params)
-                data = response.json()
-                
-                if data and 'meals' in data and data['meals']:
-                    print(f"      🍽️ Found {len(data['meals'])} {themeal_cuisine} meals")
-                    # TheMealDB returns simplified results, need to get full details
-                    for meal in data['meals'][:number]:
-                        # Check if any of our ingredients might be in this meal
-                        meal_name_lower = meal['strMeal'].lower()
-                        
-                        # Simple ingredient matching in meal name
-                        ingredient_match = any(ing.lower() in meal_name_lower for ing in ingredients)
-                        
-                        if ingredient_match or len(ingredients) == 0:
-                            results['results'].append({
-                                'id': meal['idMeal'],
-                                'title': meal['strMeal'],
-                                'image': meal['strMealThumb'],
-                                'sourceUrl': f"https://www.themealdb.com/meal/{meal['idMeal']}"
-                            })
-                
+                response = requests.get(*request, timeout=request_timeout(self.timeout))
+                results['results'] = self._parse_cuisine_meals(response.json(), ingredients, number)
             except Exception as e:
                 print(f"❌ TheMealDB error: {e}")
         
         # If no cuisine results, try searching by main ingredient
         if not results['results'] and ingredients:
-            main_ingredient = ingredients[0]
-            endpoint = f"{self.base_url}/{self.api_key}/filter.php"
-            params = {'i': main_ingredient}
-            
             try:
-                response = requests.get(endpoint, params=params)
-                data = response.json()
-                
-                if data and 'meals' in data and data['meals']:
-                    for meal in data['meals'][:number]:
-                        results['results'].append({
-                            'id': meal['idMeal'],
-                            'title': meal['strMeal'],
-                            'image': meal['strMealThumb'],
-                            'sourceUrl': f"https://www.themealdb.com/meal/{meal['idMeal']}"
-                        })
-                        
+                response = requests.get(*self._ingredient_request(ingredients[0]), timeout=request_timeout(self.timeout))
+                results['results'] = self._parse_ingredient_meals(response.json(), number)
             except Exception as e:
                 print(f"❌ TheMealDB ingredient search error: {e}")
         
         return results
     
+    async def search_recipes_async(self, cuisine: str, ingredients: List[str], number: int = 10) -> Dict:
+        """search_recipes without blocking the event loop"""
+        print(f"      🍽️ TheMealDB searching for: {cuisine} with {ingredients}")
+        results = {'results': []}
+        
+        async with httpx.AsyncClient(timeout=request_timeout(self.timeout)) as client:
+            request = self._cuisine_request(cuisine)
+            if request:
+                try:
+                    response = await client.get(request[0], params=request[1])
+                    results['results'] = self._parse_cuisine_meals(response.json(), ingredients, number)
+                except Exception as e:
+                    print(f"❌ TheMealDB error: {e}")
+            
+            if not results['results'] and ingredients:
+                endpoint, params = self._ingredient_request(ingredients[0])
+                try:
+                    response = await client.get(endpoint, params=params)
+                    results['results'] = self._parse_ingredient_meals(response.json(), number)
+                except Exception as e:
+                    print(f"❌ TheMealDB ingredient search error: {e}")
+        
+        return results
+    
+    def _cuisine_request(self, cuisine: str):
+        """(endpoint, params) of the by-area filter, or None if TheMealDB has no such area"""
+        themeal_cuisine = self.CUISINE_MAPPING.get(cuisine.lower())
+        if not themeal_cuisine:
+            return None
+        print(f"      🍽️ Mapped {cuisine} → {themeal_cuisine}")
+        return f"{self.base_url}/{self.api_key}/filter.php", {'a': themeal_cuisine}
+    
+    def _ingredient_request(self, main_ingredient: str):
+        return f"{self.base_url}/{self.api_key}/filter.php", {'i': main_ingredient}
+    
+    def _parse_cuisine_meals(self, data: Dict, ingredients: List[str], number: int) -> List[Dict]:
+        """Area results whose name mentions one of our ingredients (or all, if none given)"""
+        summaries = []
+        if data and 'meals' in data and data['meals']:
+            print(f"      🍽️ Found {len(data['meals'])} meals")
+            # TheMealDB returns simplified results, need to get full details
+            for meal in data['meals'][:number]:
+                # Check if any of our ingredients might be in this meal
+                meal_name_lower = meal['strMeal'].lower()
+                
+                # Simple ingredient matching in meal name
+                ingredient_match = any(ing.lower() in meal_name_lower for ing in ingredients)
+                
+                if ingredient_match or len(ingredients) == 0:
+                    summaries.append(self._summary(meal))
+        return summaries
+    
+    def _parse_ingredient_meals(self, data: Dict, number: int) -> List[Dict]:
+        if data and 'meals' in data and data['meals']:
+            return [self._summary(meal) for meal in data['meals'][:number]]
+        return []
+    
+    def _summary(self, meal: Dict) -> Dict:
+        return {
+            'id': meal['idMeal'],
+            'title': meal['strMeal'],
+            'image': meal['strMealThumb'],
+            'sourceUrl': f"https://www.themealdb.com/meal/{meal['idMeal']}"
+        }
+    
     def get_recipe_details(self, recipe_id: str) -> Dict:
         """Get full recipe details"""
         endpoint = f"{self.base_url}/{self.api_key}/lookup.php"
-        params = {'i': recipe_id}
-        
-        response = requests.get(endpoint, params=params)
-        data = response.json()
-        
+        response = requests.get(endpoint, params={'i': recipe_id}, timeout=request_timeout(self.timeout))
+        return self._first_meal(response.json())
+    
+    async def get_recipe_details_async(self, recipe_id: str) -> Dict:
+        """get_recipe_details without blocking the event loop"""
+        endpoint = f"{self.base_url}/{self.api_key}/lookup.php"
+        async with httpx.AsyncClient(timeout=request_timeout(self.timeout)) as client:
+            response = await client.get(endpoint, params={'i': recipe_id})
+        return self._first_meal(response.json())
+    
+    def _first_meal(self, data: Dict) -> Dict:
         if data and 'meals' in data and data['meals']:
             return data['meals'][0]
         return {}
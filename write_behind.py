@@ -0,0 +1,145 @@
+# /*
+# * RecipeGen™ - AI-Powered Culinary Video & Recipe Generation Platform
+# * © Copyright By Abraham Chachamovits
+# * RecipeGen™ is a trademark of Abraham Chachamovits
+# *
+# * File: write_behind.py
+# * Purpose: Background batching writer so request threads only enqueue their saves
+# */
+
+"""
+Write-behind queue
+queue = WriteBehindQueue(write_batch)     # write_batch([(key, item), ...]) → one transaction
+queue.put(recipe_id, recipe)              # returns at once; duplicates of a queued key are dropped
+- One daemon thread writes when max_batch items are waiting or the oldest waited flush_interval;
+  it exits after idle_exit seconds without work (the next put() starts a new one)
+- A failing batch is retried max_retries times with exponential backoff before it is dropped
+- flush() waits until everything queued so far is written, close() flushes and stops
+  (after close, put() writes synchronously so late saves aren't lost at shutdown)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+
+
+class WriteBehindQueue:
+    """Deduplicating queue drained in batches by one background thread"""
+
+    def __init__(self, write_batch: Callable[[List[Tuple]], None], max_batch: int = 64,
+                 flush_interval: float = 0.25, name: str = 'write-behind',
+                 max_retries: int = 3, retry_backoff: float = 0.2, idle_exit: float = 30.0):
+        self.write_batch = write_batch
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.name = name
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff  # Seconds before the first retry, doubled for each next one
+        self.idle_exit = idle_exit
+        self._pending = OrderedDict()  # key → item, in arrival order
+        self._oldest = 0.0
+        self._in_flight = 0
+        self._flush_waiters = 0
+        self._closed = False
+        self._thread = None
+        self._cond = threading.Condition()
+        self.stats = {'enqueued': 0, 'deduplicated': 0, 'batches': 0, 'written': 0, 'failed': 0,
+                      'retries': 0, 'largest_batch': 0}
+
+    def put(self, key, item) -> bool:
+        """Queue `item` under `key` (False if that key is already waiting)"""
+        with self._cond:
+            if not self._closed:
+                if key in self._pending:
+                    self.stats['deduplicated'] += 1
+                    return False
+                if not self._pending:
+                    self._oldest = time.monotonic()
+                self._pending[key] = item
+                self.stats['enqueued'] += 1
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+                self._cond.notify_all()
+                return True
+        # Shutting down - nobody is left to drain the queue
+        self._write([(key, item)])
+        return True
+
+    def _due(self) -> bool:
+        return (self._closed or self._flush_waiters > 0 or len(self._pending) >= self.max_batch
+                or time.monotonic() >= self._oldest + self.flush_interval)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not (self._pending and self._due()):
+                    if self._closed and not self._pending:
+                        return
+                    if self._pending:
+                        self._cond.wait(self._oldest + self.flush_interval - time.monotonic())
+                    elif not self._cond.wait(self.idle_exit) and not self._pending:
+                        # Idle - don't keep the owner (write_batch) alive; put() starts a new thread
+                        self._thread = None
+                        return
+                batch = list(self._pending.items())[:self.max_batch]
+                for key, _ in batch:
+                    del self._pending[key]
+                self._oldest = time.monotonic()
+                self._in_flight = len(batch)
+            try:
+                self._write(batch)
+            finally:
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+
+    def _write(self, batch: List[Tuple]):
+        outcome = 'failed'
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.write_batch(batch)
+                outcome = 'written'
+                break
+            except Exception as e:
+                # Transient errors (e.g. 'database is locked') - the items were already served to users
+                if attempt == self.max_retries:
+                    print(f"   ⚠️ {self.name}: could not write {len(batch)} queued item(s), giving up: {e}")
+                    break
+                delay = self.retry_backoff * 2 ** attempt
+                print(f"   ⚠️ {self.name}: write of {len(batch)} item(s) failed ({e}) - retrying in {delay:.1f}s")
+                with self._cond:
+                    self.stats['retries'] += 1
+                time.sleep(delay)
+        with self._cond:
+            self.stats[outcome] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until everything queued before this call is written. False on timeout"""
+        with self._cond:
+            if not self._pending and not self._in_flight:
+                return True
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+            finally:
+                self._flush_waiters -= 1
+
+    def close(self, timeout: float = 10.0):
+        """Write what's left and stop the thread (registered with atexit by the owner)"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def get_stats(self) -> Dict:
+        with self._cond:
+            stats = dict(self.stats)
+            stats['pending'] = len(self._pending) + self._in_flight
+        return stats